@@ -0,0 +1,51 @@
+"""run_data_pipeline(): first run vs a repeat served from the artifact cache.
+
+Writes a synthetic raw CSV to a temporary folder, runs the pipeline with all
+outputs and the artifact cache redirected there, then runs it again with the
+same raw file and config: the repeat hashes the raw file, reads the cleaned
+frame from the cache and finds the processed files and database up to date.
+
+Usage:
+    python benchmarks/bench_artifacts.py --rows 1000000
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from clinflow.config import get_config
+from clinflow.pipeline import run_data_pipeline
+from synthetic import make_raw
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        make_raw(args.rows).to_csv(f"{tmp}/raw.csv", index=False)
+        cfg = get_config().to_dict()
+        cfg["paths"]["raw_data"] = {"folder": f"{tmp}/", "file": "raw.csv"}
+        cfg["paths"]["processed_data"]["folder"] = f"{tmp}/"
+        cfg["paths"]["database_path"] = {"folder": f"{tmp}/", "file": "bench.db"}
+        cfg["artifacts"]["folder"] = f"{tmp}/artifacts/"
+
+        timings = []
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            for _ in range(2):
+                start = time.perf_counter()
+                run_data_pipeline(cfg)
+                timings.append(time.perf_counter() - start)
+
+    print(f"{args.rows} rows")
+    print(f"first run          {timings[0]:7.2f} s")
+    print(
+        f"repeat (cached)    {timings[1]:7.2f} s   "
+        f"({timings[0] / timings[1]:.0f}x faster)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark single-row scoring throughput with and without micro-batching.
+
+Runs N concurrent asyncio clients, each scoring one patient at a time, either
+directly (one predict_proba per request on a worker thread) or through a
+MicroBatcher.
+
+Usage:
+    python benchmarks/bench_batching.py --requests 2000 --max-wait-ms 5
+"""
+
+import argparse
+import asyncio
+import time
+from pathlib import Path
+from clinflow.api import score
+from clinflow.batching import MicroBatcher
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.models.train import train_model
+
+
+async def run_clients(submit, records, concurrency, n_requests):
+    per_client = n_requests // concurrency
+
+    async def client(offset):
+        for i in range(per_client):
+            await submit(records[(offset + i) % len(records)])
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client(c * per_client) for c in range(concurrency)))
+    return per_client * concurrency / (time.perf_counter() - start)
+
+
+async def bench(
+    pipeline, records, concurrency, n_requests, max_batch_size, max_wait_ms
+):
+    loop = asyncio.get_running_loop()
+
+    async def direct(record):
+        return (await loop.run_in_executor(None, score, pipeline, [record]))[0]
+
+    direct_rps = await run_clients(direct, records, concurrency, n_requests)
+
+    batcher = MicroBatcher(
+        lambda batch: score(pipeline, batch), max_batch_size, max_wait_ms
+    )
+    await batcher.start()
+    batched_rps = await run_clients(batcher.submit, records, concurrency, n_requests)
+    await batcher.stop()
+
+    mean_batch = batcher.items / max(batcher.batches, 1)
+    return direct_rps, batched_rps, mean_batch
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    cfg = get_config()
+    clean_data_path = (
+        Path(cfg["paths"]["processed_data"]["folder"])
+        / cfg["paths"]["processed_data"]["file"]
+    )
+    df = load_dataset(clean_data_path, cfg)
+    pipeline = train_model(df, cfg)["pipeline"]
+    features = list(cfg["model_training"]["numerical_features"]) + list(
+        cfg["model_training"]["categorical_features"]
+    )
+    records = df[features].to_dict("records")
+
+    for concurrency in (1, 10, 100):
+        n_requests = max(args.requests, concurrency)
+        direct, batched, mean_batch = asyncio.run(
+            bench(
+                pipeline,
+                records,
+                concurrency,
+                n_requests,
+                args.max_batch_size,
+                args.max_wait_ms,
+            )
+        )
+        print(
+            f"clients={concurrency:<4} direct {direct:8.0f} req/s"
+            f"   batched {batched:8.0f} req/s   mean batch {mean_batch:5.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Rows/sec loading the patients table: DataFrame.to_sql vs bulk_write.
+
+Usage:
+    python benchmarks/bench_bulk_write.py --rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from clinflow.config import get_config
+from clinflow.data.db import ConnectionPool, bulk_write
+from clinflow.data.schema import decode_categories, downcast
+from synthetic import make_clean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    df, _ = downcast(make_clean(args.rows), get_config())
+    # to_sql would store category columns as TEXT
+    df = decode_categories(df)
+
+    loaders = {
+        "to_sql (previous)": lambda con: df.to_sql(
+            "patients", con, if_exists="replace", index=False
+        ),
+        "bulk_write": lambda con: bulk_write(df, "patients", con),
+        "bulk_write, synchronous=off": lambda con: bulk_write(
+            df, "patients", con, synchronous="off"
+        ),
+    }
+    with tempfile.TemporaryDirectory() as folder:
+        # same tuned connection (WAL etc.) as write_to_SQL_db
+        pool = ConnectionPool(Path(folder) / "bench.db", size=1)
+        with pool.connection() as con:
+            for name, load in loaders.items():
+                start = time.perf_counter()
+                load(con)
+                elapsed = time.perf_counter() - start
+                rate = args.rows / elapsed
+                print(f"{name:<28} {elapsed:6.2f} s   {rate:10,.0f} rows/s")
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
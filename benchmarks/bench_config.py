@@ -0,0 +1,37 @@
+"""Benchmark per-call config access: YAML re-parse vs the cached Config.
+
+Usage:
+    python benchmarks/bench_config.py --calls 5000
+"""
+
+import argparse
+import timeit
+import yaml
+from clinflow.config import DEFAULT_CONFIG_PATH, get_config, load_config
+
+
+def parse_yaml():
+    # the pre-cache behaviour of load_config()
+    with open(DEFAULT_CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    get_config()  # warm the cache
+
+    cases = {
+        "yaml.safe_load (per call)": parse_yaml,
+        "load_config() (cached, deep copy)": load_config,
+        "get_config() (cached, stat + lookup)": get_config,
+    }
+    for name, fn in cases.items():
+        total = timeit.timeit(fn, number=args.calls)
+        print(f"{name:<40} {total / args.calls * 1e6:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Wall time of cross_validate_model(): serial folds vs a process pool.
+
+Usage:
+    python benchmarks/bench_cross_validation.py --rows 200000 --folds 10
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from clinflow.config import get_config
+from clinflow.models.cross_validation import cross_validate_model
+from synthetic import make_clean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--folds", type=int, default=10)
+    parser.add_argument("--repeats", type=int, default=1)
+    args = parser.parse_args()
+
+    df = make_clean(args.rows)
+    cfg = get_config()
+    timings = {}
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        for n_jobs in (1, -1):
+            start = time.perf_counter()
+            report = cross_validate_model(
+                df, cfg, n_splits=args.folds, n_repeats=args.repeats, n_jobs=n_jobs
+            )
+            timings[n_jobs] = time.perf_counter() - start
+
+    accuracy = report["metrics"]["accuracy"]
+    print(
+        f"{os.cpu_count()} CPUs, {args.rows} rows, "
+        f"{args.folds} folds x {args.repeats} repeats"
+    )
+    print(
+        f"accuracy {accuracy['mean']:.4f} +/- {accuracy['std']:.4f} "
+        f"(CI {accuracy['ci_low']:.4f}-{accuracy['ci_high']:.4f})"
+    )
+    print(
+        f"serial {timings[1]:.2f} s   process pool {timings[-1]:.2f} s   "
+        f"speedup {timings[1] / timings[-1]:.1f}x"
+    )
+
+
+if __name__ == "__main__":
+    main()
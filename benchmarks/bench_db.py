@@ -0,0 +1,106 @@
+"""Queries/sec under concurrent readers: pooled vs per-call SQLite connections.
+
+Two workloads are measured: a point lookup by rowid (where connection setup
+dominates) and query_patients() (where DataFrame construction dominates).
+
+Usage:
+    python benchmarks/bench_db.py --rows 10000 --seconds 2
+"""
+
+import argparse
+import contextlib
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from clinflow.config import get_config
+from clinflow.data.db import close_pools, connect, database_path
+from clinflow.data.query import QUERY_SPECS, build_where_clause, query_patients
+from clinflow.data.to_sqlite import write_to_SQL_db
+import pandas as pd
+from synthetic import make_clean
+
+LOOKUP = "SELECT * FROM patients WHERE rowid = ?"
+
+
+def lookup_unpooled(cfg, i):
+    with contextlib.closing(sqlite3.connect(database_path(cfg))) as con:
+        return con.execute(LOOKUP, (i,)).fetchall()
+
+
+def lookup_pooled(cfg, i):
+    with connect(cfg) as con:
+        return con.execute(LOOKUP, (i,)).fetchall()
+
+
+def query_unpooled(cfg, i):
+    # previous query_patients behaviour: fresh, untuned connection per call
+    where_clause, params = build_where_clause(QUERY_SPECS["young_with_high_chol"])
+    with contextlib.closing(sqlite3.connect(database_path(cfg))) as con:
+        return pd.read_sql_query(
+            f"SELECT * FROM patients WHERE {where_clause}", con, params=params
+        )
+
+
+def query_pooled(cfg, i):
+    return query_patients("young_with_high_chol", cfg)
+
+
+def throughput(fn, cfg, readers, seconds, rows):
+    stop = threading.Event()
+
+    def worker(seed):
+        n = 0
+        while not stop.is_set():
+            fn(cfg, (seed + n * 7919) % rows + 1)
+            n += 1
+        return n
+
+    with ThreadPoolExecutor(max_workers=readers) as executor:
+        futures = [executor.submit(worker, seed) for seed in range(readers)]
+        time.sleep(seconds)
+        stop.set()
+        return sum(f.result() for f in futures) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        cfg = get_config().to_dict()
+        cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "bench.db"}
+        write_to_SQL_db(make_clean(args.rows), cfg)
+
+        # keep the per-query INFO logs out of the measurement
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            results = [
+                (
+                    name,
+                    readers,
+                    [
+                        throughput(fn, cfg, readers, args.seconds, args.rows)
+                        for fn in fns
+                    ],
+                )
+                for name, fns in (
+                    ("point lookup", (lookup_unpooled, lookup_pooled)),
+                    ("query_patients", (query_unpooled, query_pooled)),
+                )
+                for readers in (1, 4, 16)
+            ]
+        close_pools()
+
+    for name, readers, (unpooled, pooled) in results:
+        print(
+            f"{name:<15} {readers:>3} readers   per-call connect {unpooled:8.0f} q/s"
+            f"   pooled {pooled:8.0f} q/s   ({pooled / unpooled:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""In-memory train_model() vs out-of-core train_model_incremental() on Parquet.
+
+Reports wall time, peak traced memory and held-out accuracy. The synthetic
+target is drawn from a logistic model of a few features so accuracy is
+meaningful.
+
+Usage:
+    python benchmarks/bench_incremental.py --rows 1000000 --chunksize 100000
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.data.storage import training_columns, write_dataset
+from clinflow.models.incremental import chunk_source, train_model_incremental
+from clinflow.models.train import train_model
+from sklearn.metrics import accuracy_score
+import numpy as np
+from synthetic import make_clean
+
+
+def make_data(rows):
+    df = make_clean(rows)
+    logit = (
+        0.08 * (df["age"] - 54)
+        - 0.04 * (df["thalach"] - 137)
+        + 0.9 * (df["cp"] == 4)
+        + 0.7 * df["ca"]
+        - 1.0
+    )
+    rng = np.random.default_rng(1)
+    df["target"] = (rng.random(rows) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--epochs", type=int, default=None)
+    args = parser.parse_args()
+
+    cfg = get_config()
+    with tempfile.TemporaryDirectory() as folder:
+        path = write_dataset(make_data(args.rows), f"{folder}/clean.parquet")
+
+        def in_memory():
+            df = load_dataset(path, cfg, columns=training_columns(cfg))
+            model = train_model(df, cfg)
+            return accuracy_score(model["y_test"], model["y_pred"])
+
+        def incremental():
+            source = chunk_source(cfg, filepath=path, chunksize=args.chunksize)
+            return train_model_incremental(source, cfg, args.epochs)["accuracy"]
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            results = {
+                "train_model (in memory)": measure(in_memory),
+                "train_model_incremental": measure(incremental),
+            }
+
+    for name, (accuracy, elapsed, peak) in results.items():
+        print(
+            f"{name:<26} {elapsed:7.2f} s   peak {peak:8.1f} MiB   "
+            f"accuracy {accuracy:.4f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
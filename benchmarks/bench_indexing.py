@@ -0,0 +1,84 @@
+"""Preset query latency on a synthetic patients table: full scan vs index.
+
+Besides QUERY_SPECS (which each match 20-50% of the synthetic rows), two
+narrower presets show where indexes pay off. The last column is what
+build_indexes() decides under cfg["database"]["index_max_selectivity"].
+
+Usage:
+    python benchmarks/bench_indexing.py --rows 1000000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from clinflow.config import get_config
+from clinflow.data.db import close_pools, connect
+from clinflow.data.indexing import build_indexes
+from clinflow.data.query import QUERY_SPECS, build_where_clause
+from clinflow.data.to_sqlite import write_to_SQL_db
+from synthetic import make_clean
+
+SPECS = dict(
+    QUERY_SPECS,
+    oldest_with_disease={"age": {"min": 77}, "target": {"equals": 1}},
+    very_high_chol={"chol": {"min": 550}},
+)
+
+
+def latencies(con, repeats):
+    results = {}
+    for preset, filter_spec in SPECS.items():
+        where_clause, params = build_where_clause(filter_spec)
+        query = f"SELECT * FROM patients WHERE {where_clause}"
+        times = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            rows = con.execute(query, params).fetchall()
+            times.append(time.perf_counter() - start)
+        results[preset] = (statistics.median(times), len(rows))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        cfg = get_config().to_dict()
+        cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "bench.db"}
+        cfg["database"]["auto_index"] = False
+        write_to_SQL_db(make_clean(args.rows), cfg)
+
+        with connect(cfg) as con:
+            scans = latencies(con, args.repeats)
+
+        # what the indexing stage keeps with the configured threshold
+        decisions = build_indexes(cfg, specs=SPECS)
+
+        # then index every preset to time the ones it skipped too
+        forced = dict(cfg["database"], index_max_selectivity=1.0)
+        start = time.perf_counter()
+        build_indexes(dict(cfg, database=forced), specs=SPECS)
+        build_time = time.perf_counter() - start
+
+        with connect(cfg) as con:
+            indexed = latencies(con, args.repeats)
+        close_pools()
+
+    print(f"index build: {build_time:.2f} s for {args.rows} rows")
+    for preset, (scan, n_rows) in scans.items():
+        index_time = indexed[preset][0]
+        decision = decisions[preset]
+        print(
+            f"{preset:<24} {decision['selectivity']:4.0%} of rows"
+            f"   scan {scan * 1000:7.1f} ms   indexed {index_time * 1000:7.1f} ms"
+            f" ({scan / index_time:4.1f}x)"
+            f"   -> {decision['index'] or 'full scan'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Peak Python memory: query_patients("all") vs streaming with iter_patients().
+
+Usage:
+    python benchmarks/bench_iter_patients.py --rows 100000 1000000 --chunksize 50000
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import tracemalloc
+from clinflow.config import get_config
+from clinflow.data.db import close_pools
+from clinflow.data.query import iter_patients, query_patients
+from clinflow.data.to_sqlite import write_to_SQL_db
+from synthetic import make_clean
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--chunksize", type=int, default=50_000)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as folder:
+            cfg = get_config().to_dict()
+            cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "b.db"}
+            cfg["database"]["auto_index"] = False
+            write_to_SQL_db(make_clean(rows), cfg)
+
+            def stream():
+                for _ in iter_patients("all", cfg, chunksize=args.chunksize):
+                    pass
+
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+                full = measure(lambda: query_patients("all", cfg, use_cache=False))
+                chunked = measure(stream)
+            close_pools()
+
+        print(
+            f"{rows:>9} rows   query_patients {full[0]:6.2f} s {full[1]:7.1f} MiB   "
+            f"iter_patients {chunked[0]:6.2f} s {chunked[1]:7.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
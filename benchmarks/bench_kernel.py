@@ -0,0 +1,55 @@
+"""Benchmark the compiled NumPy kernel against pipeline.predict_proba.
+
+Usage:
+    python benchmarks/bench_kernel.py --sizes 1 1000 1000000
+"""
+
+import argparse
+import time
+from pathlib import Path
+import numpy as np
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.models.kernel import KernelScorer
+from clinflow.models.train import train_model
+
+
+def best_of(fn, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 1000, 1_000_000])
+    args = parser.parse_args()
+
+    cfg = get_config()
+    clean_data_path = (
+        Path(cfg["paths"]["processed_data"]["folder"])
+        / cfg["paths"]["processed_data"]["file"]
+    )
+    df = load_dataset(clean_data_path, cfg)
+    pipeline = train_model(df, cfg)["pipeline"]
+    scorer = KernelScorer.from_pipeline(pipeline)
+
+    for n in args.sizes:
+        frame = df[scorer.features].sample(n, replace=True, random_state=0)
+        X = frame.to_numpy(dtype=np.float64)
+        repeats = 3 if n >= 100_000 else 50
+
+        sklearn_t = best_of(lambda: pipeline.predict_proba(frame), repeats)
+        kernel_t = best_of(lambda: scorer.predict_proba(X), repeats)
+        max_diff = np.abs(pipeline.predict_proba(frame) - scorer.predict_proba(X)).max()
+        print(
+            f"rows={n:<8} sklearn {sklearn_t * 1e3:10.3f} ms   numpy {kernel_t * 1e3:10.3f} ms"
+            f"   speedup {sklearn_t / kernel_t:7.1f}x   max |diff| {max_diff:.1e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
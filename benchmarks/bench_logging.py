@@ -0,0 +1,64 @@
+"""Benchmark logger.info latency: synchronous handlers vs the queue backend.
+
+Usage:
+    python benchmarks/bench_logging.py --calls 20000
+"""
+
+import argparse
+import contextlib
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from clinflow.config import get_config
+from clinflow.logging_utils import get_logger, stop_logging
+
+
+def write_config(folder, mode):
+    path = Path(folder) / f"{mode}.yml"
+    path.write_text(
+        "paths:\n"
+        "  logging:\n"
+        f"    folder: '{folder}/'\n"
+        f"    file: '{mode}.log'\n"
+        "logging:\n"
+        f"  mode: '{mode}'\n"
+        "  level: 'DEBUG'\n"
+    )
+    return get_config(path)
+
+
+def time_calls(logger, calls):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        logger.info("Processed row %d of %d", i, calls)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    # console handlers bind sys.stderr when created; point it at devnull
+    with tempfile.TemporaryDirectory() as folder, open(os.devnull, "w") as devnull:
+        for mode in ("sync", "queue"):
+            with contextlib.redirect_stderr(devnull):
+                logger = get_logger(f"bench.{mode}", write_config(folder, mode))
+                logger.propagate = False
+                latencies = time_calls(logger, args.calls)
+                stop_logging()
+
+            latencies.sort()
+            p99 = latencies[int(len(latencies) * 0.99)]
+            print(
+                f"{mode:<6} mean {statistics.fmean(latencies) * 1e6:8.2f} us"
+                f"   p99 {p99 * 1e6:8.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    main()
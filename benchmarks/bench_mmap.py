@@ -0,0 +1,66 @@
+"""Memory and time to load the processed dataset: CSV vs Parquet vs mmap'd Arrow.
+
+Each format is loaded in a fresh process so measurements do not interfere.
+"Heap peak" is tracemalloc's peak (NumPy/pandas allocations); "private RSS" is
+the growth of the process's private memory (Linux only), which excludes pages
+shared through the OS page cache by the memory-mapped Arrow file.
+
+Usage:
+    python benchmarks/bench_mmap.py --rows 5000000
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from clinflow.data.storage import read_dataset, write_dataset
+from synthetic import make_clean
+
+
+def private_memory():
+    # kB of private (unshared) memory; 0 where /proc is unavailable
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return 0
+    return sum(int(fields[k].split()[0]) for k in ("Private_Clean", "Private_Dirty"))
+
+
+def load_once(path, results):
+    before = private_memory()
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = read_dataset(path)
+    total = float(df["chol"].sum())  # touch a column
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    results.put((elapsed, peak, private_memory() - before, total))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    df = make_clean(args.rows)
+    print(f"rows={args.rows}  in-memory size {df.memory_usage().sum() / 2**20:.1f} MiB")
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ("clean.csv", "clean.parquet", "clean.arrow"):
+            path = write_dataset(df, Path(folder) / name)
+            results = multiprocessing.Queue()
+            worker = multiprocessing.Process(target=load_once, args=(path, results))
+            worker.start()
+            elapsed, peak, private_kib, _ = results.get()
+            worker.join()
+            print(
+                f"{name:<14} load {elapsed:7.3f} s   heap peak {peak / 2**20:8.1f} MiB"
+                f"   private RSS +{private_kib / 1024:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
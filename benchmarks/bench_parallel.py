@@ -0,0 +1,77 @@
+"""clean_data()/validation: scaling over row blocks with 1-16 workers.
+
+Cleans and validates the same synthetic raw frame with cfg["parallel"] set to
+each worker count, for the thread and process backends, and reports wall time
+and speedup over the serial run. Validation reports are built but not raised,
+so data with violations is timed too. "ca"/"thal" are strings containing "?"
+(--strings) to include numeric coercion. Speedup is bounded by the cores
+available (printed first) and, for processes, by pickling blocks to workers.
+
+Usage:
+    python benchmarks/bench_parallel.py --rows 4000000
+    python benchmarks/bench_parallel.py --rows 2000000 --strings --workers 1 2 4
+"""
+
+import argparse
+import contextlib
+import os
+import time
+from clinflow.config import get_config
+from clinflow.data.clean import clean_data
+from clinflow.data.parallel import validate_partitioned
+import numpy as np
+from synthetic import make_raw
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=4_000_000)
+    parser.add_argument("--strings", action="store_true")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--backends", nargs="+", default=["thread", "process"])
+    args = parser.parse_args()
+
+    df = make_raw(args.rows)
+    if args.strings:
+        rng = np.random.default_rng(1)
+        for col in ("ca", "thal"):
+            values = df[col].astype(str).to_numpy(dtype=object)
+            values[rng.uniform(size=args.rows) < 0.001] = "?"
+            df[col] = values
+
+    print(f"{args.rows} rows, {os.cpu_count()} CPUs")
+    print(
+        f"{'backend':8} {'workers':>7} {'clean s':>8} {'validate s':>10} "
+        f"{'speedup':>8}"
+    )
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        for backend in args.backends:
+            serial = None
+            for workers in args.workers:
+                cfg = get_config().to_dict()
+                cfg["parallel"] = {
+                    "n_jobs": workers,
+                    "backend": backend,
+                    "min_rows_per_partition": 10_000,
+                }
+                clean_s, clean = timed(lambda: clean_data(df, cfg))
+                validate_s, _ = timed(lambda: validate_partitioned(clean, cfg))
+                total = clean_s + validate_s
+                serial = serial or total
+                print(
+                    f"{backend:8} {workers:7d} {clean_s:8.2f} {validate_s:10.2f} "
+                    f"{serial / total:7.2f}x"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Per-span overhead of the profiling layer, disabled vs enabled.
+
+Times a tight loop of empty ``span()`` blocks and ``@profiled`` calls with
+profiling off (the default) and on, then times run_data_pipeline() both ways
+on a synthetic raw CSV to show the overhead on a real run.
+
+Usage:
+    python benchmarks/bench_profiling.py --calls 200000 --rows 200000
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from clinflow.config import get_config
+from clinflow.pipeline import run_data_pipeline
+from clinflow.profiling import disable_profiling, enable_profiling, profiled, span
+from synthetic import make_raw
+
+
+@profiled()
+def noop():
+    pass
+
+
+def per_call_ns(fn, calls):
+    start = time.perf_counter()
+    fn(calls)
+    return (time.perf_counter() - start) / calls * 1e9
+
+
+def spans(calls):
+    for _ in range(calls):
+        with span("noop"):
+            pass
+
+
+def decorated(calls):
+    for _ in range(calls):
+        noop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cfg = get_config().to_dict()
+        cfg["model_training"]["path_to_results"]["directory"] = f"{tmp}/"
+        cfg["paths"]["raw_data"] = {"folder": f"{tmp}/", "file": "raw.csv"}
+        cfg["paths"]["processed_data"]["folder"] = f"{tmp}/"
+        cfg["paths"]["database_path"] = {"folder": f"{tmp}/", "file": "bench.db"}
+        cfg["artifacts"]["enabled"] = False
+        make_raw(args.rows).to_csv(f"{tmp}/raw.csv", index=False)
+
+        print(f"{'':22} {'disabled':>10} {'enabled':>10}")
+        for label, fn in (("span() block", spans), ("@profiled call", decorated)):
+            off = per_call_ns(fn, args.calls)
+            enable_profiling(cfg)
+            on = per_call_ns(fn, args.calls)
+            disable_profiling()
+            print(f"{label:22} {off:8.0f}ns {on:8.0f}ns")
+
+        timings = []
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            for enabled in (False, True):
+                if enabled:
+                    enable_profiling(cfg)
+                start = time.perf_counter()
+                run_data_pipeline(cfg)
+                timings.append(time.perf_counter() - start)
+                disable_profiling()
+        print(
+            f"{'run_data_pipeline':22} {timings[0]:9.2f}s {timings[1]:9.2f}s"
+            f"   ({args.rows} rows)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Latency of repeated query_patients() calls: uncached vs cache tiers.
+
+Usage:
+    python benchmarks/bench_query_cache.py --rows 1000000 --repeat 5
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+from clinflow.config import get_config
+from clinflow.data.db import close_pools
+from clinflow.data.query import query_patients
+from clinflow.data.query_cache import clear_query_caches
+from clinflow.data.to_sqlite import write_to_SQL_db
+from synthetic import make_clean
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        cfg = get_config().to_dict()
+        cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "bench.db"}
+        cfg["database"]["auto_index"] = False
+        write_to_SQL_db(make_clean(args.rows), cfg)
+
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+            results = {}
+            for preset in ("all", "young_with_high_chol"):
+                uncached = best_of(
+                    lambda: query_patients(preset, cfg, use_cache=False), args.repeat
+                )
+                query_patients(preset, cfg)  # populate both tiers
+
+                def disk():
+                    clear_query_caches()  # as in a fresh process
+                    query_patients(preset, cfg)
+
+                results[preset] = (
+                    uncached,
+                    best_of(disk, args.repeat),
+                    best_of(lambda: query_patients(preset, cfg), args.repeat),
+                )
+        close_pools()
+        clear_query_caches()
+
+    for preset, (uncached, disk, memory) in results.items():
+        print(
+            f"{preset:<22} uncached {uncached * 1000:8.1f} ms   "
+            f"disk hit {disk * 1000:7.1f} ms ({uncached / disk:5.1f}x)   "
+            f"memory hit {memory * 1000:7.1f} ms ({uncached / memory:6.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""Memory footprint of the cleaned dataset before and after dtype downcasting.
+
+Usage:
+    python benchmarks/bench_schema.py --rows 1000000
+"""
+
+import argparse
+import time
+from clinflow.config import get_config
+from clinflow.data.schema import downcast
+from clinflow.data.storage import training_columns
+from synthetic import make_clean
+
+
+def mib(df):
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    cfg = get_config()
+    df = make_clean(args.rows)
+    before = mib(df)
+
+    start = time.perf_counter()
+    compact, _ = downcast(df.copy(), cfg)
+    elapsed = time.perf_counter() - start
+    after = mib(compact)
+
+    columns = training_columns(cfg)
+    print(
+        f"all columns      {before:8.1f} MiB -> {after:8.1f} MiB "
+        f"({before / after:.1f}x smaller, downcast {elapsed:.3f} s)"
+    )
+    print(
+        f"training columns {mib(df[columns]):8.1f} MiB -> "
+        f"{mib(compact[columns]):8.1f} MiB"
+    )
+
+
+if __name__ == "__main__":
+    main()
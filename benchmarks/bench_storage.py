@@ -0,0 +1,45 @@
+"""Compare CSV and Parquet processed-data files: size and load time.
+
+Usage:
+    python benchmarks/bench_storage.py --rows 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from clinflow.config import get_config
+from clinflow.data.storage import read_dataset, training_columns, write_dataset
+from synthetic import make_clean
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    columns = training_columns(get_config())
+    df = make_clean(args.rows)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for name in ("clean.csv", "clean.parquet"):
+            path = write_dataset(df, Path(folder) / name)
+            full = best_of(lambda: read_dataset(path))
+            projected = best_of(lambda: read_dataset(path, columns))
+            print(
+                f"{name:<14} {path.stat().st_size / 2**20:8.1f} MiB"
+                f"   load all {full:7.3f} s   load training columns {projected:7.3f} s"
+            )
+
+
+if __name__ == "__main__":
+    main()
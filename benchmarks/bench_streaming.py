@@ -0,0 +1,52 @@
+"""Compare peak memory of the in-memory and streaming data pipelines.
+
+Writes a synthetic raw CSV of --rows rows to a temporary directory and runs
+both pipelines against it, reporting wall time and tracemalloc peak.
+
+Usage:
+    python benchmarks/bench_streaming.py --rows 1000000 --chunksize 100000
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from clinflow.config import load_config
+from clinflow.pipeline import run_data_pipeline, run_streaming_pipeline
+from synthetic import make_raw
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        cfg = load_config()
+        cfg["paths"]["raw_data"] = {"folder": f"{folder}/", "file": "raw.csv"}
+        cfg["paths"]["processed_data"] = {"folder": f"{folder}/", "file": "clean.csv"}
+        cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "clinflow.db"}
+        cfg["logging"]["level"] = "WARNING"
+        make_raw(args.rows).to_csv(f"{folder}/raw.csv", index=False)
+
+        for name, fn in (
+            ("in-memory", lambda: run_data_pipeline(cfg)),
+            ("streaming", lambda: run_streaming_pipeline(cfg, args.chunksize)),
+        ):
+            elapsed, peak = measure(fn)
+            print(f"{name:<10} {elapsed:7.2f} s   peak {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
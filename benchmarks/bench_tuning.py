@@ -0,0 +1,41 @@
+"""Wall time of tune_model(): preprocessing cache on/off, 1 worker vs all cores.
+
+Usage:
+    python benchmarks/bench_tuning.py --rows 20000
+"""
+
+import argparse
+import contextlib
+import copy
+import os
+import time
+from clinflow.config import get_config
+from clinflow.models.tuning import tune_model
+from synthetic import make_clean
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20_000)
+    args = parser.parse_args()
+
+    df = make_clean(args.rows)
+    base = get_config().to_dict()
+    print(f"{os.cpu_count()} CPUs, {args.rows} rows")
+
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stderr(devnull):
+        for n_jobs in (1, -1):
+            for cache in (False, True):
+                cfg = copy.deepcopy(base)
+                cfg["model_training"]["tuning"]["cache_preprocessing"] = cache
+                start = time.perf_counter()
+                model = tune_model(df, cfg, search="grid", n_jobs=n_jobs)
+                elapsed = time.perf_counter() - start
+                print(
+                    f"n_jobs={n_jobs:>2}  cache={'on ' if cache else 'off'}  "
+                    f"{len(model['leaderboard']):>3} candidates  {elapsed:7.2f} s"
+                )
+
+
+if __name__ == "__main__":
+    main()
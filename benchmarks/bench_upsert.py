@@ -0,0 +1,79 @@
+"""Nightly-delta load time: upsert vs replacing the whole patients table.
+
+The table holds --rows synthetic patients keyed on a "patient_id" column. The
+nightly feed changes --changed of them and adds --new new patients, and is
+loaded either as just those rows (a delta feed) or as the full dataset.
+
+Usage:
+    python benchmarks/bench_upsert.py --rows 1000000 --changed 0.01 --new 0.005
+"""
+
+import argparse
+import contextlib
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from clinflow.config import get_config
+from clinflow.data.db import close_pools
+from clinflow.data.to_sqlite import write_to_SQL_db
+from synthetic import make_clean
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--changed", type=float, default=0.01)
+    parser.add_argument("--new", type=float, default=0.005)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    base = make_clean(args.rows)
+    base.insert(0, "patient_id", np.arange(args.rows))
+
+    changed = base.sample(frac=args.changed, random_state=1)
+    changed["chol"] = rng.integers(126, 565, len(changed))
+    new = make_clean(int(args.rows * args.new), seed=2)
+    new.insert(0, "patient_id", np.arange(args.rows, args.rows + len(new)))
+    delta = pd.concat([changed, new], ignore_index=True)
+    full = pd.concat([base.drop(index=changed.index), changed, new], ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as folder, open(os.devnull, "w") as devnull:
+        cfg = get_config().to_dict()
+        cfg["paths"]["database_path"] = {"folder": f"{folder}/", "file": "bench.db"}
+        cfg["database"]["key_columns"] = ["patient_id"]
+
+        with contextlib.redirect_stderr(devnull):
+            write_to_SQL_db(base, cfg, mode="replace")
+            replace_time, _ = timed(lambda: write_to_SQL_db(full, cfg, mode="replace"))
+
+            write_to_SQL_db(base, cfg, mode="upsert")
+            delta_time, stats = timed(
+                lambda: write_to_SQL_db(delta, cfg, mode="upsert")
+            )
+
+            write_to_SQL_db(base, cfg, mode="upsert")
+            full_time, _ = timed(lambda: write_to_SQL_db(full, cfg, mode="upsert"))
+        close_pools()
+
+    print(
+        f"{args.rows} rows; nightly feed: {stats['updated']} changed, "
+        f"{stats['inserted']} new"
+    )
+    print(f"replace whole table      {replace_time:7.2f} s")
+    print(f"upsert full feed         {full_time:7.2f} s")
+    print(
+        f"upsert delta feed        {delta_time:7.2f} s "
+        f"({replace_time / delta_time:.0f}x faster than replace)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark ValidationEngine against the original multi-pass validate_data.
+
+Usage:
+    python benchmarks/bench_validation.py --rows 10000000
+"""
+
+import argparse
+import time
+import pandas as pd
+from clinflow.config import get_config
+from clinflow.data.validation import ValidationEngine
+from synthetic import make_clean
+
+
+def legacy_validate(df, cfg):
+    # validate_data() before the single-pass engine, minus logging
+    if df.isnull().sum().sum() != 0:
+        raise ValueError(f"Too many missing values: {df.isnull().sum().sum()} missing")
+    for col in cfg["numerical_column_names"]:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Numerical column {col}")
+    for col in cfg["categorical_column_names"]:
+        if col in df.columns and not pd.api.types.is_numeric_dtype(df[col]):
+            raise ValueError(f"Categorical column {col}")
+    if not df["target"].isin([0, 1]).all():
+        raise ValueError("The column 'target' is not binary")
+    for col, bounds in cfg["reasonable_ranges"].items():
+        if col in df.columns:
+            if (df[col] < bounds["min"]).any() or (df[col] > bounds["max"]).any():
+                raise ValueError(f"Column {col} has values outside reasonable range")
+    if len(df) < cfg["minimum_rows"]:
+        raise ValueError("Less than minimum rows")
+
+
+def best_of(fn, repeats=3):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    args = parser.parse_args()
+
+    cfg = get_config()
+    df = make_clean(args.rows)
+    engine = ValidationEngine(cfg)
+
+    legacy = best_of(lambda: legacy_validate(df, cfg))
+    single_pass = best_of(lambda: engine.run(df))
+    print(f"rows={args.rows}")
+    print(f"legacy validate_data   {legacy:8.3f} s")
+    print(
+        f"ValidationEngine.run   {single_pass:8.3f} s   ({legacy / single_pass:.1f}x)"
+    )
+
+
+if __name__ == "__main__":
+    main()
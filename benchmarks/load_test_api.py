@@ -0,0 +1,103 @@
+"""Load test the prediction service: p50/p99 latency and requests/sec.
+
+Starts the app in-process with uvicorn unless --url points at a running server.
+
+Usage:
+    python benchmarks/load_test_api.py --requests 2000 --concurrency 16
+    python benchmarks/load_test_api.py --url http://127.0.0.1:8000 --batch-size 100
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+PATIENT = {
+    "age": 63,
+    "sex": 1,
+    "cp": 1,
+    "trestbps": 145,
+    "chol": 233,
+    "fbs": 1,
+    "restecg": 2,
+    "thalach": 150,
+    "ca": 0,
+    "thal": 6,
+}
+
+
+def start_server(port):
+    import uvicorn
+    from clinflow.api import app
+
+    server = uvicorn.Server(
+        uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+def post(url, body):
+    request = urllib.request.Request(
+        url, data=body, headers={"Content-Type": "application/json"}
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def run(url, n_requests, concurrency, batch_size):
+    if batch_size == 1:
+        endpoint, body = f"{url}/predict", json.dumps(PATIENT).encode()
+    else:
+        endpoint = f"{url}/predict/batch"
+        body = json.dumps({"patients": [PATIENT] * batch_size}).encode()
+
+    post(endpoint, body)  # warm up
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(lambda _: post(endpoint, body), range(n_requests)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": statistics.median(latencies) * 1e3,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1e3,
+        "requests_per_sec": n_requests / elapsed,
+        "rows_per_sec": n_requests * batch_size / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    url = args.url
+    server = None
+    if url is None:
+        server = start_server(args.port)
+        url = f"http://127.0.0.1:{args.port}"
+
+    stats = run(url, args.requests, args.concurrency, args.batch_size)
+    print(
+        f"batch={args.batch_size} concurrency={args.concurrency} "
+        f"p50={stats['p50_ms']:.2f}ms p99={stats['p99_ms']:.2f}ms "
+        f"{stats['requests_per_sec']:.0f} req/s ({stats['rows_per_sec']:.0f} rows/s)"
+    )
+
+    if server is not None:
+        server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""Synthetic UCI-heart-disease-shaped data for benchmarks."""
+
+import numpy as np
+import pandas as pd
+
+
+def make_raw(n_rows, seed=0, missing_fraction=0.01):
+    """Raw-format frame (columns as in cfg["raw_all_column_names"])."""
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(29, 78, n_rows),
+            "sex": rng.integers(0, 2, n_rows),
+            "cp": rng.integers(1, 5, n_rows),
+            "trestbps": rng.integers(94, 200, n_rows),
+            "chol": rng.integers(126, 565, n_rows),
+            "fbs": rng.integers(0, 2, n_rows),
+            "restecg": rng.integers(0, 3, n_rows),
+            "thalach": rng.integers(71, 203, n_rows),
+            "exang": rng.integers(0, 2, n_rows),
+            "oldpeak": np.round(rng.uniform(0, 6.2, n_rows), 1),
+            "slope": rng.integers(1, 4, n_rows),
+            "ca": rng.integers(0, 4, n_rows).astype(float),
+            "thal": rng.choice([3.0, 6.0, 7.0], n_rows),
+            "num": rng.integers(0, 5, n_rows),
+        }
+    )
+    for col in ("ca", "thal"):
+        df.loc[rng.uniform(size=n_rows) < missing_fraction, col] = np.nan
+    return df
+
+
+def make_clean(n_rows, seed=0):
+    """Cleaned-format frame: no missing values plus a binary "target" column."""
+    df = make_raw(n_rows, seed, missing_fraction=0.0)
+    df["target"] = (df["num"] > 0).astype(int)
+    return df
@@ -0,0 +1,197 @@
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import BaseModel, create_model
+from clinflow.batching import MicroBatcher
+from clinflow.config import get_config
+from clinflow.logging_utils import get_logger
+from clinflow.models.io import load_model
+from clinflow.models.kernel import KernelScorer
+import numpy as np
+import pandas as pd
+
+
+def model_features(cfg):
+    """Configured model features: numerical followed by categorical."""
+    training = cfg["model_training"]
+    return list(training["numerical_features"]) + list(training["categorical_features"])
+
+
+def patient_model(cfg=None):
+    """Build the request model for one patient from the configured features.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+
+    Returns:
+        type[BaseModel]: "Patient" model with a required float field per
+            feature in cfg["model_training"].
+    """
+    if cfg is None:
+        cfg = get_config()
+    return create_model(
+        "Patient",
+        __doc__="Model features for a single patient (cleaned, numerically encoded).",
+        **{feature: (float, ...) for feature in model_features(cfg)},
+    )
+
+
+def pipeline_features(pipeline):
+    """Feature columns a loaded model scores, or None if they cannot be told.
+
+    Args:
+        pipeline (Pipeline or KernelScorer): Model as returned by load_model(),
+            or its compiled NumPy kernel.
+    """
+    if isinstance(pipeline, KernelScorer):
+        return list(pipeline.features)
+    preprocessor = getattr(pipeline, "named_steps", {}).get("preprocessor")
+    if preprocessor is None or not hasattr(preprocessor, "transformers_"):
+        return None
+    return [
+        str(column)
+        for name, _, columns in preprocessor.transformers_
+        if name != "remainder"
+        for column in columns
+    ]
+
+
+class Prediction(BaseModel):
+    probability: float  # P(heart disease), i.e. predict_proba for class 1
+    prediction: int
+
+
+class BatchPrediction(BaseModel):
+    predictions: list[Prediction]
+
+
+def score(pipeline, records):
+    """Score patient records with a fitted pipeline.
+
+    Args:
+        pipeline (Pipeline or KernelScorer): Fitted pipeline as returned by
+            load_model(), or its compiled NumPy kernel.
+        records (list[dict]): Patient feature dicts, one per row.
+
+    Returns:
+        list[Prediction]: Positive-class probability and predicted label per record,
+            in input order.
+    """
+    if isinstance(pipeline, KernelScorer):
+        # the kernel takes a plain float array; skip DataFrame construction
+        X = np.array([[r[f] for f in pipeline.features] for r in records], dtype=float)
+    else:
+        X = pd.DataFrame.from_records(records)
+    proba = pipeline.predict_proba(X)
+    labels = pipeline.classes_[proba.argmax(axis=1)]
+    positive = list(pipeline.classes_).index(1)
+    return [
+        Prediction(probability=p, prediction=label)
+        for p, label in zip(proba[:, positive].tolist(), labels.tolist())
+    ]
+
+
+def create_app(filepath=None, cfg=None):
+    """Build the prediction service.
+
+    The model is loaded once when the app starts (via load_model()) and kept on
+    ``app.state.pipeline``, so requests only pay for inference. Request bodies
+    are validated against the features in cfg["model_training"]; startup fails
+    if the loaded model was trained on different features. When
+    cfg["api"]["batching"]["enabled"] is true, concurrent ``/predict`` calls are
+    coalesced by a MicroBatcher into a single predict_proba call. With
+    cfg["api"]["scorer"] set to "numpy", the pipeline is compiled into a
+    KernelScorer at startup and scored without pandas/sklearn overhead.
+
+    Args:
+        filepath (str or Path, optional): Path to the saved model. If None, uses
+            the configured model path. Defaults to None.
+        cfg (Mapping, optional): Configuration to use. If None, uses the cached
+            configuration from get_config(). Defaults to None.
+
+    Returns:
+        FastAPI: Application exposing ``GET /health``, ``POST /predict`` and
+            ``POST /predict/batch``.
+
+    Examples:
+        $ uvicorn clinflow.api:app
+        $ curl -X POST localhost:8000/predict -H "Content-Type: application/json" \\
+            -d '{"age": 63, "sex": 1, "cp": 1, "trestbps": 145, "chol": 233,
+                 "fbs": 1, "restecg": 2, "thalach": 150, "ca": 0, "thal": 6}'
+    """
+    if cfg is None:
+        cfg = get_config()
+    logger = get_logger(__name__)
+
+    batching = cfg["api"].get("batching", {})
+    patient_type = patient_model(cfg)
+    batch_type = create_model("BatchRequest", patients=(list[patient_type], ...))
+
+    @asynccontextmanager
+    async def lifespan(app):
+        pipeline = load_model(filepath, cfg)
+        features = pipeline_features(pipeline)
+        if features is not None and sorted(features) != sorted(model_features(cfg)):
+            raise ValueError(
+                f"Model was trained on features {features}, but the configured "
+                f"features are {model_features(cfg)}; retrain the model or fix "
+                "model_training.numerical_features/categorical_features"
+            )
+        if cfg["api"].get("scorer", "sklearn") == "numpy":
+            try:
+                pipeline = KernelScorer.from_pipeline(pipeline)
+            except ValueError as e:
+                # e.g. a tuned model whose best estimator is not linear
+                logger.warning("NumPy scorer unavailable (%s); using sklearn", e)
+        app.state.pipeline = pipeline
+        app.state.batcher = None
+        if batching.get("enabled", False):
+            app.state.batcher = MicroBatcher(
+                lambda records: score(pipeline, records),
+                max_batch_size=batching.get("max_batch_size", 64),
+                max_wait_ms=batching.get("max_wait_ms", 5.0),
+            )
+            await app.state.batcher.start()
+        logger.info("Model loaded; prediction service ready")
+        yield
+        if app.state.batcher is not None:
+            await app.state.batcher.stop()
+
+    app = FastAPI(title="clinflow", lifespan=lifespan)
+
+    @app.get("/health")
+    def health(request: Request):
+        return {"status": "ok", "model_loaded": hasattr(request.app.state, "pipeline")}
+
+    @app.post("/predict", response_model=Prediction)
+    async def predict(patient: patient_type, request: Request):
+        state = request.app.state
+        if state.batcher is not None:
+            return await state.batcher.submit(patient.model_dump())
+        predictions = await run_in_threadpool(
+            score, state.pipeline, [patient.model_dump()]
+        )
+        return predictions[0]
+
+    @app.post("/predict/batch", response_model=BatchPrediction)
+    def predict_batch(batch: batch_type, request: Request):
+        if not batch.patients:
+            raise HTTPException(status_code=422, detail="No patients provided")
+        records = [p.model_dump() for p in batch.patients]
+        return BatchPrediction(predictions=score(request.app.state.pipeline, records))
+
+    return app
+
+
+app = create_app()
+
+
+def main():
+    import uvicorn
+
+    cfg = get_config()
+    uvicorn.run(app, host=cfg["api"]["host"], port=cfg["api"]["port"])
+
+
+if __name__ == "__main__":
+    main()
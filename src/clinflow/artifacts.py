@@ -0,0 +1,316 @@
+from clinflow.config import get_config
+from clinflow.dag import config_section, file_digest
+from clinflow.data.schema import apply_schema, frame_schema
+from clinflow.logging_utils import get_logger
+from collections.abc import Mapping
+from importlib import metadata
+from pathlib import Path
+import hashlib
+import json
+import os
+import platform
+import threading
+import time
+import uuid
+import joblib
+import pandas as pd
+
+# used when the configuration has no "artifacts" section
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "folder": "data/artifacts/",
+    "max_mb": 2048,
+}
+
+# artifact kind -> file suffix; frames keep their dtypes and index in Parquet
+SUFFIXES = {"frame": ".parquet", "model": ".joblib"}
+
+# distributions whose versions change what is cached (and whether it loads)
+_LIBRARIES = ("clinflow-api", "numpy", "pandas", "scikit-learn", "pyarrow", "joblib")
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def library_versions():
+    """Python and library versions that are part of every artifact key."""
+    versions = {"python": platform.python_version()}
+    for name in _LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+
+def frame_digest(df):
+    """SHA-256 of a DataFrame's values, index, column names and dtypes."""
+    digest = hashlib.sha256()
+    layout = [[str(col) for col in df.columns], [str(dt) for dt in df.dtypes]]
+    digest.update(json.dumps(layout).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _json_default(value):
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+def _config_digest(config):
+    if config is None:
+        return None
+    payload = json.dumps(config, sort_keys=True, default=_json_default)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ArtifactCache:
+    """Content-addressed store of cleaned datasets and fitted models.
+
+    An artifact's key is a SHA-256 over its kind, a digest of the data it was
+    built from (file_digest() of the raw file, frame_digest() of a training
+    frame), the config values that shape it and library_versions(), so the
+    same inputs always map to the same entry and any change maps to a new one.
+    Frames are stored as Parquet and models with joblib, each with a ".json"
+    sidecar of metadata. Reading an entry marks it as recently used; the folder
+    is kept under ``max_mb`` by evicting the least recently used entries.
+
+    The sidecar also records digests of the files an artifact was last
+    published to (record_outputs()), and of any config that shaped how they
+    were written, so callers can skip rewriting outputs that already hold it
+    under the same settings (outputs_current()).
+
+    Args:
+        folder (str or Path): Cache directory.
+        max_mb (float): Size budget for the folder. Defaults to 2048.
+
+    Examples:
+        >>> cache = ArtifactCache("data/artifacts")
+        >>> key = cache.key("frame", file_digest(raw_path), {"schema": ...})
+        >>> clean = cache.get(key)
+        >>> if clean is None:
+        ...     clean = clean_data(raw, cfg)
+        ...     cache.put(key, clean, "frame")
+    """
+
+    def __init__(self, folder, max_mb=2048):
+        self.folder = Path(folder)
+        self.max_bytes = int(max_mb * 2**20)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind, data_digest, config=None):
+        """Artifact key for ``kind`` built from ``data_digest`` and ``config``."""
+        payload = json.dumps(
+            {
+                "kind": kind,
+                "data": data_digest,
+                "config": config or {},
+                "versions": library_versions(),
+            },
+            sort_keys=True,
+            default=_json_default,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _data_path(self, key, kind):
+        return self.folder / f"{key}{SUFFIXES[kind]}"
+
+    def _meta_path(self, key):
+        return self.folder / f"{key}.json"
+
+    def _read_meta(self, key):
+        try:
+            return json.loads(self._meta_path(key).read_text())
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, key, meta):
+        path = self._meta_path(key)
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        tmp.write_text(json.dumps(meta, indent=2))
+        os.replace(tmp, path)
+
+    def get(self, key):
+        """Return the artifact stored under ``key``, or None on a miss."""
+        logger = get_logger(__name__)
+        meta = self._read_meta(key)
+        if meta is None:
+            logger.info("Artifact cache miss (%s)", key[:12])
+            return None
+        path = self._data_path(key, meta["kind"])
+        try:
+            if meta["kind"] == "frame":
+                # Parquet drops "category" on integer columns; restore dtypes
+                value = apply_schema(pd.read_parquet(path), meta["schema"])
+            else:
+                value = joblib.load(path)
+        except FileNotFoundError:
+            logger.info("Artifact cache miss (%s)", key[:12])
+            return None
+        except Exception as e:
+            # a truncated or unreadable entry is just a miss
+            logger.warning("Ignoring artifact %s (%s)", path, e)
+            self._remove(key)
+            return None
+        os.utime(path)  # recently used entries are evicted last
+        logger.info("Artifact cache hit: %s %s", meta["kind"], key[:12])
+        return value
+
+    def put(self, key, value, kind, meta=None):
+        """Store ``value`` ("frame" DataFrame or "model" object) under ``key``.
+
+        Returns:
+            Path: The stored file.
+        """
+        if kind not in SUFFIXES:
+            raise ValueError(f"Unknown artifact kind '{kind}': use 'frame' or 'model'")
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self._data_path(key, kind)
+        # write then rename, so readers never see a partial file
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            if kind == "frame":
+                value.to_parquet(tmp)
+            else:
+                joblib.dump(value, tmp)
+            os.replace(tmp, path)
+        finally:
+            tmp.unlink(missing_ok=True)
+        meta = {
+            "key": key,
+            "kind": kind,
+            "created": time.time(),
+            "versions": library_versions(),
+            "outputs": {},
+            **(meta or {}),
+        }
+        if kind == "frame":
+            meta["schema"] = frame_schema(value)
+        self._write_meta(key, meta)
+        get_logger(__name__).info("Artifact stored: %s %s", kind, key[:12])
+        self.prune()
+        return path
+
+    def record_outputs(self, key, paths, config=None):
+        """Remember the current contents of files ``key`` was written to.
+
+        Args:
+            key (str): Artifact key.
+            paths (list[str or Path]): Files holding the artifact.
+            config (Mapping, optional): Settings the files were written with
+                that are not part of ``key`` (e.g. the database load options).
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return
+        for path in paths:
+            meta["outputs"][str(path)] = {
+                "digest": file_digest(path),
+                "config": _config_digest(config),
+            }
+        self._write_meta(key, meta)
+
+    def outputs_current(self, key, paths, config=None):
+        """True if every file in ``paths`` still holds what record_outputs() saw.
+
+        Files recorded with a different ``config`` are not current. A SQLite
+        database with a non-empty "-wal" file has changes not yet in the main
+        file, so it never counts as current either.
+        """
+        meta = self._read_meta(key)
+        if meta is None:
+            return False
+        config_digest = _config_digest(config)
+        for path in paths:
+            recorded = meta["outputs"].get(str(path))
+            if not isinstance(recorded, dict) or recorded["config"] != config_digest:
+                return False
+            wal = Path(f"{path}-wal")
+            if wal.exists() and wal.stat().st_size > 0:
+                return False
+            if file_digest(path) != recorded["digest"]:
+                return False
+        return True
+
+    def entries(self):
+        """Metadata of every entry, most recently used first.
+
+        Returns:
+            list[dict]: Sidecar metadata plus "bytes" (data and sidecar) and
+                "last_used" (Unix time).
+        """
+        entries = []
+        if not self.folder.exists():
+            return entries
+        for meta_path in self.folder.glob("*.json"):
+            meta = self._read_meta(meta_path.stem)
+            if meta is None or meta.get("kind") not in SUFFIXES:
+                continue
+            try:
+                stat = self._data_path(meta_path.stem, meta["kind"]).stat()
+            except FileNotFoundError:
+                continue
+            meta["bytes"] = stat.st_size + meta_path.stat().st_size
+            meta["last_used"] = stat.st_mtime
+            entries.append(meta)
+        entries.sort(key=lambda meta: meta["last_used"], reverse=True)
+        return entries
+
+    def _remove(self, key):
+        for suffix in (*SUFFIXES.values(), ".json"):
+            (self.folder / f"{key}{suffix}").unlink(missing_ok=True)
+
+    def prune(self, max_mb=None):
+        """Evict least recently used entries until the folder fits the budget.
+
+        Args:
+            max_mb (float, optional): Budget for this prune. If None, uses the
+                cache's ``max_mb``.
+
+        Returns:
+            list[str]: Keys of the evicted entries.
+        """
+        max_bytes = self.max_bytes if max_mb is None else int(max_mb * 2**20)
+        with self._lock:
+            entries = self.entries()
+            total = sum(entry["bytes"] for entry in entries)
+            removed = []
+            for entry in reversed(entries):
+                if total <= max_bytes:
+                    break
+                self._remove(entry["key"])
+                total -= entry["bytes"]
+                removed.append(entry["key"])
+        if removed:
+            get_logger(__name__).info("Evicted %d artifacts", len(removed))
+        return removed
+
+    def clear(self):
+        """Remove every entry; returns the number removed."""
+        return len(self.prune(max_mb=0))
+
+
+def get_artifact_cache(cfg=None):
+    """Return the shared ArtifactCache configured in cfg["artifacts"].
+
+    Returns:
+        ArtifactCache or None: None if the cache is disabled.
+    """
+    if cfg is None:
+        cfg = get_config()
+    settings = {**DEFAULT_SETTINGS, **cfg.get("artifacts", {})}
+    if not settings["enabled"]:
+        return None
+    key = (str(Path(settings["folder"]).resolve()), settings["max_mb"])
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = ArtifactCache(settings["folder"], settings["max_mb"])
+        return cache
+
+
+def config_values(cfg, keys):
+    """{key: value} of the dotted config ``keys``, for ArtifactCache.key()."""
+    return {key: config_section(cfg, key) for key in keys}
@@ -0,0 +1,123 @@
+import asyncio
+import time
+from clinflow.logging_utils import get_logger
+
+
+class MicroBatcher:
+    """Coalesce concurrent single-item requests into vectorized batch calls.
+
+    Items submitted with ``submit()`` are queued; a background task collects
+    them until either ``max_batch_size`` items are waiting or ``max_wait_ms``
+    milliseconds have passed since the first item of the batch arrived. The
+    batch is then scored with a single ``batch_fn(items)`` call on a worker
+    thread (keeping the event loop free) and each caller receives its own
+    result.
+
+    Args:
+        batch_fn (callable): Function taking a list of items and returning a
+            list of results of the same length and order.
+        max_batch_size (int): Maximum items per batch call. Defaults to 64.
+        max_wait_ms (float): Maximum time the first item in a batch waits for
+            others to arrive. Defaults to 5.0.
+
+    Examples:
+        >>> batcher = MicroBatcher(lambda records: score(pipeline, records))
+        >>> await batcher.start()
+        >>> prediction = await batcher.submit(patient_dict)
+        >>> await batcher.stop()
+
+    Note:
+        If ``batch_fn`` raises, every caller in that batch receives the exception.
+    """
+
+    def __init__(self, batch_fn, max_batch_size=64, max_wait_ms=5.0):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._task = None
+        self.batches = 0
+        self.items = 0
+
+    async def start(self):
+        """Start the background batching task on the running event loop."""
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background task and fail any requests not yet answered.
+
+        Callers waiting on the batch in progress, or still queued, get a
+        RuntimeError.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    async def submit(self, item):
+        """Queue ``item`` for the next batch and wait for its result."""
+        if self._task is None:
+            raise RuntimeError("MicroBatcher has not been started")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self, batch):
+        # block for the first item, then fill ``batch`` until full or timed out;
+        # items go straight into ``batch`` so stop() can fail them if cancelled
+        batch.append(await self._queue.get())
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+    async def _run(self):
+        logger = get_logger(__name__)
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = []
+            try:
+                await self._collect(batch)
+                items = [item for item, _ in batch]
+                try:
+                    results = await loop.run_in_executor(None, self.batch_fn, items)
+                except Exception as e:
+                    logger.error("Batch of %d failed: %s", len(items), e)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+            except asyncio.CancelledError:
+                # stopped mid-batch: these items are no longer in the queue
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(RuntimeError("MicroBatcher stopped"))
+                raise
+
+            self.batches += 1
+            self.items += len(items)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
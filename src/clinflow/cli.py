@@ -0,0 +1,78 @@
+from clinflow.artifacts import get_artifact_cache
+from clinflow.config import get_config
+from datetime import datetime
+import argparse
+
+
+def _format_bytes(n):
+    for unit in ("B", "KiB", "MiB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GiB"
+
+
+def cache_command(args, cfg=None):
+    """Run ``clinflow cache <action>``; returns the process exit code."""
+    if cfg is None:
+        cfg = get_config()
+    cache = get_artifact_cache(cfg)
+    if cache is None:
+        print("Artifact cache is disabled (artifacts.enabled: false)")
+        return 1
+
+    if args.action == "list":
+        entries = cache.entries()
+        for entry in entries:
+            last_used = datetime.fromtimestamp(entry["last_used"])
+            print(
+                f"{entry['key'][:12]}  {entry['kind']:6}  "
+                f"{_format_bytes(entry['bytes']):>10}  "
+                f"{last_used:%Y-%m-%d %H:%M:%S}"
+            )
+        total = sum(entry["bytes"] for entry in entries)
+        print(
+            f"{len(entries)} artifacts, {_format_bytes(total)} of "
+            f"{_format_bytes(cache.max_bytes)} in {cache.folder}"
+        )
+    elif args.action == "prune":
+        removed = cache.prune(args.max_mb)
+        print(f"Evicted {len(removed)} artifacts")
+    elif args.action == "clear":
+        print(f"Removed {cache.clear()} artifacts")
+    return 0
+
+
+def main(argv=None, cfg=None):
+    """Entry point of the ``clinflow`` command.
+
+    Examples:
+        $ clinflow cache list
+        $ clinflow cache prune --max-mb 500
+        $ clinflow cache clear
+    """
+    parser = argparse.ArgumentParser(prog="clinflow", description="clinflow tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    cache_parser = commands.add_parser(
+        "cache", help="Inspect or prune the artifact cache (config: artifacts)"
+    )
+    actions = cache_parser.add_subparsers(dest="action", required=True)
+    actions.add_parser("list", help="List cached artifacts, most recently used first")
+    prune_parser = actions.add_parser(
+        "prune", help="Evict least recently used artifacts down to a size budget"
+    )
+    prune_parser.add_argument(
+        "--max-mb",
+        type=float,
+        default=None,
+        help="Size budget in MiB (default: artifacts.max_mb)",
+    )
+    actions.add_parser("clear", help="Remove every cached artifact")
+
+    args = parser.parse_args(argv)
+    return cache_command(args, cfg)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
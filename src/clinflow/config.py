@@ -1,17 +1,160 @@
+import copy
+import os
+import threading
 import yaml
+from collections.abc import Mapping
 from pathlib import Path
 
+DEFAULT_CONFIG_PATH = Path(__file__).parent.parent.parent / "config" / "config.yml"
 
-def load_config(filepath=None):
+# parsed configs keyed on path: {path: (mtime_ns, Config)}
+_CONFIG_CACHE = {}
+_CONFIG_LOCK = threading.Lock()
+
+
+def _freeze(value):
+    # recursively convert dicts to Config and lists to tuples
+    if isinstance(value, Mapping):
+        return Config(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value):
+    # inverse of _freeze: plain dicts and lists
+    if isinstance(value, Config):
+        return {k: _thaw(v) for k, v in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
+
+
+class Config(Mapping):
+    """Immutable, nested view of a parsed configuration file.
+
+    Supports the same subscripting as the dict returned by ``yaml.safe_load``
+    (``cfg["paths"]["raw_data"]["folder"]``), so it can be passed anywhere a
+    config dict is expected. Nested sections are ``Config`` objects and lists
+    are tuples, so a shared instance cannot be mutated by one caller and
+    silently change the behaviour of another.
+
+    Use ``to_dict()`` (or ``copy.deepcopy``) to obtain a mutable copy, e.g. when
+    overriding parameters in tests.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        object.__setattr__(self, "_data", {k: _freeze(v) for k, v in data.items()})
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Config objects are read-only")
+
+    def __repr__(self):
+        return f"Config({self.to_dict()!r})"
+
+    def __deepcopy__(self, memo):
+        return self.to_dict()
+
+    def __reduce__(self):
+        return (Config, (self.to_dict(),))
+
+    def to_dict(self):
+        """Return a mutable deep copy of the configuration as plain dicts/lists."""
+        return _thaw(self)
+
+
+def _resolve_path(filepath):
     if filepath is None:
-        current_file = Path(__file__)
-        root = current_file.parent.parent.parent
-        path = root / "config" / "config.yml"
-    else:
-        path = Path(filepath)
-
-    with open(path) as f:
-        return yaml.safe_load(f)
+        return DEFAULT_CONFIG_PATH
+    return Path(filepath)
+
+
+def get_config(filepath=None):
+    """Return the parsed configuration, cached per path.
+
+    The YAML file is parsed once and cached as an immutable ``Config`` object.
+    Subsequent calls cost a single ``os.stat`` plus a dict lookup; the cached
+    entry is re-parsed automatically when the file's modification time
+    changes.
+
+    Args:
+        filepath (str or Path, optional): Path to the YAML config file. If None,
+            uses ``config/config.yml`` at the repository root. Defaults to None.
+
+    Returns:
+        Config: Read-only mapping with the parsed configuration.
+
+    Raises:
+        FileNotFoundError: If the config file does not exist.
+
+    Examples:
+        >>> cfg = get_config()
+        >>> cfg["model_training"]["test_size"]
+        0.2
+        >>> get_config() is cfg  # same object until the file changes
+        True
+    """
+    path = _resolve_path(filepath)
+    key = os.fspath(path)
+    mtime = os.stat(path).st_mtime_ns
+
+    cached = _CONFIG_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with _CONFIG_LOCK:
+        # another thread may have re-parsed while we waited
+        cached = _CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        with open(path) as f:
+            cfg = Config(yaml.safe_load(f) or {})
+        _CONFIG_CACHE[key] = (mtime, cfg)
+        return cfg
+
+
+def reload_config(filepath=None):
+    """Discard any cached entry for ``filepath`` and parse it again.
+
+    Args:
+        filepath (str or Path, optional): Path to the YAML config file. If None,
+            uses the default config path. Defaults to None.
+
+    Returns:
+        Config: Freshly parsed configuration.
+    """
+    key = os.fspath(_resolve_path(filepath))
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE.pop(key, None)
+    return get_config(filepath)
+
+
+def clear_config_cache():
+    """Drop every cached configuration."""
+    with _CONFIG_LOCK:
+        _CONFIG_CACHE.clear()
+
+
+def load_config(filepath=None):
+    """Return the configuration as a mutable dict.
+
+    Kept for callers that modify the configuration in place. Served from the
+    same cache as ``get_config()``, so the YAML file is not re-parsed; each call
+    returns an independent copy.
+    """
+    return copy.deepcopy(get_config(filepath))
 
 
 def main():
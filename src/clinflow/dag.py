@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from clinflow.logging_utils import get_logger
+from clinflow.profiling import span
+
+# file digests keyed on (path, size, mtime_ns), so unchanged files hash once
+_DIGESTS = {}
+_DIGESTS_LOCK = threading.Lock()
+
+
+def file_digest(path, block_size=1 << 20):
+    """SHA-256 of a file's contents, or None if it does not exist.
+
+    Digests are memoized on the file's path, size and modification time, so a
+    file that has not changed since it was last hashed is not read again.
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    with _DIGESTS_LOCK:
+        if key in _DIGESTS:
+            return _DIGESTS[key]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    with _DIGESTS_LOCK:
+        _DIGESTS[key] = digest.hexdigest()
+    return _DIGESTS[key]
+
+
+def config_section(cfg, key):
+    """Value of a dotted config key, e.g. "paths.raw_data" (None if absent)."""
+    value = cfg
+    for part in key.split("."):
+        if not isinstance(value, Mapping) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+
+def _json_default(value):
+    # Config sections are Mappings; anything else (e.g. Path) as text
+    if isinstance(value, Mapping):
+        return dict(value)
+    return str(value)
+
+
+class Stage:
+    """One step of a pipeline DAG.
+
+    Args:
+        name (str): Unique stage name.
+        run (callable): ``run(cfg, *upstream)`` called with the configuration
+            and the return values of ``deps``, in order; its return value is
+            passed to dependent stages.
+        deps (tuple[str]): Names of the stages this one consumes.
+        inputs (tuple[str or Path]): Files read by the stage; their contents are
+            part of its fingerprint.
+        outputs (tuple[str or Path]): Files written by the stage; if any is
+            missing or no longer holds what the stage wrote, the stage runs
+            again.
+        config (tuple[str]): Dotted config keys the stage depends on, e.g.
+            "model_training.model_params"; their values are part of its
+            fingerprint.
+    """
+
+    def __init__(self, name, run, deps=(), inputs=(), outputs=(), config=()):
+        self.name = name
+        self.run = run
+        self.deps = tuple(deps)
+        self.inputs = tuple(inputs)
+        self.outputs = tuple(outputs)
+        self.config = tuple(config)
+
+    def __repr__(self):
+        return f"Stage({self.name!r}, deps={self.deps!r})"
+
+
+class DAGRunner:
+    """Run a DAG of stages, skipping those whose inputs have not changed.
+
+    Each stage gets a fingerprint: a SHA-256 over its name, the values of its
+    config keys, the contents of its input files and the fingerprints of the
+    stages it depends on, so a change anywhere upstream changes every
+    fingerprint below it. Fingerprints of completed stages are stored in
+    ``state_file``, with the digests of their output files; on the next run a
+    stage whose fingerprint is unchanged and whose output files still have
+    those digests (e.g. were not overwritten outside the DAG) is reported as
+    "cached" and not run.
+
+    Stages run on a thread pool as soon as their dependencies are settled, so
+    independent stages (e.g. writing the processed files and loading SQLite)
+    run concurrently. A cached stage has no return value; if a stage that must
+    run depends on it, the cached stage is run first, on demand (reported as
+    "ran" with reason "needed by <stage>").
+
+    Args:
+        stages (list[Stage]): The stages; dependencies must name stages in the
+            list and must not form a cycle.
+        cfg (Mapping): Configuration passed to every stage.
+        state_file (str or Path, optional): JSON file holding the fingerprints
+            and output digests of the last successful run of each stage, and
+            the last run report.
+            If None, nothing is cached.
+        max_workers (int): Stages run at once. Defaults to 4.
+
+    Raises:
+        ValueError: For duplicate stage names, unknown dependencies or cycles.
+
+    Examples:
+        >>> runner = DAGRunner(pipeline_stages(cfg), cfg, "data/dag_state.json")
+        >>> report = runner.run()
+        >>> report["stages"]["clean"]["status"], report["cache_hits"]
+        ('cached', 7)
+    """
+
+    def __init__(self, stages, cfg, state_file=None, max_workers=4):
+        self.stages = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate stage '{stage.name}'")
+            self.stages[stage.name] = stage
+        for stage in stages:
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown '{dep}'")
+        self.order = self._topological_order()
+        self.cfg = cfg
+        self.state_file = Path(state_file) if state_file is not None else None
+        self.max_workers = max(1, max_workers)
+
+    def _topological_order(self):
+        # Kahn's algorithm, keeping declaration order among ready stages
+        remaining = {name: set(stage.deps) for name, stage in self.stages.items()}
+        order = []
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"Stages form a cycle: {', '.join(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    def _load_state(self):
+        # (fingerprints, output digests) of each stage's last successful run
+        if self.state_file is None or not self.state_file.exists():
+            return {}, {}
+        try:
+            state = json.loads(self.state_file.read_text())
+        except (OSError, ValueError):
+            return {}, {}
+        return state.get("fingerprints", {}), state.get("outputs", {})
+
+    def _save_state(self, fingerprints, outputs, report):
+        if self.state_file is None:
+            return
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.state_file.with_suffix(self.state_file.suffix + ".tmp")
+        state = {"fingerprints": fingerprints, "outputs": outputs, "last_run": report}
+        tmp.write_text(json.dumps(state, indent=2))
+        os.replace(tmp, self.state_file)
+
+    @staticmethod
+    def output_digests(stage):
+        """{path: file_digest()} of the stage's output files."""
+        return {str(path): file_digest(path) for path in stage.outputs}
+
+    def fingerprint(self, stage, dep_fingerprints):
+        """SHA-256 of the stage's config, input contents and upstream stages."""
+        payload = {
+            "stage": stage.name,
+            "config": {key: config_section(self.cfg, key) for key in stage.config},
+            "inputs": {str(path): file_digest(path) for path in stage.inputs},
+            "deps": {dep: dep_fingerprints[dep] for dep in stage.deps},
+        }
+        text = json.dumps(payload, sort_keys=True, default=_json_default)
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def run(self, force=False):
+        """Run every stage that is out of date (all of them with ``force``).
+
+        Returns:
+            dict: Run report {"stages": {name: {"status": "ran", "cached",
+                "failed" or "not run", "reason", "seconds"}}, "ran",
+                "cache_hits", "wall_seconds", "stage_seconds" (sum of stage
+                times)}.
+
+        Raises:
+            Exception: The first exception raised by a stage, after the other
+                running stages finish and the state of completed stages is saved.
+        """
+        logger = get_logger(__name__)
+        previous, previous_outputs = self._load_state()
+        fingerprints = {}
+        outputs = {}
+        values = {}
+        entries = {
+            name: {"status": "not run", "reason": None, "seconds": 0.0}
+            for name in self.order
+        }
+        locks = {name: threading.Lock() for name in self.order}
+
+        def compute(name, reason):
+            # run a stage, first running any cached dependency it needs
+            with locks[name]:
+                if name in values:
+                    return values[name]
+                stage = self.stages[name]
+                upstream = [compute(dep, f"needed by {name}") for dep in stage.deps]
+                start = time.perf_counter()
+                try:
+                    with span(name):
+                        values[name] = stage.run(self.cfg, *upstream)
+                except Exception:
+                    entries[name].update(status="failed", reason=reason)
+                    raise
+                seconds = time.perf_counter() - start
+                outputs[name] = self.output_digests(stage)
+                entries[name].update(status="ran", reason=reason, seconds=seconds)
+                logger.info("Stage %s ran in %.2f s (%s)", name, seconds, reason)
+                return values[name]
+
+        def settle(name):
+            stage = self.stages[name]
+            fingerprint = self.fingerprint(stage, fingerprints)
+            fingerprints[name] = fingerprint
+            if force:
+                reason = "forced"
+            elif name not in previous:
+                reason = "new"
+            elif previous[name] != fingerprint:
+                reason = "changed"
+            elif not all(Path(path).exists() for path in stage.outputs):
+                reason = "outputs missing"
+            elif self.output_digests(stage) != previous_outputs.get(name, {}):
+                reason = "outputs changed"
+            else:
+                outputs[name] = previous_outputs.get(name, {})
+                entries[name]["status"] = "cached"
+                logger.info("Stage %s cached", name)
+                return
+            compute(name, reason)
+
+        start = time.perf_counter()
+        waiting = {name: set(self.stages[name].deps) for name in self.order}
+        error = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for name in [n for n, deps in waiting.items() if not deps]:
+                    del waiting[name]
+                    running[executor.submit(settle, name)] = name
+
+            submit_ready()
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    if future.exception() is not None:
+                        error = error or future.exception()
+                        continue
+                    for deps in waiting.values():
+                        deps.discard(name)
+                if error is None:
+                    submit_ready()
+        wall_seconds = time.perf_counter() - start
+
+        report = {
+            "stages": entries,
+            "ran": sum(e["status"] == "ran" for e in entries.values()),
+            "cache_hits": sum(e["status"] == "cached" for e in entries.values()),
+            "wall_seconds": wall_seconds,
+            "stage_seconds": sum(e["seconds"] for e in entries.values()),
+        }
+        # stages that did not complete keep the state of their last success
+        completed = [
+            name
+            for name, entry in entries.items()
+            if entry["status"] in ("ran", "cached")
+        ]
+        kept = [
+            name
+            for name in previous
+            if name in entries and entries[name]["status"] == "not run"
+        ]
+        self._save_state(
+            {
+                **{name: previous[name] for name in kept},
+                **{name: fingerprints[name] for name in completed},
+            },
+            {
+                **{name: previous_outputs.get(name, {}) for name in kept},
+                **{name: outputs[name] for name in completed},
+            },
+            report,
+        )
+        logger.info(
+            "DAG run: %d stages ran, %d cached in %.2f s (%.2f s of stage time)",
+            report["ran"],
+            report["cache_hits"],
+            wall_seconds,
+            report["stage_seconds"],
+        )
+        if error is not None:
+            raise error
+        return report
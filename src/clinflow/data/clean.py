@@ -1,11 +1,15 @@
 from clinflow.data.load import load_dataset
 from clinflow.logging_utils import get_logger
-from clinflow.config import load_config
+from clinflow.config import get_config
+from clinflow.data.cleaning import log_report
+from clinflow.data.parallel import clean_partitioned, validate_partitioned
+from clinflow.data.schema import frame_schema, save_schema, schema_path
+from clinflow.data.storage import processed_data_paths, write_dataset
+from clinflow.data.validation import raise_for_report
 from pathlib import Path
-import pandas as pd
 
 
-def clean_data(df, cfg):
+def clean_data(df, cfg, infer_dtypes=None, return_report=False):
     """Clean and transform raw heart disease dataset for machine learning.
 
     Performs data cleaning operations including missing value handling, type
@@ -20,18 +24,33 @@ def clean_data(df, cfg):
               (e.g., "drop" to remove rows with NaN)
             - "numerical_column_names": List of columns to convert to numeric type
             - "target_column_name": Name of the target variable column (e.g., "num")
+            - "schema" (optional): {"downcast": bool, "infer": bool, "dtypes":
+              {column: dtype}} compact dtypes applied as the final stage
+            - "parallel" (optional): {"n_jobs": int, "backend": "thread" or
+              "process", "min_rows_per_partition": int} row blocks cleaned
+              concurrently (see clinflow.data.parallel)
+        infer_dtypes (bool, optional): Whether the schema stage may infer dtypes
+            for columns not listed in cfg["schema"]["dtypes"]. If None, uses
+            cfg["schema"]["infer"]. Chunked callers pass False so every chunk
+            gets the same dtypes. Defaults to None.
+        return_report (bool): Also return the cleaning report (see
+            clinflow.data.cleaning.CleaningEngine.run()). Defaults to False.
 
     Returns:
         pd.DataFrame: Cleaned dataset with the following transformations applied:
             - Missing values handled according to strategy
             - All specified columns converted to numeric types
             - New binary "target" column (0=no disease, 1=disease present)
+            - With cfg["schema"]["downcast"], integer columns stored as
+              int8/int16 and categorical columns as "category"
+        With ``return_report``, a tuple ``(df, report)``.
 
     Side Effects:
         Logs cleaning progress including:
         - Initial and final data shapes
         - Missing value counts before and after cleaning
         - Warnings for values coerced to NaN during type conversion
+        - Memory used before and after dtype downcasting
 
     Examples:
         >>> cfg = {
@@ -48,34 +67,22 @@ def clean_data(df, cfg):
         The original target column is preserved. The new "target" column binarizes
         the original multi-class severity (0-4) into binary classification (0/1).
         Type conversion uses "coerce" mode, converting invalid values to NaN.
+        All columns are scanned for nulls once; the input frame is never
+        modified, and is not copied at all when no rows are dropped.
     """
     # configure logger
     logger = get_logger(__name__)
-    logger.info(f"Initial data shape: {df.shape}")
-    logger.info(f"Missing values before cleaning: {df.isnull().sum().sum()}")
-
-    # handle missing values
-    if cfg["missing_value_strategy"] == "drop":
-        df = df.dropna().copy()
-
-    # type conversions (str -> num)
-    for name in cfg["numerical_column_names"]:
-        before_nulls = df[name].isnull().sum()
-        df[name] = pd.to_numeric(df[name], errors="coerce")
-        after_nulls = df[name].isnull().sum()
-        if after_nulls > before_nulls:
-            logger.warning(
-                f"Column {name}: {after_nulls - before_nulls} values coerced to NaN"
-            )
-
-    # log after dropping missing values
-    logger.info(f"Data shape after cleaning: {df.shape}")
-    logger.info(f"Missing values after cleaning: {df.isnull().sum().sum()}")
-
-    # encode target variable (num; heart disease) to 0/1
-    target_column = cfg["target_column_name"]
-    df["target"] = (df[target_column] > 0).astype(int)
+    logger.info("Initial data shape: %s", df.shape)
 
+    # null scan, drop, conversion, target and schema (see CleaningEngine),
+    # over concurrent row blocks when cfg["parallel"] allows
+    df, report = clean_partitioned(df, cfg, infer_dtypes)
+
+    logger.info("Data shape after cleaning: %s", df.shape)
+    log_report(report, logger)
+
+    if return_report:
+        return df, report
     return df
 
 
@@ -83,8 +90,10 @@ def validate_data(df, cfg):
     """Validate cleaned dataset meets quality and schema requirements.
 
     Performs comprehensive data quality checks to ensure the cleaned dataset is
-    ready for machine learning. Raises exceptions if any validation checks fail,
-    preventing downstream pipeline steps from proceeding with invalid data.
+    ready for machine learning. All rules are evaluated in a single vectorized
+    pass (see clinflow.data.validation.ValidationEngine) and every violation is
+    collected before raising, preventing downstream pipeline steps from
+    proceeding with invalid data.
 
     Args:
         df (pd.DataFrame): Cleaned dataset to validate. Should have been processed
@@ -94,9 +103,15 @@ def validate_data(df, cfg):
             - "categorical_column_names": Categorical columns (must be numeric codes)
             - "reasonable_ranges": Dict mapping column names to {"min": x, "max": y}
             - "minimum_rows": Minimum required number of rows in dataset
+            - "parallel" (optional): row blocks scanned concurrently, as in
+              clean_data()
+
+    Returns:
+        dict: Validation report {"rows": int, "violations": []} (empty violations
+            when the data is valid).
 
     Raises:
-        ValueError: If any validation check fails:
+        ValueError: Listing every failed check, separated by "; ":
             - Missing values found in dataset
             - Numerical columns have non-numeric dtypes
             - Categorical columns have non-numeric dtypes
@@ -105,7 +120,7 @@ def validate_data(df, cfg):
             - Dataset has fewer rows than minimum threshold
 
     Side Effects:
-        Logs success messages for each validation check that passes.
+        Logs each violation, or a success message if all checks pass.
 
     Examples:
         >>> cfg = {
@@ -123,59 +138,9 @@ def validate_data(df, cfg):
         fails, the original cleaning logic should be reviewed. Categorical columns
         are expected to already be encoded as numeric codes (not strings).
     """
-    # configure logger
-    logger = get_logger(__name__)
-
-    # check no missing values remain
-    if df.isnull().sum().sum() != 0:
-        raise ValueError(f"Too many missing values: {df.isnull().sum().sum()} missing")
-    logger.info("Missing values check passed")
-
-    # check numerical columns are numerical
-    for col in cfg["numerical_column_names"]:
-        if col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                raise ValueError(
-                    f"Numerical column {col} contains '{type(df[col])}' entries"
-                )
-
-    # check categorical codes are integers (not NaN)
-    for col in cfg["categorical_column_names"]:
-        if col in df.columns:
-            if not pd.api.types.is_numeric_dtype(df[col]):
-                raise ValueError(
-                    f"Categorical column {col} contains '{type(df[col])}' entries; should be numerical"
-                )
-    logger.info("Numerical check passed")
-
-    # check target column exists and is binary
-    try:
-        df["target"]
-    except KeyError:
-        raise ValueError("The column 'target' does not exist")
-
-    if not df["target"].isin([0, 1]).all():
-        raise ValueError("The column 'target' is not binary")
-
-    logger.info("Target column check passed")
-
-    # check for reasonable ranges
-    for col, bounds in cfg["reasonable_ranges"].items():
-        if col in df.columns:
-            if (df[col] < bounds["min"]).any() or (df[col] > bounds["max"]).any():
-                raise ValueError(
-                    f"Column {col} has values outside reasonable range"
-                    f"[{bounds['min']}, {bounds['max']}]"
-                )
-    logger.info("Reasonable ranges check passed")
-
-    # check enough data still exists for training
-    if len(df) < cfg["minimum_rows"]:
-        raise ValueError(
-            f"Less than {cfg['minimum_rows']} rows left in dataset"
-            f"[{df.sum(axis=1)}]"
-        )
-    logger.info("Row count check passed")
+    report = validate_partitioned(df, cfg)
+    raise_for_report(report)
+    return report
 
 
 def main():
@@ -188,7 +153,7 @@ def main():
     Side Effects:
         - Loads raw dataset from default path
         - Loads configuration from config file
-        - Writes cleaned data to CSV at configured processed data path
+        - Writes cleaned data to the configured processed data path(s)
         - Logs all pipeline steps and their success/failure status
 
     Raises:
@@ -202,17 +167,17 @@ def main():
 
     Note:
         This function uses default paths configured in load_dataset() and
-        load_config(). For programmatic use with custom paths, call
+        get_config(). For programmatic use with custom paths, call
         clean_data() and validate_data() directly instead.
     """
     # configure logger
     logger = get_logger(__name__)
 
-    # get df
-    df = load_dataset()
-
     # get cfg
-    cfg = load_config()
+    cfg = get_config()
+
+    # get df
+    df = load_dataset(cfg=cfg)
 
     # log successful finding
     logger.info("Configuration parameters found")
@@ -225,15 +190,18 @@ def main():
     validate_data(clean, cfg)
     logger.info("Clean dataset validated")
 
-    # configure file path
-    processed_file_path = (
-        Path(cfg["paths"]["processed_data"]["folder"])
-        / cfg["paths"]["processed_data"]["file"]
-    )
-
-    # write to csv
-    clean.to_csv(processed_file_path)
-    logger.info(f"Clean data written to {processed_file_path}")
+    # write to csv (and any additional configured formats)
+    for processed_file_path in processed_data_paths(cfg):
+        write_dataset(clean, processed_file_path)
+        logger.info(f"Clean data written to {processed_file_path}")
+
+    # dtypes sidecar next to the configured file, so the CSV reloads with the
+    # same compact schema
+    processed = cfg["paths"]["processed_data"]
+    primary_path = Path(processed["folder"]) / processed["file"]
+    schema_file_path = schema_path(primary_path)
+    save_schema(frame_schema(clean), primary_path)
+    logger.info(f"Schema written to {schema_file_path}")
 
 
 if __name__ == "__main__":
@@ -1,12 +1,12 @@
 from clinflow.logging_utils import get_logger
 from ucimlrepo import fetch_ucirepo
-from clinflow.config import load_config
+from clinflow.config import get_config
 from clinflow.data.clean import validate_data
 from pathlib import Path
 
 
 def download_dataset(
-    dataset_name: str = "Heart Disease", output_path: Path = None
+    dataset_name: str = "Heart Disease", output_path: Path = None, cfg=None
 ) -> Path:
     """
     Download UCI Heart Disease Dataset to local storage
@@ -14,6 +14,10 @@ def download_dataset(
     Fetches the Heart Disease dataset from UCI Machine Learning Repository
     and saves it as a CSV file. Skips download if file already exists
 
+    Args:
+        cfg (Mapping, optional): Configuration with the raw data path. If None,
+            uses get_config().
+
     Returns:
         Path: Path to the downlaoded CSV file
 
@@ -30,7 +34,8 @@ def download_dataset(
     logger = get_logger(__name__)
 
     # load config file
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
 
     # define download path
     download_path = (
@@ -0,0 +1,275 @@
+from clinflow.logging_utils import get_logger
+from clinflow.config import get_config
+from clinflow.data.db import connect
+from clinflow.data.query import (
+    QUERY_SPECS,
+    build_where_clause,
+    compile_query,
+    filter_columns,
+)
+import sqlite3
+
+TABLE = "patients"
+
+# above this fraction of matching rows, fetching through an index (one b-tree
+# lookup per row) is slower than scanning the table; see bench_indexing.py
+MAX_SELECTIVITY = 0.1
+
+
+def advise_indexes(specs=None, table=TABLE):
+    """Propose indexes for the filters in ``specs`` (default: QUERY_SPECS).
+
+    Each preset gets one index over the columns it filters on, ordered for
+    SQLite's planner: columns compared with "equals"/"in" first, then range
+    ("min"/"max"/"between") columns, since an index can only seek past a range
+    on its last used column. Only top-level AND terms count (see
+    query.filter_columns()); "or"/"not" groups cannot narrow an index seek.
+    Presets that share an index (or whose columns are a prefix of
+    another preset's index) reuse it.
+
+    Args:
+        specs (dict, optional): {preset: filter_spec}, as in QUERY_SPECS.
+            Defaults to None (QUERY_SPECS).
+        table (str): Table the presets query. Defaults to "patients".
+
+    Returns:
+        list[dict]: One entry per index, {"name": str, "table": str,
+            "columns": list[str], "presets": list[str]}, e.g.
+            {"name": "idx_patients_target_age", "columns": ["target", "age"], ...}.
+
+    Examples:
+        >>> [ix["columns"] for ix in advise_indexes()]
+        [['target', 'age'], ['age', 'chol'], ['exang']]
+    """
+    if specs is None:
+        specs = QUERY_SPECS
+
+    wanted = {}
+    for preset, filter_spec in specs.items():
+        equality, ranges = filter_columns(filter_spec)
+        columns = tuple(dict.fromkeys(equality + ranges))
+        if columns:
+            wanted.setdefault(columns, []).append(preset)
+
+    # longest first, so shorter column lists can reuse a longer index's prefix
+    indexes = []
+    for columns in sorted(wanted, key=len, reverse=True):
+        for index in indexes:
+            if tuple(index["columns"][: len(columns)]) == columns:
+                index["presets"].extend(wanted[columns])
+                break
+        else:
+            indexes.append(
+                {
+                    "name": f"idx_{table}_{'_'.join(columns)}",
+                    "table": table,
+                    "columns": list(columns),
+                    "presets": list(wanted[columns]),
+                }
+            )
+    return indexes
+
+
+def create_indexes(con, indexes):
+    """Create ``indexes`` (from advise_indexes()) and refresh planner statistics.
+
+    Safe to run repeatedly: existing indexes are kept. Columns missing from the
+    table are skipped with a warning rather than failing the load.
+
+    Returns:
+        list[str]: Names of the indexes that exist after the call.
+    """
+    logger = get_logger(__name__)
+    created = []
+    with con:
+        for index in indexes:
+            table_columns = {
+                row[1] for row in con.execute(f"PRAGMA table_info({index['table']})")
+            }
+            missing = [col for col in index["columns"] if col not in table_columns]
+            if missing:
+                logger.warning(
+                    "Index %s skipped: no column(s) %s", index["name"], missing
+                )
+                continue
+            columns = ", ".join(index["columns"])
+            con.execute(
+                f"CREATE INDEX IF NOT EXISTS {index['name']} "
+                f"ON {index['table']} ({columns})"
+            )
+            created.append(index["name"])
+        con.execute("ANALYZE")
+    logger.info("Indexes in place: %s", ", ".join(created) or "none")
+    return created
+
+
+def explain(con, query, params=()):
+    """Return the EXPLAIN QUERY PLAN detail lines for ``query``."""
+    return [row[-1] for row in con.execute(f"EXPLAIN QUERY PLAN {query}", params)]
+
+
+def index_coverage(con, specs=None, table=TABLE):
+    """Check which presets SQLite answers through an index.
+
+    Builds each preset's query exactly as query_patients() does and inspects
+    its EXPLAIN QUERY PLAN output.
+
+    Returns:
+        dict: {preset: {"index": index name or None (full table scan),
+            "plan": list[str]}}.
+    """
+    if specs is None:
+        specs = QUERY_SPECS
+
+    coverage = {}
+    for preset, filter_spec in specs.items():
+        query, params = compile_query(filter_spec, table)
+        try:
+            plan = explain(con, query, params)
+        except sqlite3.OperationalError as e:
+            # e.g. a preset filtering on a column the table does not have
+            plan = [f"error: {e}"]
+        index = None
+        for detail in plan:
+            if " USING " in detail and "INDEX " in detail:
+                index = detail.split("INDEX ", 1)[1].split(" ", 1)[0]
+                break
+        coverage[preset] = {"index": index, "plan": plan}
+    return coverage
+
+
+def estimate_selectivity(con, filter_spec, table=TABLE, sample_rows=100_000):
+    """Fraction of rows matching ``filter_spec``, from the first ``sample_rows``.
+
+    Returns:
+        float: Between 0 and 1 (0 for an empty table).
+    """
+    where_clause, params = build_where_clause(filter_spec)
+    (fraction,) = con.execute(
+        f"SELECT AVG({where_clause or 1}) FROM (SELECT * FROM {table} LIMIT ?)",
+        [*params, sample_rows],
+    ).fetchone()
+    return fraction or 0.0
+
+
+def _selectivities(con, specs):
+    # None for presets that cannot run (reported by index_coverage())
+    selectivity = {}
+    for preset, filter_spec in specs.items():
+        try:
+            selectivity[preset] = estimate_selectivity(con, filter_spec)
+        except sqlite3.OperationalError:
+            selectivity[preset] = None
+    return selectivity
+
+
+def build_indexes(cfg=None, con=None, specs=None):
+    """Indexing stage run after the patients table is (re)loaded.
+
+    Estimates how many rows each preset matches and creates the indexes
+    proposed by advise_indexes() for the selective ones (at most
+    cfg["database"]["index_max_selectivity"] of the rows); for the others a
+    full scan is faster, so their advised indexes are dropped if present. Index
+    use is then verified with EXPLAIN QUERY PLAN, logging a warning for any
+    selective preset still answered by a full table scan.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        con (sqlite3.Connection, optional): Open writable connection. If None,
+            the pooled writer connection is borrowed. Defaults to None.
+        specs (dict, optional): {preset: filter_spec}. Defaults to QUERY_SPECS.
+
+    Returns:
+        dict: Coverage report from index_coverage(), with each preset's
+            estimated "selectivity" added.
+    """
+    if con is None:
+        with connect(cfg, readonly=False) as con:
+            return build_indexes(cfg, con, specs)
+    if cfg is None:
+        cfg = get_config()
+    if specs is None:
+        specs = QUERY_SPECS
+
+    logger = get_logger(__name__)
+    max_selectivity = cfg.get("database", {}).get(
+        "index_max_selectivity", MAX_SELECTIVITY
+    )
+    selectivity = _selectivities(con, specs)
+    selective = {
+        preset: filter_spec
+        for preset, filter_spec in specs.items()
+        if selectivity[preset] is not None and selectivity[preset] <= max_selectivity
+    }
+
+    wanted = advise_indexes(selective)
+    wanted_names = {index["name"] for index in wanted}
+    with con:
+        for index in advise_indexes(specs):
+            if index["name"] not in wanted_names:
+                con.execute(f"DROP INDEX IF EXISTS {index['name']}")
+    create_indexes(con, wanted)
+
+    coverage = index_coverage(con, specs)
+    for preset, result in coverage.items():
+        result["selectivity"] = selectivity[preset]
+        if preset not in selective:
+            logger.info(
+                "Preset '%s' left to a full scan (matches %s of rows)",
+                preset,
+                "?" if selectivity[preset] is None else f"{selectivity[preset]:.0%}",
+            )
+        elif result["index"] is None:
+            logger.warning(
+                "Preset '%s' is not index-covered: %s", preset, result["plan"]
+            )
+        else:
+            logger.debug("Preset '%s' uses %s", preset, result["index"])
+    return coverage
+
+
+def main():
+    """Report which query presets are index-covered.
+
+    Presets matching more than cfg["database"]["index_max_selectivity"] of the
+    rows are deliberately left to full scans by --build.
+
+    Command-line Arguments:
+        --build: Create the advised indexes before reporting.
+
+    Examples:
+        $ python -m clinflow.data.indexing
+        $ python -m clinflow.data.indexing --build
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Report (and optionally build) indexes for the query presets"
+    )
+    parser.add_argument("--build", action="store_true", help="Create advised indexes")
+    args = parser.parse_args()
+
+    if args.build:
+        coverage = build_indexes()
+    else:
+        with connect() as con:
+            coverage = index_coverage(con)
+            selectivity = _selectivities(con, QUERY_SPECS)
+        for preset, result in coverage.items():
+            result["selectivity"] = selectivity[preset]
+
+    advised = {ix["name"]: ix["columns"] for ix in advise_indexes()}
+    for preset, result in coverage.items():
+        status = f"covered by {result['index']}" if result["index"] else "FULL SCAN"
+        if result["selectivity"] is not None:
+            status += f" (matches {result['selectivity']:.0%} of rows)"
+        print(f"{preset:<26} {status}")
+        for detail in result["plan"]:
+            print(f"    {detail}")
+    print("\nAdvised indexes (before the selectivity check):")
+    for name, columns in advised.items():
+        print(f"    {name} ({', '.join(columns)})")
+
+
+if __name__ == "__main__":
+    main()
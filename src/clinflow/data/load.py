@@ -1,15 +1,32 @@
 from clinflow.logging_utils import get_logger
-from clinflow.config import load_config
+from clinflow.config import get_config
+from clinflow.data.storage import read_dataset
 from pathlib import Path
 import pandas as pd
 
 
-def load_dataset(filepath=None):
+def load_dataset(filepath=None, cfg=None, columns=None):
+    """Load a dataset file (CSV or Parquet, auto-detected) into a DataFrame.
+
+    Args:
+        filepath (str or Path, optional): File to load. If None, loads the raw
+            data CSV from the configuration. Defaults to None.
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        columns (list[str], optional): Only load these columns (see
+            storage.training_columns()). Defaults to None (all columns).
+
+    Returns:
+        pd.DataFrame: The loaded dataset.
+
+    Raises:
+        FileNotFoundError: If ``filepath`` does not exist.
+    """
     # configure logger
     logger = get_logger(__name__)
 
     # get config
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
 
     # define path to dataset
     if filepath is None:
@@ -22,11 +39,51 @@ def load_dataset(filepath=None):
             raise FileNotFoundError(f"Filepath does not exist: {filepath}")
 
     # load dataset into pandas dataframe
-    df = pd.read_csv(path)
+    df = read_dataset(path, columns)
     logger.info("Dataset successfully loaded")
     return df
 
 
+def iter_dataset(filepath=None, chunksize=None, cfg=None):
+    """Yield a CSV dataset as consecutive DataFrame chunks.
+
+    Like load_dataset(), but reads ``chunksize`` rows at a time so files larger
+    than memory can be processed. Row indices continue across chunks, matching
+    the index load_dataset() would produce.
+
+    Args:
+        filepath (str or Path, optional): CSV to read. If None, uses the raw data
+            path from the configuration. Defaults to None.
+        chunksize (int, optional): Rows per chunk. If None, uses
+            cfg["streaming"]["chunksize"]. Defaults to None.
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+
+    Raises:
+        FileNotFoundError: If ``filepath`` does not exist.
+    """
+    logger = get_logger(__name__)
+    if cfg is None:
+        cfg = get_config()
+    if chunksize is None:
+        chunksize = cfg["streaming"]["chunksize"]
+
+    if filepath is None:
+        path = (
+            Path(cfg["paths"]["raw_data"]["folder"]) / cfg["paths"]["raw_data"]["file"]
+        )
+    else:
+        path = Path(filepath)
+    if not path.exists():
+        raise FileNotFoundError(f"Filepath does not exist: {path}")
+
+    logger.info("Streaming dataset from %s in chunks of %d rows", path, chunksize)
+    with pd.read_csv(path, chunksize=chunksize) as reader:
+        yield from reader
+
+
 def main():
     df = load_dataset()
 
@@ -0,0 +1,155 @@
+from clinflow.logging_utils import get_logger
+from clinflow.data.cleaning import CleaningEngine
+from clinflow.data.schema import downcast
+from clinflow.data.validation import RULES, ValidationEngine
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import os
+import numpy as np
+import pandas as pd
+
+# used when the configuration has no "parallel" section
+DEFAULT_SETTINGS = {
+    "n_jobs": 1,
+    "backend": "thread",
+    "min_rows_per_partition": 100_000,
+}
+
+BACKENDS = {"thread": ThreadPoolExecutor, "process": ProcessPoolExecutor}
+
+
+def parallel_settings(cfg):
+    """cfg["parallel"] merged over DEFAULT_SETTINGS."""
+    return {**DEFAULT_SETTINGS, **dict(cfg.get("parallel", {}))}
+
+
+def _workers(n_jobs):
+    if n_jobs in (None, -1):
+        return os.cpu_count() or 1
+    return max(1, int(n_jobs))
+
+
+def partition_rows(df, n_partitions):
+    """Split ``df`` into up to ``n_partitions`` contiguous row blocks.
+
+    Blocks are positional slices (views, not copies) in row order, so results
+    concatenated in block order reproduce the original order.
+    """
+    n_partitions = max(1, min(n_partitions, len(df)))
+    bounds = np.linspace(0, len(df), n_partitions + 1).astype(int)
+    return [df.iloc[lo:hi] for lo, hi in zip(bounds[:-1], bounds[1:])]
+
+
+def plan_partitions(df, cfg):
+    """Number of row blocks to process ``df`` in: 1 means run serially.
+
+    Each block has at least cfg["parallel"]["min_rows_per_partition"] rows, and
+    there are at most as many blocks as workers (cfg["parallel"]["n_jobs"];
+    -1 uses every core).
+    """
+    settings = parallel_settings(cfg)
+    workers = _workers(settings["n_jobs"])
+    by_size = len(df) // max(1, settings["min_rows_per_partition"])
+    return max(1, min(workers, by_size))
+
+
+def _map(fn, partitions, cfg, settings):
+    # results come back in partition order whatever order workers finish in
+    backend = settings["backend"]
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}': use 'thread' or 'process'")
+    with BACKENDS[backend](max_workers=len(partitions)) as executor:
+        return list(executor.map(fn, [cfg] * len(partitions), partitions))
+
+
+def _clean_partition(cfg, partition):
+    # the schema stage runs once on the combined result, so every block gets
+    # the same dtypes
+    return CleaningEngine(cfg, downcast=False).run(partition)
+
+
+def _scan_partition(cfg, partition):
+    return ValidationEngine(cfg).scan(partition)
+
+
+def clean_partitioned(df, cfg, infer_dtypes=None, n_partitions=None):
+    """CleaningEngine.run() over row blocks cleaned concurrently.
+
+    Blocks are cleaned on a thread or process pool (cfg["parallel"]["backend"]):
+    null scans, NumPy comparisons and numeric conversions release the GIL for
+    most of their work, so threads avoid the cost of pickling blocks to worker
+    processes; processes suit string-heavy raw data. Cleaned blocks are
+    concatenated in order and downcast once, and the block reports are merged
+    in order, so the result and report are the same as a serial run.
+
+    Args:
+        df (pd.DataFrame): Raw data.
+        cfg (Mapping): Configuration (see CleaningEngine and cfg["parallel"]).
+        infer_dtypes (bool, optional): Passed to schema.downcast().
+        n_partitions (int, optional): Row blocks. If None, uses
+            plan_partitions().
+
+    Returns:
+        tuple[pd.DataFrame, dict]: Cleaned frame and cleaning report.
+    """
+    logger = get_logger(__name__)
+    settings = parallel_settings(cfg)
+    if n_partitions is None:
+        n_partitions = plan_partitions(df, cfg)
+    engine = CleaningEngine(cfg, infer_dtypes)
+    if n_partitions <= 1:
+        return engine.run(df)
+
+    partitions = partition_rows(df, n_partitions)
+    logger.info(
+        "Cleaning %d rows in %d blocks (%s backend)",
+        len(df),
+        len(partitions),
+        settings["backend"],
+    )
+    results = _map(_clean_partition, partitions, cfg, settings)
+
+    clean = pd.concat([part for part, _ in results])
+    report = None
+    for _, part_report in results:
+        report = engine.merge(report, part_report)
+    # coerced counts in column order, as a serial run lists them
+    coerced = report["coerced"]
+    report["coerced"] = {
+        col: coerced[col] for col in engine.numerical if col in coerced
+    }
+
+    if engine.downcast:
+        clean, info = downcast(clean, cfg, infer_dtypes)
+        report["bytes_before"] = info["bytes_before"]
+        report["bytes_after"] = info["bytes_after"]
+    return clean, report
+
+
+def validate_partitioned(df, cfg, n_partitions=None):
+    """ValidationEngine.run() over row blocks scanned concurrently.
+
+    Block reports are merged in row order (so example row labels are the first
+    offending rows, as in a serial scan) and violations are ordered by rule
+    and then by column, giving the same report as ValidationEngine(cfg).run(df).
+
+    Returns:
+        dict: Finalized validation report.
+    """
+    settings = parallel_settings(cfg)
+    if n_partitions is None:
+        n_partitions = plan_partitions(df, cfg)
+    engine = ValidationEngine(cfg)
+    if n_partitions <= 1:
+        return engine.run(df)
+
+    report = None
+    partitions = partition_rows(df, n_partitions)
+    for part_report in _map(_scan_partition, partitions, cfg, settings):
+        report = engine.merge(report, part_report)
+
+    # rule order, then column order, as a single scan produces them
+    position = {col: i for i, col in enumerate(df.columns)}
+    report["violations"].sort(
+        key=lambda v: (RULES.index(v["rule"]), position.get(v["column"], len(position)))
+    )
+    return engine.finalize(report)
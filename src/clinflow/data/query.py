@@ -1,8 +1,11 @@
+import numpy as np
 import pandas as pd
-import sqlite3
-from pathlib import Path
+import re
 from clinflow.logging_utils import get_logger
-from clinflow.config import load_config
+from clinflow.config import get_config
+from clinflow.data.db import connect, database_path
+from clinflow.data.query_cache import get_query_cache
+from clinflow.profiling import profiled
 
 QUERY_SPECS = {
     "high_risk_seniors": {
@@ -19,7 +22,16 @@ QUERY_SPECS = {
 }
 
 
-def query_patients(preset):
+@profiled(rows=lambda results, *args, **kwargs: len(results))
+def query_patients(
+    preset,
+    cfg=None,
+    columns=None,
+    order_by=None,
+    limit=None,
+    offset=None,
+    use_cache=True,
+):
     """Query patient data from SQLite database using predefined filter presets.
 
     This function retrieves patient records from the clinflow database by applying
@@ -27,13 +39,30 @@ def query_patients(preset):
     is set to "all", it returns all patient records.
 
     Args:
-        preset (str): Name of the query preset to apply. Must be a key in QUERY_SPECS
-            (e.g., "high_risk_seniors", "young_with_high_chol") or "all" to retrieve
-            all records. If an invalid preset is provided, defaults to returning all.
+        preset (str or dict): Name of the query preset to apply. Must be a key in
+            QUERY_SPECS (e.g., "high_risk_seniors", "young_with_high_chol") or "all"
+            to retrieve all records. If an invalid preset is provided, defaults to
+            returning all. A filter specification dict (see build_where_clause())
+            may be passed instead of a name for ad hoc queries.
+        cfg (Mapping, optional): Configuration providing the database path. If
+            None, uses the cached configuration from get_config(). Defaults to None.
+        columns (list[str], optional): Only select these columns, e.g.
+            storage.training_columns(cfg). Defaults to None (all columns).
+        order_by (list[str], optional): Sort columns; prefix with "-" for
+            descending. Defaults to None (table order).
+        limit (int, optional): Maximum rows returned. Defaults to None.
+        offset (int, optional): Rows skipped before returning. Defaults to None.
+        use_cache (bool): Serve repeated queries from the result cache
+            configured under cfg["database"]["query_cache"]. Defaults to True.
 
     Returns:
         pd.DataFrame: DataFrame containing patient records that match the filter
-            criteria. Columns correspond to the patients table schema.
+            criteria. Columns correspond to the patients table schema, or to
+            ``columns`` when given.
+
+    Raises:
+        ValueError: If a specification uses an unknown rule or an invalid column
+            name.
 
     Examples:
         >>> # Query high-risk senior patients
@@ -44,47 +73,204 @@ def query_patients(preset):
         >>>
         >>> # Invalid preset falls back to all patients
         >>> results = query_patients("nonexistent")  # Logs warning, returns all
+        >>>
+        >>> # Only the model's columns, oldest first
+        >>> df = query_patients("all", columns=training_columns(cfg), order_by=["-age"])
 
     Note:
-        The database connection is automatically opened and closed within this function.
-        Queries use parameterized statements to prevent SQL injection.
+        A read-only connection is borrowed from the shared pool in
+        clinflow.data.db and returned afterwards, so repeated queries reuse open
+        connections and their prepared statements. Queries use parameterized
+        statements to prevent SQL injection. Results are cached (see
+        clinflow.data.query_cache) until the database file next changes.
     """
     logger = get_logger(__name__)
 
-    logger.info(f"Querying preset: '{preset}'")
-    cfg = load_config()
+    logger.info("Querying preset: '%s'", preset)
 
-    # connect to SQL databse
-    database_path = (
-        Path(cfg["paths"]["database_path"]["folder"])
-        / cfg["paths"]["database_path"]["file"]
+    # build SQL query from the specification
+    query, params = compile_query(
+        _resolve_preset(preset),
+        columns=columns,
+        order_by=order_by,
+        limit=limit,
+        offset=offset,
     )
-    with sqlite3.connect(database_path) as con:
-        # build SQL query from presets
-        if preset in QUERY_SPECS:
-            filter_spec = QUERY_SPECS[preset]
-            where_clause, params = build_where_clause(filter_spec)
-            query = f"SELECT * FROM patients WHERE {where_clause}"
-            logger.info(f"SQL query: {query} with params: {params}")
-
-            results = pd.read_sql_query(query, con, params=params)
-        else:
-            if not preset == "all":
-                logger.warning(f"Preset '{preset}' not found: returning all")
-            query = "SELECT * FROM patients"
-            results = pd.read_sql_query(query, con)
-            logger.info(f"SQL query: '{query}'")
+    logger.info("SQL query: %s with params: %s", query, params)
+
+    def run():
+        # borrow a pooled read-only connection (see clinflow.data.db)
+        with connect(cfg) as con:
+            return pd.read_sql_query(query, con, params=params)
 
-        logger.info(f"Query returned {len(results)} rows")
+    cache = get_query_cache(cfg) if use_cache else None
+    if cache is None:
+        results = run()
+    else:
+        results = cache.get_or_run(database_path(cfg), query, params, run)
 
+    logger.info("Query returned %d rows", len(results))
     return results
 
 
+def iter_patients(
+    preset, cfg=None, chunksize=None, columns=None, order_by=None, as_numpy=False
+):
+    """Stream the rows matched by a preset in fixed-size chunks.
+
+    Like query_patients(), but rows are fetched from an open SQLite cursor
+    ``chunksize`` at a time instead of being materialized at once, so memory
+    use depends on the chunk size rather than on the size of the table. The
+    cursor reads one consistent snapshot of the database; in WAL mode writers
+    are not blocked while it is open. Results are not cached.
+
+    Args:
+        preset (str or dict): Preset name, "all", or a filter specification
+            (see query_patients()).
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        chunksize (int, optional): Rows per chunk. If None, uses
+            cfg["streaming"]["chunksize"]. Defaults to None.
+        columns (list[str], optional): Only select these columns. Defaults to
+            None (all columns).
+        order_by (list[str], optional): Sort columns; prefix with "-" for
+            descending. Defaults to None (table order).
+        as_numpy (bool): Yield float64 arrays (rows x columns) instead of
+            DataFrames; the selected columns must be numeric. Defaults to False.
+
+    Yields:
+        pd.DataFrame or np.ndarray: The next chunk of at most ``chunksize`` rows.
+            DataFrame indices continue across chunks, as with
+            load.iter_dataset().
+
+    Examples:
+        >>> for chunk in iter_patients("all", chunksize=50_000,
+        ...                            columns=training_columns(cfg)):
+        ...     model.partial_fit(chunk.drop(columns="target"), chunk["target"])
+    """
+    logger = get_logger(__name__)
+    if cfg is None:
+        cfg = get_config()
+    if chunksize is None:
+        chunksize = cfg["streaming"]["chunksize"]
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    query, params = compile_query(
+        _resolve_preset(preset), columns=columns, order_by=order_by
+    )
+    logger.info("Streaming %s in chunks of %d rows", query, chunksize)
+
+    rows_read = 0
+    # the pooled connection stays borrowed until the generator is exhausted
+    # or closed
+    with connect(cfg) as con:
+        cursor = con.execute(query, params)
+        try:
+            names = [description[0] for description in cursor.description]
+            while rows := cursor.fetchmany(chunksize):
+                if as_numpy:
+                    yield np.array(rows, dtype=np.float64)
+                else:
+                    index = pd.RangeIndex(rows_read, rows_read + len(rows))
+                    yield pd.DataFrame.from_records(rows, columns=names, index=index)
+                rows_read += len(rows)
+        finally:
+            cursor.close()
+    logger.info("Streamed %d rows", rows_read)
+
+
+def _resolve_preset(preset):
+    # a preset name, "all" (or an unknown name) or a filter specification
+    if isinstance(preset, dict):
+        return preset
+    if preset in QUERY_SPECS:
+        return QUERY_SPECS[preset]
+    if not preset == "all":
+        get_logger(__name__).warning("Preset '%s' not found: returning all", preset)
+    return {}
+
+
+# rule -> (SQL template, number of parameters); None means "a list of values"
+_RULES = {
+    "min": ("{col} >= ?", 1),
+    "max": ("{col} <= ?", 1),
+    "equals": ("{col} = ?", 1),
+    "not_equals": ("{col} != ?", 1),
+    "between": ("{col} BETWEEN ? AND ?", 2),
+    "in": ("{col} IN ({placeholders})", None),
+    "not_in": ("{col} NOT IN ({placeholders})", None),
+}
+
+# rules an index can seek on as the leading (equality) or last (range) column
+EQUALITY_RULES = ("equals", "in")
+RANGE_RULES = ("min", "max", "between")
+
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _identifier(name):
+    # column names are interpolated into SQL, so only plain identifiers pass
+    if not isinstance(name, str) or not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid column name: {name!r}")
+    return name
+
+
+def _column_conditions(column, rules, conditions, params):
+    column = _identifier(column)
+    for rule, value in rules.items():
+        if rule == "is_null":
+            conditions.append(f"{column} IS {'' if value else 'NOT '}NULL")
+            continue
+        if rule not in _RULES:
+            raise ValueError(f"Unknown rule '{rule}' for column {column}")
+        template, n_params = _RULES[rule]
+        if n_params is None:
+            values = list(value)
+            if not values:
+                # IN () matches nothing, NOT IN () everything
+                conditions.append("0" if rule == "in" else "1")
+                continue
+            placeholders = ", ".join("?" * len(values))
+            conditions.append(template.format(col=column, placeholders=placeholders))
+            params.extend(values)
+        elif n_params == 2:
+            low, high = value
+            conditions.append(template.format(col=column))
+            params.extend([low, high])
+        else:
+            conditions.append(template.format(col=column))
+            params.append(value)
+
+
+def _conditions(filter_spec, params):
+    conditions = []
+    for key, value in filter_spec.items():
+        if key == "and":
+            clauses = [_group(spec, params) for spec in value]
+            conditions.extend(c for c in clauses if c)
+        elif key == "or":
+            clauses = [_group(spec, params) for spec in value]
+            if clauses:
+                conditions.append(
+                    "(" + " OR ".join(f"({c})" if c else "1" for c in clauses) + ")"
+                )
+        elif key == "not":
+            clause = _group(value, params)
+            conditions.append(f"NOT ({clause})" if clause else "0")
+        else:
+            _column_conditions(key, value, conditions, params)
+    return conditions
+
+
+def _group(filter_spec, params):
+    return " AND ".join(_conditions(filter_spec, params))
+
+
 def build_where_clause(filter_spec):
     """Build a parameterized SQL WHERE clause from a filter specification.
 
     Constructs a SQL WHERE clause with parameterized placeholders (?) to safely
-    filter database queries. Supports min, max, and equals operations on columns.
+    filter database queries.
 
     Args:
         filter_spec (dict): Dictionary mapping column names to filter rules.
@@ -92,13 +278,25 @@ def build_where_clause(filter_spec):
             - "min": Include records where column >= this value
             - "max": Include records where column <= this value
             - "equals": Include records where column == this value
+            - "not_equals": Include records where column != this value
+            - "between": [low, high], inclusive
+            - "in" / "not_in": List of values
+            - "is_null": True for NULL values, False for non-NULL values
             Multiple rules for the same column are combined with AND.
+            Specifications combine with the keys:
+            - "and": List of specifications that must all match
+            - "or": List of specifications of which any must match
+            - "not": A specification that must not match
 
     Returns:
         tuple[str, list]: A tuple containing:
             - str: SQL WHERE clause with ? placeholders (e.g., "age >= ? AND chol <= ?")
             - list: Ordered list of parameter values to substitute for placeholders
 
+    Raises:
+        ValueError: For unknown rules or column names that are not plain
+            identifiers.
+
     Examples:
         >>> spec = {"age": {"min": 60}, "chol": {"max": 200}}
         >>> where_clause, params = build_where_clause(spec)
@@ -106,24 +304,81 @@ def build_where_clause(filter_spec):
         age >= ? AND chol <= ?
         >>> print(params)
         [60, 200]
+        >>> spec = {"or": [{"cp": {"in": [1, 4]}}, {"age": {"between": [40, 60]}}]}
+        >>> build_where_clause(spec)
+        ('((cp IN (?, ?)) OR (age BETWEEN ? AND ?))', [1, 4, 40, 60])
 
     Note:
         Returns empty strings and lists if filter_spec is empty. This function
         uses parameterized queries to prevent SQL injection attacks.
     """
-    conditions = []
     params = []
-    for column, rules in filter_spec.items():
-        if "min" in rules:
-            conditions.append(f"{column} >= ?")
-            params.append(rules["min"])
-        if "max" in rules:
-            conditions.append(f"{column} <= ?")
-            params.append(rules["max"])
-        if "equals" in rules:
-            conditions.append(f"{column} = ?")
-            params.append(rules["equals"])
-    return " AND ".join(conditions), params
+    return _group(filter_spec, params), params
+
+
+def compile_query(
+    filter_spec, table="patients", columns=None, order_by=None, limit=None, offset=None
+):
+    """Compile a filter specification into a complete parameterized SELECT.
+
+    Args:
+        filter_spec (dict): Filter specification (see build_where_clause()).
+        table (str): Table to query. Defaults to "patients".
+        columns (list[str], optional): Columns to select. Defaults to None (*).
+        order_by (list[str], optional): Sort columns; "-age" sorts descending.
+        limit (int, optional): Maximum rows returned.
+        offset (int, optional): Rows skipped before returning (implies a LIMIT).
+
+    Returns:
+        tuple[str, list]: SQL query and its parameters.
+
+    Examples:
+        >>> compile_query({"age": {"min": 60}}, columns=["age", "target"],
+        ...               order_by=["-age"], limit=10)
+        ('SELECT age, target FROM patients WHERE age >= ? ORDER BY age DESC LIMIT ?',
+         [60, 10])
+    """
+    where_clause, params = build_where_clause(filter_spec)
+    projection = ", ".join(_identifier(c) for c in columns) if columns else "*"
+    query = f"SELECT {projection} FROM {_identifier(table)}"
+    if where_clause:
+        query += f" WHERE {where_clause}"
+    if order_by:
+        terms = [
+            f"{_identifier(c[1:])} DESC" if c.startswith("-") else _identifier(c)
+            for c in order_by
+        ]
+        query += f" ORDER BY {', '.join(terms)}"
+    if limit is not None or offset is not None:
+        query += " LIMIT ?"
+        params.append(-1 if limit is None else int(limit))
+    if offset is not None:
+        query += " OFFSET ?"
+        params.append(int(offset))
+    return query, params
+
+
+def filter_columns(filter_spec):
+    """Columns a specification filters on at its top level (its AND terms).
+
+    Columns under "or"/"not" groups are left out, since an index on them cannot
+    narrow the whole query.
+
+    Returns:
+        tuple[list[str], list[str]]: (equality columns, range columns), e.g.
+            (["target"], ["age"]) for {"age": {"min": 60}, "target": {"equals": 1}}.
+    """
+    equality, ranges = [], []
+    specs = [filter_spec] + list(filter_spec.get("and", []))
+    for spec in specs:
+        for column, rules in spec.items():
+            if column in ("and", "or", "not"):
+                continue
+            if any(rule in EQUALITY_RULES for rule in rules):
+                equality.append(column)
+            elif any(rule in RANGE_RULES for rule in rules):
+                ranges.append(column)
+    return equality, ranges
 
 
 def main():
@@ -0,0 +1,261 @@
+from clinflow.logging_utils import get_logger
+from clinflow.config import get_config
+from clinflow.data.db import database_path
+from collections import OrderedDict
+from pathlib import Path
+import hashlib
+import json
+import os
+import threading
+import uuid
+import pandas as pd
+
+# used when cfg["database"] has no "query_cache" section
+DEFAULT_SETTINGS = {
+    "enabled": True,
+    "max_entries": 32,
+    "max_memory_mb": 256,
+    "folder": None,
+    "max_disk_mb": 1024,
+}
+
+# iVersion, iChange, mxFrame, nPage, frame checksum, salts and header checksum
+_WAL_INDEX_HEADER_BYTES = 48
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def database_version(path):
+    """Stamp that changes whenever the SQLite database at ``path`` is written.
+
+    SQLite's own ``PRAGMA data_version`` is only comparable within one
+    connection, so it cannot key results across processes. The stamp is built
+    from the database file's identity, size and mtime instead, plus the state
+    of the WAL: in WAL mode commits go to the -wal file without touching the
+    database file, and after a checkpoint they overwrite earlier frames in
+    place, so the -wal size and header alone can stay the same. The WAL-index
+    header at the start of the -shm file holds the change counter, the last
+    committed frame (mxFrame) and its checksum, which move on every commit;
+    the -wal and -shm mtimes are included as well.
+
+    Returns:
+        list or None: JSON-serialisable stamp, or None if the file is missing.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    stamp = [stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns]
+    for suffix, header_bytes in (("-wal", 32), ("-shm", _WAL_INDEX_HEADER_BYTES)):
+        try:
+            with open(f"{path}{suffix}", "rb") as f:
+                wal_stat = os.fstat(f.fileno())
+                header = f.read(header_bytes).hex()
+        except FileNotFoundError:
+            continue
+        stamp += [suffix, wal_stat.st_size, wal_stat.st_mtime_ns, header]
+    return stamp
+
+
+class QueryCache:
+    """Two-tier cache of query results: an in-memory LRU over a Parquet folder.
+
+    Entries are keyed on the database file, its version stamp
+    (database_version()), the SQL and its parameters, so any write to the
+    database makes earlier entries unreachable; they age out through the size
+    bounds rather than being invalidated explicitly.
+
+    The memory tier holds at most ``max_entries`` frames and ``max_memory_mb``
+    of data, evicting the least recently used. Results are also written to
+    ``folder`` as Parquet, where they survive the process (e.g. repeated
+    ``train_model_cli --from-db`` runs); the folder is pruned to
+    ``max_disk_mb``, oldest first, and files read back are promoted to memory.
+
+    Args:
+        folder (str or Path, optional): Disk tier location. None disables it.
+        max_entries (int): Frames kept in memory. Defaults to 32.
+        max_memory_mb (float): Memory tier budget. Defaults to 256.
+        max_disk_mb (float): Disk tier budget. Defaults to 1024.
+
+    Examples:
+        >>> cache = QueryCache("data/query_cache")
+        >>> df = cache.get_or_run("data/clinflow.db", sql, params, run_query)
+        >>> cache.stats
+        {'memory_hits': 0, 'disk_hits': 0, 'misses': 1}
+    """
+
+    def __init__(
+        self, folder=None, max_entries=32, max_memory_mb=256, max_disk_mb=1024
+    ):
+        self.folder = Path(folder) if folder is not None else None
+        self.max_entries = max_entries
+        self.max_memory_bytes = int(max_memory_mb * 2**20)
+        self.max_disk_bytes = int(max_disk_mb * 2**20)
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(db_path, sql, params):
+        """Cache key for ``sql`` with ``params`` against the current database."""
+        payload = json.dumps(
+            [str(db_path), database_version(db_path), sql, list(params)], default=str
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get_or_run(self, db_path, sql, params, run):
+        """Return the cached result of ``sql``, calling ``run()`` on a miss.
+
+        Args:
+            db_path (str or Path): Database the query runs against.
+            sql (str): Compiled query.
+            params (list): Query parameters.
+            run (callable): Executes the query, returning a DataFrame.
+
+        Returns:
+            pd.DataFrame: A copy, so callers may modify it freely.
+        """
+        logger = get_logger(__name__)
+        key = self.key(db_path, sql, params)
+
+        tier = "memory"
+        df = self._get_memory(key)
+        if df is None:
+            tier = "disk"
+            df = self._get_disk(key)
+            if df is not None:
+                self._put_memory(key, df)
+        if df is None:
+            tier = "miss"
+            df = run()
+            self._put_memory(key, df)
+            self._put_disk(key, df)
+
+        with self._lock:
+            self.stats["misses" if tier == "miss" else f"{tier}_hits"] += 1
+            stats = dict(self.stats)
+        logger.info(
+            "Query cache %s (hits: %d memory, %d disk; misses: %d)",
+            "miss" if tier == "miss" else f"hit ({tier})",
+            stats["memory_hits"],
+            stats["disk_hits"],
+            stats["misses"],
+        )
+        return df.copy()
+
+    def clear(self):
+        """Drop every entry from both tiers."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+        if self.folder is not None and self.folder.exists():
+            for path in self.folder.glob("*.parquet"):
+                path.unlink(missing_ok=True)
+
+    def _get_memory(self, key):
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is None:
+                return None
+            self._memory.move_to_end(key)
+            return entry[0]
+
+    def _put_memory(self, key, df):
+        size = int(df.memory_usage(index=True, deep=True).sum())
+        if size > self.max_memory_bytes or self.max_entries < 1:
+            return
+        with self._lock:
+            if key in self._memory:
+                self._memory_bytes -= self._memory.pop(key)[1]
+            self._memory[key] = (df.copy(), size)
+            self._memory_bytes += size
+            while (
+                len(self._memory) > self.max_entries
+                or self._memory_bytes > self.max_memory_bytes
+            ):
+                self._memory_bytes -= self._memory.popitem(last=False)[1][1]
+
+    def _get_disk(self, key):
+        if self.folder is None:
+            return None
+        path = self.folder / f"{key}.parquet"
+        try:
+            df = pd.read_parquet(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # a truncated or unreadable file is just a miss
+            get_logger(__name__).warning("Ignoring cache file %s (%s)", path, e)
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)  # recently used files are pruned last
+        return df
+
+    def _put_disk(self, key, df):
+        if self.folder is None:
+            return
+        self.folder.mkdir(parents=True, exist_ok=True)
+        path = self.folder / f"{key}.parquet"
+        # write then rename, so concurrent readers never see a partial file
+        tmp = path.with_suffix(f".{uuid.uuid4().hex}.tmp")
+        try:
+            df.to_parquet(tmp, index=False)
+            os.replace(tmp, path)
+        except Exception as e:
+            tmp.unlink(missing_ok=True)
+            get_logger(__name__).warning("Query result not cached on disk (%s)", e)
+            return
+        self._prune_disk()
+
+    def _prune_disk(self):
+        files = []
+        for path in self.folder.glob("*.parquet"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime_ns, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def get_query_cache(cfg=None):
+    """Return the shared QueryCache configured in cfg["database"]["query_cache"].
+
+    The disk tier defaults to a "query_cache" folder next to the database.
+
+    Returns:
+        QueryCache or None: None if caching is disabled.
+    """
+    if cfg is None:
+        cfg = get_config()
+    settings = {**DEFAULT_SETTINGS, **cfg.get("database", {}).get("query_cache", {})}
+    if not settings["enabled"]:
+        return None
+    folder = settings["folder"]
+    if folder is None:
+        folder = database_path(cfg).parent / "query_cache"
+
+    key = (str(folder), settings["max_entries"], settings["max_memory_mb"])
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = QueryCache(
+                folder,
+                max_entries=settings["max_entries"],
+                max_memory_mb=settings["max_memory_mb"],
+                max_disk_mb=settings["max_disk_mb"],
+            )
+        return cache
+
+
+def clear_query_caches():
+    """Forget the shared in-memory caches (files on disk are kept)."""
+    with _caches_lock:
+        _caches.clear()
@@ -0,0 +1,170 @@
+from clinflow.logging_utils import get_logger
+from pathlib import Path
+import json
+import numpy as np
+import pandas as pd
+
+# candidate integer dtypes, smallest first
+_INT_DTYPES = ("int8", "int16", "int32", "int64")
+
+
+def minimal_int_dtype(values):
+    """Smallest signed integer dtype that holds every value, or None.
+
+    Returns None when the values are not all integral (or contain NaN), in
+    which case the column should keep a float dtype.
+    """
+    values = np.asarray(values)
+    if values.size == 0:
+        return "int8"
+    if values.dtype.kind == "f":
+        if np.isnan(values).any() or not np.array_equal(values, np.trunc(values)):
+            return None
+    elif values.dtype.kind not in "iub":
+        return None
+    lo, hi = values.min(), values.max()
+    for dtype in _INT_DTYPES:
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return None
+
+
+def infer_schema(df, cfg, infer=None):
+    """Build the column -> dtype mapping for a cleaned DataFrame.
+
+    Dtypes listed in cfg["schema"]["dtypes"] are used as given, and other
+    columns in cfg["categorical_column_names"] become "category" over their
+    minimal integer codes. With ``infer``, the remaining numeric columns get
+    their minimal integer dtype when every value is integral (floats with
+    fractions are left as-is so no precision is lost).
+
+    Args:
+        df (pd.DataFrame): Cleaned data.
+        cfg (Mapping): Configuration with the optional "schema" section.
+        infer (bool, optional): Infer dtypes of unlisted columns. If None, uses
+            cfg["schema"]["infer"]. Defaults to None.
+
+    Returns:
+        dict: {column: dtype string}, e.g. {"age": "int16", "sex": "category"}.
+    """
+    schema_cfg = cfg.get("schema", {})
+    configured = dict(schema_cfg.get("dtypes", {}))
+    if infer is None:
+        infer = schema_cfg.get("infer", False)
+    categorical = set(cfg["categorical_column_names"])
+    schema = {}
+    for col in df.columns:
+        if col in configured:
+            schema[col] = configured[col]
+        elif col in categorical:
+            schema[col] = "category"
+        elif infer and pd.api.types.is_numeric_dtype(df[col].dtype):
+            schema[col] = minimal_int_dtype(df[col].to_numpy()) or str(df[col].dtype)
+    return schema
+
+
+def apply_schema(df, schema):
+    """Cast columns of ``df`` to the dtypes in ``schema`` (in place).
+
+    "category" columns are first cast to their minimal integer dtype so the
+    categories stay numeric codes (e.g. int8 3/6/7 for "thal"), which keeps
+    validation, one-hot encoding and SQL writes working unchanged. Integer
+    dtypes are skipped (with a warning) for columns holding NaN, fractional or
+    out-of-range values, so downcasting never changes a value.
+
+    Returns:
+        pd.DataFrame: ``df``, with converted columns.
+    """
+    logger = get_logger(__name__)
+    for col, dtype in schema.items():
+        if col not in df.columns or str(df[col].dtype) == dtype:
+            continue
+        if dtype == "category":
+            codes_dtype = minimal_int_dtype(df[col].to_numpy())
+            values = df[col].astype(codes_dtype) if codes_dtype else df[col]
+            df[col] = values.astype("category")
+        elif dtype in _INT_DTYPES:
+            needed = minimal_int_dtype(df[col].to_numpy())
+            if needed is None or np.iinfo(needed).max > np.iinfo(dtype).max:
+                logger.warning("Column %s cannot be stored as %s; skipped", col, dtype)
+                continue
+            df[col] = df[col].astype(dtype)
+        else:
+            df[col] = df[col].astype(dtype)
+    return df
+
+
+def downcast(df, cfg, infer=None):
+    """Schema stage of clean_data(): downcast ``df`` and log the memory saved.
+
+    Args:
+        df (pd.DataFrame): Cleaned data.
+        cfg (Mapping): Configuration (see infer_schema()).
+        infer (bool, optional): Passed to infer_schema(). Defaults to None.
+
+    Returns:
+        tuple[pd.DataFrame, dict]: The converted frame and a report
+            {"schema": dict, "bytes_before": int, "bytes_after": int}.
+    """
+    logger = get_logger(__name__)
+
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    schema = infer_schema(df, cfg, infer)
+    df = apply_schema(df, schema)
+    bytes_after = int(df.memory_usage(deep=True).sum())
+
+    logger.info(
+        "Downcast dtypes: %.1f KiB -> %.1f KiB (%.0f%% saved)",
+        bytes_before / 1024,
+        bytes_after / 1024,
+        100 * (1 - bytes_after / bytes_before) if bytes_before else 0,
+    )
+    report = {
+        "schema": schema,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+    }
+    return df, report
+
+
+def frame_schema(df):
+    """The {column: dtype string} schema of an existing DataFrame."""
+    return {col: str(dtype) for col, dtype in df.dtypes.items()}
+
+
+def decode_categories(df):
+    """Return ``df`` with "category" columns converted back to their values.
+
+    Needed before DataFrame.to_sql, which would otherwise store categorical
+    columns as TEXT.
+    """
+    categorical = {
+        col: df[col].cat.categories.dtype
+        for col in df.columns
+        if isinstance(df[col].dtype, pd.CategoricalDtype)
+    }
+    return df.astype(categorical) if categorical else df
+
+
+def schema_path(data_path):
+    """Sidecar schema file for a processed-data file: clean.csv -> clean.schema.json."""
+    data_path = Path(data_path)
+    return data_path.with_name(f"{data_path.stem}.schema.json")
+
+
+def save_schema(schema, data_path):
+    """Write ``schema`` as JSON next to the processed-data file ``data_path``."""
+    path = schema_path(data_path)
+    with open(path, "w") as f:
+        json.dump(schema, f, indent=2)
+    return path
+
+
+def load_schema(data_path):
+    """Read the sidecar schema for ``data_path``, or None if there is none."""
+    path = schema_path(data_path)
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
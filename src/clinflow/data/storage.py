@@ -0,0 +1,270 @@
+from clinflow.logging_utils import get_logger
+from clinflow.data.schema import apply_schema, load_schema
+from pathlib import Path
+import mmap
+import pandas as pd
+
+# file extension -> storage format
+FORMATS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+# leading bytes used to recognise files whose extension is missing or unknown
+_MAGIC = {
+    b"PAR1": "parquet",
+    b"ARROW1": "arrow",
+}
+
+
+def detect_format(filepath):
+    """Return the storage format ("csv", "parquet" or "arrow") of a dataset file.
+
+    The file extension is used when recognised; otherwise the first bytes of the
+    file are inspected, falling back to CSV.
+    """
+    path = Path(filepath)
+    suffix = path.suffix.lower()
+    if suffix in FORMATS:
+        return FORMATS[suffix]
+    if path.exists():
+        with open(path, "rb") as f:
+            head = f.read(8)
+        for magic, fmt in _MAGIC.items():
+            if head.startswith(magic):
+                return fmt
+    return "csv"
+
+
+def _read_arrow_mmap(filepath, columns=None):
+    # Map the file copy-on-write: pages come from (and stay shared through) the
+    # OS page cache, and the file itself can never be modified through the map.
+    import pyarrow as pa
+
+    with open(filepath, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    table = pa.ipc.open_file(pa.BufferReader(pa.py_buffer(mapped))).read_all()
+    if columns is not None:
+        table = table.select(columns)
+
+    # split_blocks keeps one block per column, so null-free numeric columns are
+    # NumPy views over the mapped buffers rather than a consolidated copy
+    return table.to_pandas(split_blocks=True)
+
+
+def read_dataset(filepath, columns=None):
+    """Read a dataset file in any supported format into a DataFrame.
+
+    Arrow IPC files (".arrow"/".feather", written uncompressed by
+    write_dataset()) are memory-mapped rather than read: numeric columns are
+    zero-copy views of the file's pages, so repeated loads and parallel workers
+    share the OS page cache instead of each holding a private copy. CSV and
+    Parquet files with a ".schema.json" sidecar (see clinflow.data.schema) are
+    returned with the recorded compact dtypes, including "category" columns.
+
+    Args:
+        filepath (str or Path): Dataset file; the format is auto-detected.
+        columns (list[str], optional): Only read these columns. Columnar formats
+            skip the other columns on disk; CSV parsing skips them via usecols.
+            Defaults to None (all columns).
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
+    fmt = detect_format(filepath)
+    columns = list(columns) if columns is not None else None
+    if fmt == "arrow":
+        return _read_arrow_mmap(filepath, columns)
+
+    schema = load_schema(filepath)
+    if fmt == "parquet":
+        df = pd.read_parquet(filepath, columns=columns)
+    elif schema is None:
+        return pd.read_csv(filepath, usecols=columns)
+    else:
+        # parse integers directly into their small dtypes; categories afterwards,
+        # since read_csv would build them from the string values
+        dtypes = {col: dtype for col, dtype in schema.items() if dtype != "category"}
+        df = pd.read_csv(filepath, usecols=columns, dtype=dtypes)
+    return apply_schema(df, schema) if schema else df
+
+
+def read_dataset_chunks(filepath, chunksize, columns=None):
+    """Yield a dataset file in any supported format as DataFrame chunks.
+
+    Like read_dataset(), but at most ``chunksize`` rows are decoded at a time:
+    CSV through read_csv's chunked reader, Parquet batch by batch, and Arrow IPC
+    as slices of the memory-mapped file. Sidecar schemas are applied per chunk.
+
+    Args:
+        filepath (str or Path): Dataset file; the format is auto-detected.
+        chunksize (int): Rows per chunk.
+        columns (list[str], optional): Only read these columns. Defaults to None
+            (all columns).
+
+    Yields:
+        pd.DataFrame: The next chunk of rows.
+    """
+    fmt = detect_format(filepath)
+    columns = list(columns) if columns is not None else None
+    schema = load_schema(filepath) if fmt != "arrow" else None
+    if fmt == "arrow":
+        import pyarrow as pa
+
+        with open(filepath, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        table = pa.ipc.open_file(pa.BufferReader(pa.py_buffer(mapped))).read_all()
+        if columns is not None:
+            table = table.select(columns)
+        chunks = (
+            batch.to_pandas(split_blocks=True)
+            for batch in table.to_batches(max_chunksize=chunksize)
+        )
+    elif fmt == "parquet":
+        import pyarrow.parquet as pq
+
+        reader = pq.ParquetFile(filepath)
+        chunks = (
+            batch.to_pandas()
+            for batch in reader.iter_batches(batch_size=chunksize, columns=columns)
+        )
+    else:
+        dtypes = {
+            col: dtype for col, dtype in (schema or {}).items() if dtype != "category"
+        }
+        chunks = pd.read_csv(
+            filepath, usecols=columns, dtype=dtypes or None, chunksize=chunksize
+        )
+    for chunk in chunks:
+        yield apply_schema(chunk, schema) if schema else chunk
+
+
+def write_dataset(df, filepath):
+    """Write a DataFrame in the format implied by ``filepath``'s extension.
+
+    CSV keeps the existing layout (index written as the first column). Columnar
+    formats are written without the index; Arrow IPC files are left
+    uncompressed so they can be memory-mapped.
+
+    Returns:
+        Path: The filepath written.
+    """
+    path = Path(filepath)
+    fmt = detect_format(path)
+    if fmt == "parquet":
+        df.to_parquet(path, index=False)
+    elif fmt == "arrow":
+        import pyarrow as pa
+
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        with pa.ipc.new_file(path, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        df.to_csv(path)
+    return path
+
+
+def processed_data_paths(cfg):
+    """Every processed-data file the pipeline should write.
+
+    The primary file is cfg["paths"]["processed_data"]["file"]; each entry in the
+    optional cfg["paths"]["processed_data"]["formats"] list adds a copy with the
+    same stem in that format (e.g. ["csv", "parquet"] writes clean.csv and
+    clean.parquet).
+
+    Returns:
+        list[Path]: Primary path first, then any additional formats.
+    """
+    processed = cfg["paths"]["processed_data"]
+    primary = Path(processed["folder"]) / processed["file"]
+    paths = [primary]
+    for fmt in processed.get("formats", []):
+        path = primary.with_suffix(f".{fmt}")
+        if path not in paths:
+            paths.append(path)
+    return paths
+
+
+def training_columns(cfg):
+    """Columns needed to train the model: features plus the target."""
+    training = cfg["model_training"]
+    return (
+        list(training["numerical_features"])
+        + list(training["categorical_features"])
+        + [training["target_column_name"]]
+    )
+
+
+class ChunkWriter:
+    """Append DataFrame chunks to a CSV, Parquet or Arrow IPC file.
+
+    Used by the streaming pipeline: CSV chunks are appended with the header
+    written once; Parquet chunks become row groups and Arrow chunks record
+    batches of one file, cast to the schema of the first chunk so dtype drift
+    between chunks does not break the file.
+
+    Examples:
+        >>> with ChunkWriter("data/processed/clean.parquet") as writer:
+        ...     for chunk in chunks:
+        ...         writer.write(chunk)
+    """
+
+    def __init__(self, filepath, fmt=None):
+        self.path = Path(filepath)
+        self.format = fmt or detect_format(self.path)
+        self._chunks = 0
+        self._schema = None
+        self._writer = None
+
+    def _open_writer(self, schema):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.format == "parquet":
+            return pq.ParquetWriter(self.path, schema)
+        return pa.ipc.new_file(self.path, schema)
+
+    def write(self, df):
+        if self.format in ("parquet", "arrow"):
+            import pyarrow as pa
+
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                self._writer = self._open_writer(self._schema)
+            self._writer.write_table(table)
+        else:
+            first = self._chunks == 0
+            df.to_csv(self.path, mode="w" if first else "a", header=first)
+        self._chunks += 1
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main():
+    """Report the on-disk size and detected format of each processed-data file."""
+    from clinflow.config import get_config
+
+    logger = get_logger(__name__)
+    for path in processed_data_paths(get_config()):
+        if path.exists():
+            size_kib = path.stat().st_size / 1024
+            logger.info("%s: %s, %.1f KiB", path, detect_format(path), size_kib)
+        else:
+            logger.info("%s: not written yet", path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,236 @@
 from clinflow.data.load import load_dataset
+from clinflow.data.db import bulk_write, connect, database_path, quote_identifier
+from clinflow.data.indexing import build_indexes
+from clinflow.data.schema import decode_categories
 from clinflow.logging_utils import get_logger
-from clinflow.config import load_config
+from clinflow.config import get_config
+from clinflow.profiling import profiled
 from pathlib import Path
+import json
 import sqlite3
+import numpy as np
+import pandas as pd
 
+# records which key columns a table's rowids were derived from (upsert mode)
+LOAD_STATE_TABLE = "load_state"
 
-def write_to_SQL_db(df=None):
+
+def record_keys(df, key_columns=None):
+    """Stable 64-bit key for each row, hashed from ``key_columns``.
+
+    Numeric columns are hashed as float64, so the key does not change when a
+    column's dtype does (e.g. int8 after downcasting vs int64 or float64).
+
+    Args:
+        df (pd.DataFrame): Records to key.
+        key_columns (list[str], optional): Columns identifying a record, e.g. a
+            patient ID. Defaults to None (all columns: a record is its values).
+
+    Returns:
+        np.ndarray: int64 keys, one per row.
+    """
+    columns = list(key_columns) if key_columns else list(df.columns)
+    keyed = decode_categories(df[columns])
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(keyed[c])]
+    keyed = keyed.astype({c: "float64" for c in numeric})
+    return pd.util.hash_pandas_object(keyed, index=False).to_numpy().view(np.int64)
+
+
+def _stored_key_columns(con, table):
+    if not con.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+        (LOAD_STATE_TABLE,),
+    ).fetchone():
+        return None
+    row = con.execute(
+        f"SELECT key_columns FROM {LOAD_STATE_TABLE} WHERE table_name = ?", (table,)
+    ).fetchone()
+    return row[0] if row else None
+
+
+def forget_record_keys(con, table="patients"):
+    """Mark ``table`` as not keyed, e.g. after a replace load rewrote it."""
+    if _stored_key_columns(con, table) is not None:
+        with con:
+            con.execute(
+                f"DELETE FROM {LOAD_STATE_TABLE} WHERE table_name = ?", (table,)
+            )
+
+
+def _rekey_table(df, con, table, key_columns):
+    # give the rows already in ``table`` record keys as rowids, recreating it
+    # with the feed's column types; runs inside the caller's transaction
+    logger = get_logger(__name__)
+    current = pd.read_sql_query(f"SELECT * FROM {table}", con)
+    keys = record_keys(current, key_columns)
+    duplicated = pd.Series(keys).duplicated(keep="last").to_numpy()
+    if duplicated.any():
+        logger.warning(
+            "%d rows in %s share a record key with a later row and were dropped",
+            duplicated.sum(),
+            table,
+        )
+        current, keys = current[~duplicated], keys[~duplicated]
+
+    columns = ", ".join(quote_identifier(c) for c in current.columns)
+    rekey = f"{table}_rekey"
+    bulk_write(current.assign(_record_key=keys), rekey, con)
+    bulk_write(df.iloc[:0], table, con)
+    con.execute(
+        f"INSERT INTO {table} (rowid, {columns}) "
+        f"SELECT _record_key, {columns} FROM {rekey}"
+    )
+    con.execute(f"DROP TABLE {rekey}")
+    logger.info("Re-keyed %d existing rows of %s", len(current), table)
+
+
+def upsert_patients(df, con, key_columns=None, table="patients"):
+    """Incrementally merge ``df`` into ``table``, keyed on record_keys().
+
+    Each row's key is stored as its SQLite rowid. Rows with a new key are
+    inserted, rows whose key exists but whose values differ are updated, and
+    identical rows are not written at all; rows missing from ``df`` are kept,
+    so ``df`` can be a nightly delta. Staging, update and insert run in one
+    transaction.
+
+    The table is created from ``df`` if it does not exist. If its rows were
+    last written without keys (e.g. by a replace load) or keyed on other
+    columns, they are first re-keyed on ``key_columns`` and ``df`` is merged
+    into them, so no existing row is lost.
+
+    Args:
+        df (pd.DataFrame): Cleaned records.
+        con (sqlite3.Connection): Writable connection.
+        key_columns (list[str]): Columns identifying a record, e.g. a patient
+            ID.
+        table (str): Target table. Defaults to "patients".
+
+    Returns:
+        dict: Change statistics {"inserted", "updated", "unchanged",
+            "duplicates", "rebuilt"}; "duplicates" counts rows dropped because a
+            later row in ``df`` had the same key, and "rebuilt" is True if the
+            table was created or re-keyed (dropping its indexes).
+
+    Raises:
+        ValueError: If ``key_columns`` is empty, or the table has columns other
+            than ``df``'s.
+        RuntimeError: If SQLite is older than 3.33 (no UPDATE ... FROM).
+    """
+    logger = get_logger(__name__)
+    if not key_columns:
+        # keying on every column would turn each changed record into a new key,
+        # inserted next to the old version instead of replacing it
+        raise ValueError(
+            "Upsert needs key columns identifying a record "
+            "(database.key_columns), e.g. a patient ID"
+        )
+    if sqlite3.sqlite_version_info < (3, 33, 0):
+        raise RuntimeError(
+            f"Upsert needs SQLite 3.33 or newer (UPDATE ... FROM); "
+            f"this Python uses SQLite {sqlite3.sqlite_version}"
+        )
+
+    df = decode_categories(df)
+    keys = record_keys(df, key_columns)
+    duplicated = pd.Series(keys).duplicated(keep="last").to_numpy()
+    if duplicated.any():
+        logger.warning(
+            "%d rows share a record key with a later row and were skipped",
+            duplicated.sum(),
+        )
+        df, keys = df[~duplicated], keys[~duplicated]
+
+    columns = [quote_identifier(c) for c in df.columns]
+    key_state = json.dumps(list(key_columns))
+    existing = [row[1] for row in con.execute(f"PRAGMA table_info({table})")]
+    if existing and existing != list(df.columns):
+        raise ValueError(
+            f"Table {table} has columns {existing}, the feed has "
+            f"{list(df.columns)}; load it with mode='replace'"
+        )
+    rekey = bool(existing) and _stored_key_columns(con, table) != key_state
+    if rekey:
+        logger.info("Table %s is not keyed on %s; re-keying it", table, key_state)
+
+    delta = f"{table}_delta"
+    matches = f"{table}.rowid = d._record_key"
+    con.execute("BEGIN")
+    try:
+        # staging the feed is part of the transaction, so a failure leaves
+        # neither the table nor the scratch table changed
+        bulk_write(df.assign(_record_key=keys), delta, con)
+        if rekey:
+            _rekey_table(df, con, table, key_columns)
+        elif not existing:
+            bulk_write(df.iloc[:0], table, con)
+        updated = con.execute(
+            f"UPDATE {table} SET ({', '.join(columns)}) = "
+            f"({', '.join('d.' + c for c in columns)}) "
+            f"FROM {delta} AS d WHERE {matches} AND "
+            f"({', '.join(f'{table}.{c}' for c in columns)}) IS NOT "
+            f"({', '.join('d.' + c for c in columns)})"
+        ).rowcount
+        inserted = con.execute(
+            f"INSERT INTO {table} (rowid, {', '.join(columns)}) "
+            f"SELECT _record_key, {', '.join(columns)} FROM {delta} AS d "
+            f"WHERE NOT EXISTS (SELECT 1 FROM {table} WHERE {matches})"
+        ).rowcount
+        con.execute(f"DROP TABLE {delta}")
+        con.execute(
+            f"CREATE TABLE IF NOT EXISTS {LOAD_STATE_TABLE} "
+            "(table_name TEXT PRIMARY KEY, key_columns TEXT)"
+        )
+        con.execute(
+            f"INSERT OR REPLACE INTO {LOAD_STATE_TABLE} VALUES (?, ?)",
+            (table, key_state),
+        )
+        con.commit()
+    except BaseException:
+        con.rollback()
+        raise
+
+    stats = {
+        "inserted": inserted,
+        "updated": updated,
+        "unchanged": len(df) - inserted - updated,
+        "duplicates": int(duplicated.sum()),
+        "rebuilt": rekey or not existing,
+    }
+    logger.info(
+        "Upserted %d rows into %s: %d inserted, %d updated, %d unchanged",
+        len(df),
+        table,
+        stats["inserted"],
+        stats["updated"],
+        stats["unchanged"],
+    )
+    return stats
+
+
+@profiled(rows=lambda stats, df=None, *args, **kwargs: None if df is None else len(df))
+def write_to_SQL_db(df=None, cfg=None, mode=None):
+    """Load cleaned data into the "patients" table of the SQLite database.
+
+    Args:
+        df (pd.DataFrame, optional): Cleaned data. If None, loads the processed
+            data file. Defaults to None.
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        mode (str, optional): "replace" rewrites the whole table; "upsert" merges
+            ``df`` into it with upsert_patients(), keyed on
+            cfg["database"]["key_columns"]. If None, uses
+            cfg["database"]["load_mode"] (default "replace").
+
+    Returns:
+        dict or None: Change statistics in upsert mode, otherwise None.
+    """
     logger = get_logger(__name__)
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
+    db_cfg = cfg.get("database", {})
+    if mode is None:
+        mode = db_cfg.get("load_mode", "replace")
+    if mode not in ("replace", "upsert"):
+        raise ValueError(f"Unknown load mode '{mode}': use 'replace' or 'upsert'")
 
     # load data if not provided
     if df is None:
@@ -15,19 +238,30 @@ def write_to_SQL_db(df=None):
             Path(cfg["paths"]["processed_data"]["folder"])
             / cfg["paths"]["processed_data"]["file"]
         )
-        df = load_dataset(path_to_clean_data)
+        df = load_dataset(path_to_clean_data, cfg)
         logger.info(f"Loaded data from {path_to_clean_data}")
     else:
         logger.info("Using provided DataFrame")
-    path_to_db = (
-        Path(cfg["paths"]["database_path"]["folder"])
-        / cfg["paths"]["database_path"]["file"]
-    )
+    path_to_db = database_path(cfg)
 
-    try:
-        # insert clean.csv rows into clinflow.df
-        con = sqlite3.connect(path_to_db)
-        df.to_sql("patients", con, if_exists="replace", index=False)
+    # insert clean.csv rows into clinflow.df via the pooled writer connection
+    with connect(cfg, readonly=False) as con:
+        if mode == "upsert":
+            # counts come from the merge itself; no full-table COUNT(*) needed
+            stats = upsert_patients(df, con, db_cfg.get("key_columns"))
+            if db_cfg.get("auto_index", False) and stats["rebuilt"]:
+                build_indexes(cfg, con)
+            return stats
+
+        bulk_cfg = db_cfg.get("bulk_load", {})
+        bulk_write(
+            df,
+            "patients",
+            con,
+            batch_size=bulk_cfg.get("batch_size", 100_000),
+            synchronous=bulk_cfg.get("synchronous"),
+        )
+        forget_record_keys(con)
 
         # verification to confirm
         # * database file created successfully
@@ -48,13 +282,34 @@ def write_to_SQL_db(df=None):
 
         logger.info(f"db row count ({db_row_count}) matches df row count ({len(df)})")
 
-    finally:
-        if "con" in locals():
-            con.close()
+        # replacing the table drops its indexes; rebuild them after the load
+        if db_cfg.get("auto_index", False):
+            build_indexes(cfg, con)
 
 
 def main():
-    write_to_SQL_db()
+    """Load cleaned data into the database.
+
+    Examples:
+        $ python -m clinflow.data.to_sqlite
+        $ python -m clinflow.data.to_sqlite --mode upsert --data nightly.csv
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load cleaned data into SQLite")
+    parser.add_argument(
+        "--mode",
+        choices=["replace", "upsert"],
+        default=None,
+        help="Rewrite the table or merge changed rows (default: database.load_mode)",
+    )
+    parser.add_argument(
+        "--data", default=None, help="Cleaned data file (default: processed data)"
+    )
+    args = parser.parse_args()
+
+    df = load_dataset(args.data) if args.data else None
+    write_to_SQL_db(df, mode=args.mode)
 
 
 if __name__ == "__main__":
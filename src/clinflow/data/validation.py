@@ -0,0 +1,244 @@
+from clinflow.logging_utils import get_logger
+import numpy as np
+import pandas as pd
+
+# report order of rules; violations are sorted by rule, then by first appearance
+RULES = (
+    "missing",
+    "numerical_dtype",
+    "categorical_dtype",
+    "target_missing",
+    "target_binary",
+    "range",
+    "minimum_rows",
+)
+
+
+def _is_numeric(series):
+    # numeric dtypes, plus categoricals whose categories are numeric codes
+    dtype = series.dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        return pd.api.types.is_numeric_dtype(dtype.categories.dtype)
+    return pd.api.types.is_numeric_dtype(dtype)
+
+
+def _as_array(series):
+    # plain NumPy view where possible; extension/categorical columns as float
+    if isinstance(series.dtype, np.dtype):
+        return series.to_numpy()
+    return series.to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+class ValidationEngine:
+    """Validate cleaned data against the configuration in one vectorized pass.
+
+    The rules in the configuration (``numerical_column_names``,
+    ``categorical_column_names``, ``reasonable_ranges``, ``minimum_rows`` and the
+    binary "target" column) are compiled once into a per-column plan. ``scan()``
+    then visits each column's underlying NumPy array once, counting every
+    violation rather than stopping at the first, and keeps up to
+    ``max_examples`` offending row labels per (column, rule).
+
+    Reports from several chunks can be combined with ``merge()``; the
+    dataset-level ``minimum_rows`` rule is applied by ``finalize()``.
+
+    Args:
+        cfg (Mapping): Configuration with the validation rules.
+        max_examples (int): Example row labels kept per violation. Defaults to 5.
+
+    Examples:
+        >>> engine = ValidationEngine(cfg)
+        >>> report = engine.run(clean_df)
+        >>> report["violations"]
+        [{'column': 'age', 'rule': 'range', 'count': 2, 'examples': [17, 203],
+          'detail': {'min': 0, 'max': 120}}]
+        >>> raise_for_report(report)
+        Traceback (most recent call last):
+        ValueError: Column age has values outside reasonable range[0, 120] (2 rows)
+    """
+
+    def __init__(self, cfg, max_examples=5):
+        self.max_examples = max_examples
+        self.minimum_rows = cfg["minimum_rows"]
+        self.dtype_rules = {}
+        for col in cfg["categorical_column_names"]:
+            self.dtype_rules[col] = "categorical_dtype"
+        for col in cfg["numerical_column_names"]:
+            self.dtype_rules[col] = "numerical_dtype"
+        self.ranges = {
+            col: (bounds["min"], bounds["max"])
+            for col, bounds in cfg["reasonable_ranges"].items()
+        }
+
+    def _violation(self, column, rule, mask_or_count, index, detail=None):
+        if isinstance(mask_or_count, np.ndarray):
+            positions = np.flatnonzero(mask_or_count)
+            count = len(positions)
+            examples = index[positions[: self.max_examples]].tolist()
+        else:
+            count, examples = mask_or_count, []
+        violation = {
+            "column": column,
+            "rule": rule,
+            "count": int(count),
+            "examples": examples,
+        }
+        if detail is not None:
+            violation["detail"] = detail
+        return violation
+
+    def scan(self, df):
+        """Check every row-level rule on ``df``; returns a partial report."""
+        index = df.index
+        violations = []
+
+        for col in df.columns:
+            series = df[col]
+            numeric = _is_numeric(series)
+            values = _as_array(series) if numeric else series.to_numpy()
+
+            # missing values (integer and bool arrays cannot hold NaN)
+            if values.dtype.kind == "f":
+                missing = np.isnan(values)
+                if missing.any():
+                    violations.append(self._violation(col, "missing", missing, index))
+            elif values.dtype.kind not in "iub":
+                missing = pd.isna(values)
+                if missing.any():
+                    violations.append(self._violation(col, "missing", missing, index))
+
+            if not numeric:
+                if col in self.dtype_rules:
+                    coerced = pd.to_numeric(series, errors="coerce").isna().to_numpy()
+                    non_numeric = coerced & ~pd.isna(values)
+                    violations.append(
+                        self._violation(
+                            col,
+                            self.dtype_rules[col],
+                            non_numeric,
+                            index,
+                            {"dtype": str(series.dtype)},
+                        )
+                    )
+                if col == "target":
+                    non_binary = ~series.isin([0, 1]).to_numpy()
+                    violations.append(
+                        self._violation(col, "target_binary", non_binary, index)
+                    )
+                continue
+
+            if col == "target":
+                non_binary = (values != 0) & (values != 1)
+                if non_binary.any():
+                    violations.append(
+                        self._violation(col, "target_binary", non_binary, index)
+                    )
+
+            if col in self.ranges:
+                lo, hi = self.ranges[col]
+                # two counts avoid materializing a combined mask on the happy path
+                n_bad = np.count_nonzero(values < lo) + np.count_nonzero(values > hi)
+                if n_bad:
+                    violations.append(
+                        self._violation(
+                            col,
+                            "range",
+                            (values < lo) | (values > hi),
+                            index,
+                            {"min": lo, "max": hi},
+                        )
+                    )
+
+        if "target" not in df.columns:
+            violations.append(self._violation("target", "target_missing", 0, index))
+
+        return {"rows": len(df), "violations": violations}
+
+    def merge(self, total, report):
+        """Combine the reports of two chunks; ``total`` may be None."""
+        if total is None:
+            return report
+        merged = {(v["column"], v["rule"]): dict(v) for v in total["violations"]}
+        for v in report["violations"]:
+            key = (v["column"], v["rule"])
+            if key not in merged:
+                merged[key] = dict(v)
+                continue
+            existing = merged[key]
+            existing["count"] += v["count"]
+            room = self.max_examples - len(existing["examples"])
+            existing["examples"] = existing["examples"] + v["examples"][:room]
+
+        return {
+            "rows": total["rows"] + report["rows"],
+            "violations": list(merged.values()),
+        }
+
+    def finalize(self, report):
+        """Apply dataset-level rules and order violations by rule."""
+        violations = list(report["violations"])
+        if report["rows"] < self.minimum_rows:
+            violations.append(
+                self._violation(
+                    None, "minimum_rows", 0, None, {"minimum": self.minimum_rows}
+                )
+            )
+        violations.sort(key=lambda v: RULES.index(v["rule"]))
+        return {"rows": report["rows"], "violations": violations}
+
+    def run(self, df):
+        """Validate a complete dataset; returns the finalized report."""
+        return self.finalize(self.scan(df))
+
+
+def format_violation(violation, rows):
+    """Human-readable message for one violation in a report."""
+    col, rule, count = violation["column"], violation["rule"], violation["count"]
+    if rule == "missing":
+        return f"Too many missing values: {count} missing in column {col}"
+    if rule in ("numerical_dtype", "categorical_dtype") and count == 0:
+        # every value parses as a number, but the column is not stored as one
+        kind = "Numerical" if rule == "numerical_dtype" else "Categorical"
+        dtype = violation.get("detail", {}).get("dtype", "non-numeric")
+        return f"{kind} column {col} has dtype {dtype}; should be numerical"
+    if rule == "numerical_dtype":
+        return f"Numerical column {col} contains {count} non-numeric entries"
+    if rule == "categorical_dtype":
+        return (
+            f"Categorical column {col} contains {count} non-numeric entries; "
+            "should be numerical"
+        )
+    if rule == "target_missing":
+        return "The column 'target' does not exist"
+    if rule == "target_binary":
+        return f"The column 'target' is not binary ({count} rows)"
+    if rule == "range":
+        detail = violation["detail"]
+        return (
+            f"Column {col} has values outside reasonable range"
+            f"[{detail['min']}, {detail['max']}] ({count} rows)"
+        )
+    if rule == "minimum_rows":
+        return (
+            f"Less than {violation['detail']['minimum']} rows left in dataset"
+            f"[{rows} rows]"
+        )
+    return f"Column {col} failed rule '{rule}' ({count} rows)"
+
+
+def raise_for_report(report):
+    """Raise a ValueError listing every violation in ``report``, if any.
+
+    Args:
+        report (dict): Finalized report from ValidationEngine.run()/finalize().
+
+    Raises:
+        ValueError: With one message per violation, separated by "; ".
+    """
+    logger = get_logger(__name__)
+    messages = [format_violation(v, report["rows"]) for v in report["violations"]]
+    if messages:
+        for message in messages:
+            logger.error("Validation failed: %s", message)
+        raise ValueError("; ".join(messages))
+    logger.info("All validation checks passed (%d rows)", report["rows"])
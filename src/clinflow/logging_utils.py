@@ -1,29 +1,196 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 from pathlib import Path
-from clinflow.config import load_config
+from clinflow.config import get_config
 
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 
-def get_logger(name):
+# process-wide queue backend, created on first use in "queue" mode
+_LOG_QUEUE = None
+_LISTENER = None
+_LISTENER_LOCK = threading.Lock()
+_ATEXIT_REGISTERED = False
+
+
+class BatchedFileHandler(logging.FileHandler):
+    """File handler that buffers formatted records and writes them in batches.
+
+    Records are flushed to disk when the buffer reaches ``batch_size``, when a
+    record at ERROR or above arrives, or when the handler is closed. A timer
+    started by the first buffered record flushes the rest ``flush_interval``
+    seconds later, so records are written even if logging then goes quiet.
+    Intended to run on the QueueListener thread, so the batching never blocks
+    callers.
+    """
+
+    def __init__(self, filename, batch_size=100, flush_interval=1.0, **kwargs):
+        super().__init__(filename, **kwargs)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._timer = None
+
+    def emit(self, record):
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if (
+            len(self._buffer) >= self.batch_size
+            or record.levelno >= logging.ERROR
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.flush_interval, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self._buffer:
+                if self.stream is None:
+                    self.stream = self._open()
+                self.stream.write("".join(self._buffer))
+                self._buffer.clear()
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that defers message formatting to the listener thread.
+
+    The stdlib ``QueueHandler.prepare`` formats every record in the calling
+    thread so it can be pickled. Records here only cross threads, so they are
+    enqueued untouched and ``msg % args`` is evaluated by the listener.
+    """
+
+    def prepare(self, record):
+        return record
+
+
+def _log_level(name, cfg):
+    # most specific configured prefix wins, e.g. "clinflow.data" for "clinflow.data.clean"
+    log_cfg = cfg.get("logging", {})
+    levels = log_cfg.get("levels", {})
+    parts = name.split(".")
+    for i in range(len(parts), 0, -1):
+        prefix = ".".join(parts[:i])
+        if prefix in levels:
+            return levels[prefix]
+    return log_cfg.get("level", "DEBUG")
+
+
+def _log_filepath(cfg):
+    logs_dir = Path(cfg["paths"]["logging"]["folder"])
+    logs_dir.mkdir(exist_ok=True, parents=True)
+    return logs_dir / cfg["paths"]["logging"]["file"]
+
+
+def _get_queue_handler(cfg):
+    # start the shared listener thread on first use
+    global _LOG_QUEUE, _LISTENER, _ATEXIT_REGISTERED
+    with _LISTENER_LOCK:
+        if _LISTENER is None:
+            log_cfg = cfg.get("logging", {})
+            formatter = logging.Formatter(LOG_FORMAT)
+
+            ch = logging.StreamHandler()
+            ch.setFormatter(formatter)
+
+            fh = BatchedFileHandler(
+                _log_filepath(cfg),
+                batch_size=log_cfg.get("batch_size", 100),
+                flush_interval=log_cfg.get("flush_interval", 1.0),
+                delay=True,
+            )
+            fh.setFormatter(formatter)
+
+            # one queue for the process; stop_logging() detaches its handlers
+            if _LOG_QUEUE is None:
+                _LOG_QUEUE = queue.SimpleQueue()
+            _LISTENER = logging.handlers.QueueListener(_LOG_QUEUE, ch, fh)
+            _LISTENER.start()
+            if not _ATEXIT_REGISTERED:
+                atexit.register(stop_logging)
+                _ATEXIT_REGISTERED = True
+    return LazyQueueHandler(_LOG_QUEUE)
+
+
+def stop_logging():
+    """Drain the logging queue, flush batched file writes and stop the listener.
+
+    Queue handlers are detached from their loggers, so nothing is enqueued
+    without a listener to drain it; the next get_logger() call for such a
+    logger attaches a new one and restarts the listener.
+
+    Safe to call more than once and a no-op in "sync" mode. Registered with
+    ``atexit`` so queued records are not lost when the process exits.
+    """
+    global _LISTENER
+    with _LISTENER_LOCK:
+        if _LISTENER is not None:
+            loggers = [logging.getLogger()] + [
+                logger
+                for logger in logging.Logger.manager.loggerDict.values()
+                if isinstance(logger, logging.Logger)
+            ]
+            for logger in loggers:
+                for handler in list(logger.handlers):
+                    if isinstance(handler, LazyQueueHandler):
+                        logger.removeHandler(handler)
+            _LISTENER.stop()
+            for handler in _LISTENER.handlers:
+                handler.close()
+            _LISTENER = None
+
+
+def get_logger(name, cfg=None):
     """Create or retrieve a configured logger with console and file output.
 
-    Sets up a logger with dual output: console (stdout) and file. The logger is
-    configured with DEBUG level and a standardized format. This function is
-    idempotent - calling it multiple times with the same name returns the same
-    logger instance without adding duplicate handlers.
+    Sets up a logger with dual output: console (stdout) and file. The logger's
+    level and output mode come from the "logging" section of the configuration.
+    This function is idempotent - calling it multiple times with the same name
+    returns the same logger instance without adding duplicate handlers.
+
+    Two output modes are supported via cfg["logging"]["mode"]:
+        - "sync" (default): StreamHandler and FileHandler attached directly to
+          the logger; each call writes to disk in the calling thread.
+        - "queue": the logger gets a QueueHandler feeding a single background
+          QueueListener thread shared by all loggers. The listener formats
+          records and writes the log file in batches, so logging calls only
+          pay for an enqueue.
 
     Args:
         name (str): Name for the logger, typically __name__ of the calling module.
             This appears in log messages to identify the source.
+        cfg (Mapping, optional): Configuration to read logging settings from. If
+            None, uses the cached configuration from get_config(). Defaults to None.
 
     Returns:
-        logging.Logger: Configured logger instance with two handlers:
-            - StreamHandler: Outputs to console (stdout) at DEBUG level
-            - FileHandler: Writes to log file at DEBUG level
+        logging.Logger: Configured logger instance.
 
     Side Effects:
         - Creates logs directory if it doesn't exist (from config)
         - Creates/appends to log file specified in configuration
         - Registers logger in Python's global logging registry
+        - In "queue" mode, starts the background listener thread on first use
 
     Examples:
         >>> # Typical usage in a module
@@ -31,50 +198,48 @@ def get_logger(name):
         >>> logger.info("Processing started")
         2025-12-16 10:30:45 - my_module - INFO - Processing started
         >>>
-        >>> # Using in different modules
-        >>> logger = get_logger("data.pipeline")
-        >>> logger.debug("Debug information")
-        >>> logger.error("An error occurred")
+        >>> # Prefer %-style arguments on hot paths; formatting is skipped for
+        >>> # filtered records and deferred to the listener in "queue" mode
+        >>> logger.debug("Rows processed: %d", n_rows)
 
     Note:
         - Log format: "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        - Both handlers use DEBUG level, so all messages are logged
-        - Log file path is read from configuration: cfg["paths"]["logging"]["file"]
+        - Level is cfg["logging"]["level"], overridden per module (longest
+          dotted prefix) by cfg["logging"]["levels"]
+        - Log file path is read from the cached configuration (get_config()):
+          cfg["paths"]["logging"]["file"]
         - The function checks for existing handlers to prevent duplicates
         - All loggers created by this function share the same configuration
     """
-    cfg = load_config()
+    # create logger
+    logger = logging.getLogger(name)
+    if logger.handlers:
+        return logger
 
-    # create logs directory if it doesn't exist
-    logs_dir = Path(cfg["paths"]["logging"]["folder"])
-    logs_file = Path(cfg["paths"]["logging"]["file"])
-    logs_filepath = logs_dir / logs_file
+    if cfg is None:
+        cfg = get_config()
 
-    logs_dir.mkdir(exist_ok=True, parents=True)
+    logger.setLevel(_log_level(name, cfg))
 
-    # create logger
-    logger = logging.getLogger(name)
-    logger.setLevel(logging.DEBUG)
-    if not logger.handlers:
-        # create console handler
-        ch = logging.StreamHandler()
-        ch.setLevel(logging.DEBUG)
-
-        # create file handler
-        fh = logging.FileHandler(logs_filepath)
-        fh.setLevel(logging.DEBUG)
-
-        # create formatter
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-        )
-
-        # add formatter both handlers
-        ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
-
-        # add both handlers to logger
-        logger.addHandler(ch)
-        logger.addHandler(fh)
+    if cfg.get("logging", {}).get("mode", "sync") == "queue":
+        logger.addHandler(_get_queue_handler(cfg))
+        return logger
+
+    # create console handler
+    ch = logging.StreamHandler()
+
+    # create file handler
+    fh = logging.FileHandler(_log_filepath(cfg))
+
+    # create formatter
+    formatter = logging.Formatter(LOG_FORMAT)
+
+    # add formatter both handlers
+    ch.setFormatter(formatter)
+    fh.setFormatter(formatter)
+
+    # add both handlers to logger
+    logger.addHandler(ch)
+    logger.addHandler(fh)
 
     return logger
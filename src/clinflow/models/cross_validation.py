@@ -0,0 +1,196 @@
+from sklearn.base import clone
+from sklearn.model_selection import RepeatedStratifiedKFold, StratifiedKFold
+from sklearn.metrics import (
+    accuracy_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from scipy import stats
+from concurrent.futures import ProcessPoolExecutor
+from clinflow.logging_utils import get_logger
+from clinflow.models.train import build_pipeline
+import os
+import time
+import numpy as np
+
+# used when cfg["model_training"] has no "cross_validation" section
+DEFAULT_SETTINGS = {
+    "n_splits": 5,
+    "n_repeats": 1,
+    "n_jobs": -1,
+    "confidence": 0.95,
+}
+
+# per-fold metrics: name -> (function, uses predicted probabilities)
+METRICS = {
+    "accuracy": (accuracy_score, False),
+    "precision": (lambda y, p: precision_score(y, p, zero_division=0), False),
+    "recall": (lambda y, p: recall_score(y, p, zero_division=0), False),
+    "f1": (lambda y, p: f1_score(y, p, zero_division=0), False),
+    "roc_auc": (roc_auc_score, True),
+}
+
+# data shared with the worker processes, set once per worker by _init_worker
+_worker_data = {}
+
+
+def _settings(cfg):
+    settings = dict(cfg["model_training"].get("cross_validation", {}))
+    return {**DEFAULT_SETTINGS, **settings}
+
+
+def _init_worker(X, y, pipeline):
+    # sent once per worker rather than once per fold
+    _worker_data.update(X=X, y=y, pipeline=pipeline)
+
+
+def _run_fold(fold, train_index, test_index):
+    X, y = _worker_data["X"], _worker_data["y"]
+    start = time.perf_counter()
+    pipeline = clone(_worker_data["pipeline"])
+    pipeline.fit(X.iloc[train_index], y.iloc[train_index])
+
+    y_true = y.iloc[test_index]
+    y_pred = pipeline.predict(X.iloc[test_index])
+    y_score = pipeline.predict_proba(X.iloc[test_index])[:, 1]
+    result = {"fold": fold, "n_test": len(test_index)}
+    for name, (metric, uses_scores) in METRICS.items():
+        result[name] = float(metric(y_true, y_score if uses_scores else y_pred))
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def summarize(values, confidence=0.95):
+    """Mean, standard deviation and t-interval of per-fold metric values.
+
+    Folds share training rows, so their scores are not independent and the
+    interval is optimistic; it is a guide to run-to-run spread, not a formal
+    bound.
+
+    Returns:
+        dict: {"mean", "std", "ci_low", "ci_high"}.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    mean = float(values.mean())
+    std = float(values.std(ddof=1)) if len(values) > 1 else 0.0
+    half_width = (
+        stats.t.ppf((1 + confidence) / 2, len(values) - 1) * std / np.sqrt(len(values))
+        if len(values) > 1
+        else 0.0
+    )
+    return {
+        "mean": mean,
+        "std": std,
+        "ci_low": mean - half_width,
+        "ci_high": mean + half_width,
+    }
+
+
+def cross_validate_model(
+    df, cfg, n_splits=None, n_repeats=None, n_jobs=None, pipeline=None
+):
+    """Evaluate the training pipeline with (repeated) stratified k-fold.
+
+    Every fold fits a fresh copy of ``pipeline`` on the other folds and scores
+    accuracy, precision, recall, F1 and ROC AUC on its own rows. Folds run in a
+    process pool; each worker receives the data once. With ``n_repeats`` > 1,
+    RepeatedStratifiedKFold reshuffles the folds each repeat.
+
+    Args:
+        df (pd.DataFrame): Dataset with features and target.
+        cfg (Mapping): Configuration; defaults for the arguments below come from
+            cfg["model_training"]["cross_validation"].
+        n_splits (int, optional): Folds per repeat.
+        n_repeats (int, optional): Repeats of the k-fold split.
+        n_jobs (int, optional): Worker processes; -1 for all cores, 1 to run
+            folds serially in this process.
+        pipeline (Pipeline, optional): Pipeline to evaluate, e.g. a tuned one
+            from tuning.tune_model(); it is cloned, not refitted in place.
+            Defaults to None (build_pipeline(cfg)).
+
+    Returns:
+        dict: {"n_splits", "n_repeats", "confidence",
+            "metrics": {name: summarize() output},
+            "folds": [per-fold metrics and "seconds"],
+            "wall_seconds": elapsed time,
+            "estimated_serial_seconds": sum of per-fold times,
+            "estimated_speedup": estimated_serial_seconds / wall_seconds}.
+            Fold times are measured inside the pool, where folds compete for
+            cores and run slower than alone, so the speedup is an upper
+            estimate; compare with an ``n_jobs=1`` run (or
+            benchmarks/bench_cross_validation.py) for a measured one.
+    """
+    logger = get_logger(__name__)
+    settings = _settings(cfg)
+    n_splits = settings["n_splits"] if n_splits is None else n_splits
+    n_repeats = settings["n_repeats"] if n_repeats is None else n_repeats
+    n_jobs = settings["n_jobs"] if n_jobs is None else n_jobs
+    random_state = cfg["model_training"]["random_state"]
+
+    y = df[cfg["model_training"]["target_column_name"]]
+    X = df.drop(list(cfg["model_training"]["exclude_columns"]), axis=1, errors="ignore")
+    if n_repeats > 1:
+        splitter = RepeatedStratifiedKFold(
+            n_splits=n_splits, n_repeats=n_repeats, random_state=random_state
+        )
+    else:
+        splitter = StratifiedKFold(n_splits, shuffle=True, random_state=random_state)
+    folds = [
+        (fold, train_index, test_index)
+        for fold, (train_index, test_index) in enumerate(splitter.split(X, y))
+    ]
+    if pipeline is None:
+        pipeline = build_pipeline(cfg)
+    pipeline = clone(pipeline)
+    # a rare category can be missing from a fold's training rows
+    pipeline.set_params(preprocessor__cat__scaler__handle_unknown="ignore")
+    workers = min(len(folds), os.cpu_count() if n_jobs in (None, -1) else n_jobs)
+
+    start = time.perf_counter()
+    if workers <= 1:
+        _init_worker(X, y, pipeline)
+        results = [_run_fold(*fold) for fold in folds]
+        _worker_data.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(X, y, pipeline)
+        ) as executor:
+            results = list(executor.map(_run_fold, *zip(*folds)))
+    wall_seconds = time.perf_counter() - start
+    # inflated by contention when folds run concurrently: an estimate
+    serial_seconds = sum(result["seconds"] for result in results)
+
+    report = {
+        "n_splits": n_splits,
+        "n_repeats": n_repeats,
+        "confidence": settings["confidence"],
+        "metrics": {
+            name: summarize([r[name] for r in results], settings["confidence"])
+            for name in METRICS
+        },
+        "folds": results,
+        "wall_seconds": wall_seconds,
+        "estimated_serial_seconds": serial_seconds,
+        "estimated_speedup": (
+            serial_seconds / wall_seconds if wall_seconds else float("nan")
+        ),
+    }
+    accuracy = report["metrics"]["accuracy"]
+    logger.info(
+        "%d folds x %d repeats on %d workers: accuracy %.4f +/- %.4f "
+        "(%.0f%% CI %.4f-%.4f); %.2f s wall vs ~%.2f s serial (est. %.1fx)",
+        n_splits,
+        n_repeats,
+        workers,
+        accuracy["mean"],
+        accuracy["std"],
+        settings["confidence"] * 100,
+        accuracy["ci_low"],
+        accuracy["ci_high"],
+        wall_seconds,
+        serial_seconds,
+        report["estimated_speedup"],
+    )
+    return report
@@ -0,0 +1,218 @@
+from sklearn.pipeline import Pipeline
+from sklearn.compose import ColumnTransformer
+from sklearn.preprocessing import StandardScaler
+from sklearn.preprocessing import OneHotEncoder
+from sklearn.linear_model import SGDClassifier
+from sklearn.metrics import accuracy_score
+from clinflow.config import get_config
+from clinflow.logging_utils import get_logger
+from clinflow.data.query import iter_patients
+from clinflow.data.schema import decode_categories
+from clinflow.data.storage import read_dataset_chunks, training_columns
+import numpy as np
+import pandas as pd
+
+# used when cfg["model_training"] has no "incremental" section
+DEFAULT_SETTINGS = {
+    "chunksize": 100_000,
+    "epochs": 5,
+    "sgd_params": {"alpha": 0.0001},
+}
+
+# fitted StandardScaler state copied from the streaming pass
+_SCALER_STATE = ("mean_", "var_", "scale_", "n_samples_seen_", "n_features_in_")
+
+
+def chunk_source(cfg=None, filepath=None, preset=None, chunksize=None):
+    """Return a callable that starts a new pass over the training data.
+
+    The incremental trainer reads its data several times (statistics, then one
+    pass per epoch), so it takes a factory rather than a single iterator. Only
+    the training columns are read.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        filepath (str or Path, optional): CSV, Parquet or Arrow file, read with
+            storage.read_dataset_chunks(). Defaults to None.
+        preset (str or dict, optional): Query preset streamed from SQLite with
+            query.iter_patients(), used when ``filepath`` is None. Defaults to
+            None ("all").
+        chunksize (int, optional): Rows per chunk. If None, uses
+            cfg["model_training"]["incremental"]["chunksize"].
+
+    Returns:
+        callable: ``source()`` returning a fresh iterator of DataFrame chunks.
+
+    Examples:
+        >>> source = chunk_source(filepath="data/processed/clean.parquet")
+        >>> model = train_model_incremental(source, cfg)
+    """
+    if cfg is None:
+        cfg = get_config()
+    if chunksize is None:
+        chunksize = _settings(cfg)["chunksize"]
+    columns = training_columns(cfg)
+
+    if filepath is not None:
+        return lambda: read_dataset_chunks(filepath, chunksize, columns)
+    return lambda: iter_patients(
+        "all" if preset is None else preset, cfg, chunksize, columns=columns
+    )
+
+
+def _settings(cfg):
+    settings = dict(cfg["model_training"].get("incremental", {}))
+    return {**DEFAULT_SETTINGS, **settings}
+
+
+def _test_mask(n_rows, chunk_number, test_size, random_state):
+    # the same rows are held out on every pass, given the same chunking
+    rng = np.random.default_rng([random_state, chunk_number])
+    return rng.random(n_rows) < test_size
+
+
+def train_model_incremental(source, cfg, epochs=None):
+    """Train the risk model out of core, one chunk at a time.
+
+    An alternative to train_model() for datasets too large to fit in memory.
+    A first pass over ``source`` computes the StandardScaler statistics
+    incrementally and collects a fixed category vocabulary per categorical
+    feature; then an SGDClassifier with logistic loss is trained with
+    partial_fit, one pass per epoch, shuffling the rows within each chunk. A
+    ``test_size`` fraction of the rows (chosen per chunk with ``random_state``)
+    is held out of training and scored after the last epoch.
+
+    The result has the same structure as train_model()'s: a "preprocessor"
+    ColumnTransformer and a "classifier" step, so save_model(), load_model(),
+    evaluate_model() and the API's kernel scorer all work unchanged.
+
+    Args:
+        source (callable): Returns a new iterator of DataFrame chunks on each
+            call, e.g. from chunk_source().
+        cfg (Mapping): Configuration; features, target, test_size and
+            random_state come from cfg["model_training"], the chunk size, epochs
+            and SGDClassifier parameters from cfg["model_training"]["incremental"].
+        epochs (int, optional): Passes of partial_fit. If None, uses the
+            configured value.
+
+    Returns:
+        dict: {"pipeline", "y_test", "y_pred", "accuracy"}, as train_model()
+            plus the held-out accuracy.
+
+    Raises:
+        ValueError: If ``source`` yields no training rows.
+    """
+    logger = get_logger(__name__)
+    settings = _settings(cfg)
+    if epochs is None:
+        epochs = settings["epochs"]
+    target_column_name = cfg["model_training"]["target_column_name"]
+    test_size = cfg["model_training"]["test_size"]
+    random_state = cfg["model_training"]["random_state"]
+    numerical_columns = list(cfg["model_training"]["numerical_features"])
+    categorical_columns = list(cfg["model_training"]["categorical_features"])
+    features = numerical_columns + categorical_columns
+
+    def passes():
+        # (chunk number, training rows, held-out rows) for one pass over source
+        for chunk_number, chunk in enumerate(source()):
+            chunk = decode_categories(chunk).reset_index(drop=True)
+            mask = _test_mask(len(chunk), chunk_number, test_size, random_state)
+            yield chunk_number, chunk[~mask], chunk[mask]
+
+    # 1. scaler statistics, category vocabulary and classes in one pass
+    scaler = StandardScaler()
+    vocabulary = {col: set() for col in categorical_columns}
+    classes = set()
+    first_chunk = None
+    n_train = 0
+    for _, train, _ in passes():
+        if train.empty:
+            continue
+        if first_chunk is None:
+            first_chunk = train
+        scaler.partial_fit(train[numerical_columns].to_numpy(dtype=np.float64))
+        for col in categorical_columns:
+            vocabulary[col].update(train[col].dropna().unique().tolist())
+        classes.update(train[target_column_name].unique().tolist())
+        n_train += len(train)
+    if first_chunk is None:
+        raise ValueError("No training rows: the chunk source is empty")
+    logger.info("Statistics pass: %d training rows", n_train)
+
+    categories = [sorted(vocabulary[col]) for col in categorical_columns]
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", Pipeline(steps=[("scaler", StandardScaler())]), numerical_columns),
+            (
+                "cat",
+                Pipeline(
+                    steps=[
+                        (
+                            "scaler",
+                            OneHotEncoder(
+                                categories=categories, handle_unknown="ignore"
+                            ),
+                        )
+                    ]
+                ),
+                categorical_columns,
+            ),
+        ]
+    )
+    # fitting on one chunk sets up the ColumnTransformer; the scaler then takes
+    # the statistics of every training row from the first pass
+    preprocessor.fit(first_chunk[features])
+    fitted_scaler = preprocessor.named_transformers_["num"].named_steps["scaler"]
+    for attribute in _SCALER_STATE:
+        setattr(fitted_scaler, attribute, getattr(scaler, attribute))
+
+    # 2. partial_fit, one pass per epoch
+    classifier = SGDClassifier(
+        loss="log_loss",
+        random_state=random_state,
+        **dict(settings.get("sgd_params") or {}),
+    )
+    classes = np.array(sorted(classes))
+    for epoch in range(epochs):
+        for chunk_number, train, _ in passes():
+            if train.empty:
+                continue
+            order = np.random.default_rng(
+                [random_state, epoch, chunk_number]
+            ).permutation(len(train))
+            train = train.iloc[order]
+            classifier.partial_fit(
+                preprocessor.transform(train[features]),
+                train[target_column_name].to_numpy(),
+                classes=classes,
+            )
+        logger.info("Epoch %d/%d complete", epoch + 1, epochs)
+
+    pipeline = Pipeline(
+        [
+            ("preprocessor", preprocessor),
+            ("classifier", classifier),
+        ]
+    )
+
+    # 3. score the held-out rows
+    y_test, y_pred = [], []
+    for _, _, test in passes():
+        if test.empty:
+            continue
+        y_test.append(test[target_column_name].to_numpy())
+        y_pred.append(pipeline.predict(test[features]))
+    y_test = pd.Series(
+        np.concatenate(y_test) if y_test else [], name=target_column_name
+    )
+    y_pred = np.concatenate(y_pred) if y_pred else np.array([])
+    accuracy = accuracy_score(y_test, y_pred) if len(y_test) else float("nan")
+    logger.info("Held-out accuracy: %.4f on %d rows", accuracy, len(y_test))
+
+    return {
+        "pipeline": pipeline,
+        "y_test": y_test,
+        "y_pred": y_pred,
+        "accuracy": accuracy,
+    }
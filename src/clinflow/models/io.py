@@ -1,10 +1,10 @@
 import joblib
 from pathlib import Path
-from clinflow.config import load_config
+from clinflow.config import get_config
 from clinflow.logging_utils import get_logger
 
 
-def save_model(model, filepath=None):
+def save_model(model, filepath=None, cfg=None):
     """Save a trained machine learning model pipeline to disk using joblib.
 
     Serializes the model pipeline to a file for later use in production or evaluation.
@@ -19,6 +19,9 @@ def save_model(model, filepath=None):
             If None, uses the default path from configuration:
             cfg['model_training']['path_to_model']['directory']/['file'].
             Defaults to None.
+        cfg (Mapping, optional): Configuration used to resolve the default path.
+            If None, uses the cached configuration from get_config().
+            Defaults to None.
 
     Returns:
         Path: The filepath where the model was saved.
@@ -51,7 +54,8 @@ def save_model(model, filepath=None):
         (like metrics or metadata) are not persisted. Consider saving those
         separately if needed for model tracking.
     """
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
     logger = get_logger(__name__)
 
     # create parent directory if not exists
@@ -79,7 +83,7 @@ def save_model(model, filepath=None):
     return filepath
 
 
-def load_model(filepath=None):
+def load_model(filepath=None, cfg=None):
     """Load a trained machine learning model pipeline from disk using joblib.
 
     Deserializes a previously saved model pipeline for inference, evaluation, or
@@ -90,6 +94,9 @@ def load_model(filepath=None):
             If None, uses the default path from configuration:
             cfg['model_training']['path_to_model']['directory']/['file'].
             Defaults to None.
+        cfg (Mapping, optional): Configuration used to resolve the default path.
+            If None, uses the cached configuration from get_config().
+            Defaults to None.
 
     Returns:
         Pipeline: The loaded scikit-learn Pipeline object or compatible model.
@@ -123,7 +130,8 @@ def load_model(filepath=None):
         - For production use, validate the model after loading (check expected
           attributes, feature names, etc.) before making predictions.
     """
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
     logger = get_logger(__name__)
 
     if filepath is None:
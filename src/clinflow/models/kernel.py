@@ -0,0 +1,236 @@
+from sklearn.compose import ColumnTransformer
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+from clinflow.logging_utils import get_logger
+from pathlib import Path
+import numpy as np
+
+
+def _only_step(transformer, expected_type):
+    # unwrap a single-step Pipeline such as Pipeline([("scaler", StandardScaler())])
+    steps = getattr(transformer, "steps", [(None, transformer)])
+    if len(steps) != 1 or not isinstance(steps[0][1], expected_type):
+        raise ValueError(
+            f"Expected a single {expected_type.__name__} step, got {transformer!r}"
+        )
+    return steps[0][1]
+
+
+def export_kernel(pipeline):
+    """Compile a fitted training pipeline into a compact coefficient bundle.
+
+    The pipeline built by train_model() (StandardScaler on numerical features,
+    OneHotEncoder on categorical features, LogisticRegression) or
+    train_model_incremental() (SGDClassifier with logistic loss) is a single
+    affine function followed by a sigmoid. Scaling is folded into the numerical
+    weights and each one-hot block becomes a per-category weight lookup, so
+    scoring needs no DataFrame, ColumnTransformer or sparse matrices.
+
+    Args:
+        pipeline (Pipeline): Fitted pipeline from train_model() or load_model().
+
+    Returns:
+        dict: Coefficient bundle of plain NumPy arrays:
+            - "numerical_features", "categorical_features": column names
+            - "mean", "scale": StandardScaler statistics
+            - "categories": sorted category values per categorical feature
+            - "numerical_weights": classifier weights divided by scale
+            - "category_weights": classifier weight per (feature, category)
+            - "intercept": classifier intercept with the scaler mean folded in
+            - "classes": class labels (binary)
+            - "handle_unknown": OneHotEncoder handle_unknown setting
+
+    Raises:
+        ValueError: If the pipeline does not have the structure above, or the
+            classifier is not binary.
+    """
+    preprocessor = pipeline.named_steps["preprocessor"]
+    classifier = pipeline.named_steps["classifier"]
+    if not isinstance(preprocessor, ColumnTransformer):
+        raise ValueError("Pipeline step 'preprocessor' must be a ColumnTransformer")
+    # SGDClassifier with logistic loss (models/incremental.py) has the same form
+    logistic = isinstance(classifier, LogisticRegression) or (
+        isinstance(classifier, SGDClassifier) and classifier.loss == "log_loss"
+    )
+    if not logistic or len(classifier.classes_) != 2:
+        raise ValueError(
+            "Pipeline step 'classifier' must be a binary LogisticRegression or "
+            "SGDClassifier(loss='log_loss')"
+        )
+
+    transformers = {
+        name: (transformer, list(columns))
+        for name, transformer, columns in preprocessor.transformers_
+        if name != "remainder"
+    }
+    scaler = _only_step(transformers["num"][0], StandardScaler)
+    encoder = _only_step(transformers["cat"][0], OneHotEncoder)
+    if encoder.drop is not None:
+        raise ValueError("OneHotEncoder with drop= is not supported")
+
+    numerical_features = transformers["num"][1]
+    categorical_features = transformers["cat"][1]
+    n_num = len(numerical_features)
+
+    mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_num)
+    scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_num)
+
+    # ColumnTransformer output order follows transformers_: "num" then "cat"
+    coef = classifier.coef_.ravel()
+    numerical_weights = coef[:n_num] / scale
+    category_weights = []
+    offset = n_num
+    for categories in encoder.categories_:
+        category_weights.append(coef[offset : offset + len(categories)].copy())
+        offset += len(categories)
+
+    return {
+        "numerical_features": np.array(numerical_features),
+        "categorical_features": np.array(categorical_features),
+        "mean": np.asarray(mean, dtype=np.float64),
+        "scale": np.asarray(scale, dtype=np.float64),
+        "categories": [np.asarray(c, dtype=np.float64) for c in encoder.categories_],
+        "numerical_weights": numerical_weights,
+        "category_weights": category_weights,
+        "intercept": float(classifier.intercept_[0] - numerical_weights @ mean),
+        "classes": classifier.classes_.copy(),
+        "handle_unknown": encoder.handle_unknown,
+    }
+
+
+class KernelScorer:
+    """Vectorized NumPy scorer for a bundle produced by export_kernel().
+
+    Mirrors the parts of the sklearn estimator API used for inference
+    (``predict_proba``, ``predict``, ``classes_``) so it can stand in for the
+    pipeline, e.g. in clinflow.api.score().
+
+    Inputs may be:
+        - a 2D float array whose columns are ``features`` (numerical features
+          followed by categorical features, as in the config)
+        - a structured/record array with a field per feature
+        - a pandas DataFrame (columns selected by name)
+
+    Raises:
+        ValueError: From predict_proba, if a categorical value was not seen
+            during training and the encoder used handle_unknown="error".
+    """
+
+    def __init__(self, bundle):
+        self.bundle = bundle
+        self.numerical_features = [str(f) for f in bundle["numerical_features"]]
+        self.categorical_features = [str(f) for f in bundle["categorical_features"]]
+        self.features = self.numerical_features + self.categorical_features
+        self.classes_ = bundle["classes"]
+        self._n_num = len(self.numerical_features)
+
+    @classmethod
+    def from_pipeline(cls, pipeline):
+        return cls(export_kernel(pipeline))
+
+    def _columns(self, X):
+        # return (numerical 2D float array, list of categorical 1D arrays)
+        if hasattr(X, "columns") or getattr(getattr(X, "dtype", None), "names", None):
+            numerical = np.column_stack(
+                [np.asarray(X[f], dtype=np.float64) for f in self.numerical_features]
+            )
+            categorical = [
+                np.asarray(X[f], dtype=np.float64) for f in self.categorical_features
+            ]
+            return numerical, categorical
+
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        if X.shape[1] != len(self.features):
+            raise ValueError(
+                f"Expected {len(self.features)} columns ({self.features}), "
+                f"got {X.shape[1]}"
+            )
+        return X[:, : self._n_num], [X[:, i] for i in range(self._n_num, X.shape[1])]
+
+    def decision_function(self, X):
+        numerical, categorical = self._columns(X)
+        z = numerical @ self.bundle["numerical_weights"] + self.bundle["intercept"]
+
+        for name, values, categories, weights in zip(
+            self.categorical_features,
+            categorical,
+            self.bundle["categories"],
+            self.bundle["category_weights"],
+        ):
+            idx = np.searchsorted(categories, values)
+            np.minimum(idx, len(categories) - 1, out=idx)
+            known = categories[idx] == values
+            if known.all():
+                z += weights[idx]
+            elif self.bundle["handle_unknown"] == "error":
+                unknown = np.unique(values[~known])
+                raise ValueError(
+                    f"Found unknown categories {unknown.tolist()} in column '{name}'"
+                )
+            else:
+                z += np.where(known, weights[idx], 0.0)
+        return z
+
+    def predict_proba(self, X):
+        z = self.decision_function(X)
+        # numerically stable sigmoid: 1 / (1 + exp(-z))
+        positive = np.exp(-np.logaddexp(0.0, -z))
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X):
+        return self.classes_[(self.decision_function(X) > 0).astype(int)]
+
+
+def save_kernel(bundle, filepath):
+    """Save a coefficient bundle to a compressed ``.npz`` file.
+
+    Args:
+        bundle (dict): Bundle returned by export_kernel().
+        filepath (str or Path): Destination path.
+
+    Returns:
+        Path: The filepath where the bundle was saved.
+    """
+    logger = get_logger(__name__)
+
+    filepath = Path(filepath)
+    filepath.parent.mkdir(exist_ok=True, parents=True)
+    arrays = {
+        k: v for k, v in bundle.items() if k not in ("categories", "category_weights")
+    }
+    for i, (categories, weights) in enumerate(
+        zip(bundle["categories"], bundle["category_weights"])
+    ):
+        arrays[f"categories_{i}"] = categories
+        arrays[f"category_weights_{i}"] = weights
+    np.savez_compressed(filepath, **arrays)
+
+    logger.info("Scoring kernel saved to '%s'", filepath)
+    return filepath
+
+
+def load_kernel(filepath):
+    """Load a coefficient bundle saved by save_kernel().
+
+    Args:
+        filepath (str or Path): Path to the ``.npz`` file.
+
+    Returns:
+        dict: Coefficient bundle accepted by KernelScorer.
+    """
+    with np.load(filepath, allow_pickle=False) as data:
+        n_cat = len(data["categorical_features"])
+        bundle = {
+            k: data[k]
+            for k in data.files
+            if not k.startswith(("categories_", "category_weights_"))
+        }
+        bundle["categories"] = [data[f"categories_{i}"] for i in range(n_cat)]
+        bundle["category_weights"] = [
+            data[f"category_weights_{i}"] for i in range(n_cat)
+        ]
+    bundle["intercept"] = float(bundle["intercept"])
+    bundle["handle_unknown"] = str(bundle["handle_unknown"])
+    return bundle
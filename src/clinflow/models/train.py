@@ -10,14 +10,57 @@ from sklearn.metrics import (
     classification_report,
     confusion_matrix,
 )
-from clinflow.config import load_config
+from clinflow.config import get_config
 from clinflow.logging_utils import get_logger
 from clinflow.data.load import load_dataset
+from clinflow.data.storage import training_columns
+from clinflow.profiling import profiled, span
 from pathlib import Path
 import json
 import numpy as np
 
 
+def build_pipeline(cfg, classifier=None, memory=None):
+    """Unfitted preprocessing + classifier pipeline used by train_model().
+
+    Args:
+        cfg (Mapping): Configuration giving the numerical and categorical
+            feature columns under cfg["model_training"].
+        classifier (estimator, optional): Final step. Defaults to None
+            (LogisticRegression with cfg["model_training"]["model_params"]).
+        memory (str or joblib.Memory, optional): Cache for the fitted
+            "preprocessor" step (see sklearn.pipeline.Pipeline). Defaults to None.
+
+    Returns:
+        Pipeline: Steps "preprocessor" (ColumnTransformer) and "classifier".
+    """
+    numerical_columns = list(cfg["model_training"]["numerical_features"])
+    categorical_columns = list(cfg["model_training"]["categorical_features"])
+    if classifier is None:
+        classifier = LogisticRegression(**dict(cfg["model_training"]["model_params"]))
+
+    numerical_transformer = Pipeline(steps=[("scaler", StandardScaler())])
+
+    categorical_transformer = Pipeline(steps=[("scaler", OneHotEncoder())])
+
+    # configure specific transformers for numerical and categorical columns
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", numerical_transformer, numerical_columns),
+            ("cat", categorical_transformer, categorical_columns),
+        ]
+    )
+
+    return Pipeline(
+        [
+            ("preprocessor", preprocessor),
+            ("classifier", classifier),
+        ],
+        memory=memory,
+    )
+
+
+@profiled(rows=lambda model, df, *args, **kwargs: len(df))
 def train_model(df, cfg):
     """
     Train a logistic regression classification pipeline with preprocessing.
@@ -28,8 +71,8 @@ def train_model(df, cfg):
 
     Args:
         df (pd.DataFrame): Input dataset containing features and target.
-        cfg (dict): Configuration dict specifying target column, feature columns,
-            train/test split parameters, and model hyperparameters.
+        cfg (Mapping): Configuration (dict or Config) specifying target column,
+            feature columns, train/test split parameters, and model hyperparameters.
 
     Returns:
         dict: Dictionary containing the fitted pipeline, test targets, and predictions
@@ -37,20 +80,20 @@ def train_model(df, cfg):
     """
 
     # setup configuration parameters
+    # (lists are copied so frozen Config tuples behave like YAML lists)
     target_column_name = cfg["model_training"]["target_column_name"]
-    drop_column_name = cfg["model_training"]["exclude_columns"]
+    drop_column_name = list(cfg["model_training"]["exclude_columns"])
     test_size = cfg["model_training"]["test_size"]
     random_state = cfg["model_training"]["random_state"]
-    numerical_columns = cfg["model_training"]["numerical_features"]
-    categorical_columns = cfg["model_training"]["categorical_features"]
-    model_params = cfg["model_training"]["model_params"]
+    model_params = dict(cfg["model_training"]["model_params"])
 
     # configure logging
     logger = get_logger(__name__)
 
     # create X (features) and y (target)
     y = df[target_column_name]
-    X = df.drop(drop_column_name, axis=1)
+    # excluded columns may already be absent if only training columns were loaded
+    X = df.drop(drop_column_name, axis=1, errors="ignore")
 
     # create train/test split
     X_train, X_test, y_train, y_test = train_test_split(
@@ -58,27 +101,11 @@ def train_model(df, cfg):
     )
     logger.info("Test split created")
 
-    numerical_transformer = Pipeline(steps=[("scaler", StandardScaler())])
-
-    categorical_transformer = Pipeline(steps=[("scaler", OneHotEncoder())])
-
-    # configure specific transformers for numerical and categorical columns
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", numerical_transformer, numerical_columns),
-            ("cat", categorical_transformer, categorical_columns),
-        ]
-    )
-
-    pipeline = Pipeline(
-        [
-            ("preprocessor", preprocessor),
-            ("classifier", LogisticRegression(**model_params)),
-        ]
-    )
+    pipeline = build_pipeline(cfg, LogisticRegression(**model_params))
     logger.info("Pipeline created")
 
-    pipeline.fit(X_train, y_train)
+    with span("fit", rows=len(X_train)):
+        pipeline.fit(X_train, y_train)
 
     y_pred = pipeline.predict(X_test)
 
@@ -94,14 +121,19 @@ def train_model(df, cfg):
     return model
 
 
-def evaluate_model(y_test, y_pred):
+@profiled(rows=lambda path, y_test, *args, **kwargs: len(y_test))
+def evaluate_model(y_test, y_pred, cfg=None, cross_validation=None):
     # compute_metrics
     metrics = classification_report(y_test, y_pred, output_dict=True)
     cm = confusion_matrix(y_test, y_pred)
     metrics["confusion_matrix"] = cm.tolist()
+    # k-fold summary from cross_validation.cross_validate_model(), if run
+    if cross_validation is not None:
+        metrics["cross_validation"] = cross_validation
 
     # create results dir if not already exists
-    cfg = load_config()
+    if cfg is None:
+        cfg = get_config()
     Path(cfg["model_training"]["path_to_results"]["directory"]).mkdir(exist_ok=True)
 
     # write to json file
@@ -119,14 +151,14 @@ def main():
     logger = get_logger(__name__)
 
     # get cfg
-    cfg = load_config()
+    cfg = get_config()
 
     # load clean dataset
     clean_data_path = (
         Path(cfg["paths"]["processed_data"]["folder"])
         / cfg["paths"]["processed_data"]["file"]
     )
-    df = load_dataset(clean_data_path)
+    df = load_dataset(clean_data_path, cfg, columns=training_columns(cfg))
 
     # train model
     model = train_model(df, cfg)
@@ -137,7 +169,7 @@ def main():
     y_pred = model["y_pred"]
 
     try:
-        path = evaluate_model(y_test, y_pred)
+        path = evaluate_model(y_test, y_pred, cfg)
     except Exception as e:
         logger.error(f"Model evaluation error: {e}")
         raise
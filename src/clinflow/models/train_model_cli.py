@@ -1,10 +1,17 @@
 from clinflow.data.load import load_dataset
+from clinflow.data.storage import training_columns
 from clinflow.data.query import query_patients
 from clinflow.models.train import train_model
+from clinflow.models.incremental import chunk_source, train_model_incremental
+from clinflow.models.tuning import save_leaderboard, tune_model
+from clinflow.models.cross_validation import cross_validate_model
 from clinflow.models.train import evaluate_model
 from clinflow.models.io import save_model
+from clinflow.artifacts import config_values, frame_digest, get_artifact_cache
+from clinflow.pipeline import TRAIN_CONFIG
 from clinflow.logging_utils import get_logger
-from clinflow.config import load_config
+from clinflow.profiling import configure_profiling, save_profile, span
+from clinflow.config import get_config
 from pathlib import Path
 
 
@@ -12,7 +19,7 @@ def main():
     import argparse
 
     logger = get_logger(__name__)
-    cfg = load_config()
+    cfg = get_config()
 
     # initialise argument parser
     parser = argparse.ArgumentParser(description="Train the clinflow risk model")
@@ -20,7 +27,11 @@ def main():
     # add mutually exclusive arguments for input filepath
     source_group = parser.add_mutually_exclusive_group(required=True)
     source_group.add_argument(
-        "--csv", metavar="PATH", help="Path to processed CSV file"
+        "--csv",
+        "--data",
+        dest="csv",
+        metavar="PATH",
+        help="Path to processed data file (CSV or Parquet)",
     )
     source_group.add_argument(
         "--from-db", action="store_true", help="Load data from SQLite database"
@@ -35,38 +46,151 @@ def main():
         default="all",
         help="Only use this flag with '--from-db'",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Train out of core with SGD partial_fit, streaming the data in chunks",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=None, help="Rows per chunk with --incremental"
+    )
+    parser.add_argument(
+        "--tune",
+        action="store_true",
+        help="Search hyperparameters in parallel (model_training.tuning) and "
+        "train the best candidate",
+    )
+    parser.add_argument(
+        "--search",
+        choices=["grid", "random", "halving"],
+        default=None,
+        help="Search strategy with --tune (default: model_training.tuning.search)",
+    )
+    parser.add_argument(
+        "--n-jobs", type=int, default=None, help="Parallel workers with --tune/--cv"
+    )
+    parser.add_argument(
+        "--cv",
+        action="store_true",
+        help="Also evaluate with stratified k-fold cross-validation "
+        "(model_training.cross_validation); results go to the metrics file",
+    )
+    parser.add_argument("--folds", type=int, default=None, help="Folds with --cv")
+    parser.add_argument(
+        "--repeats", type=int, default=None, help="Repeated k-fold with --cv"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record a run profile of each stage (profiling.file in results/)",
+    )
+    parser.add_argument(
+        "--profile-span",
+        action="append",
+        metavar="NAME",
+        help="Also run the named span (e.g. fit) under cProfile; implies --profile",
+    )
     # parse arguments
     args = parser.parse_args()
+    if args.incremental and (args.tune or args.cv):
+        parser.error("--tune and --cv need the data in memory; drop --incremental")
     logger.info("Command line arguments parsed")
+    configure_profiling(cfg, enabled=args.profile, profile_spans=args.profile_span)
 
     # run full pipeline (load -> train -> eval -> save)
+    # 1-2. stream the data through the incremental trainer, or
+    if args.incremental:
+        source = chunk_source(
+            cfg,
+            filepath=None if args.from_db else args.csv,
+            preset=args.query,
+            chunksize=args.chunksize,
+        )
+        model = train_model_incremental(source, cfg)
+        logger.info("Model trained incrementally")
     # 1. load data from csv or database
-    if args.from_db:
-        df = query_patients(args.query)
+    elif args.from_db:
+        # only the feature and target columns are transferred from SQLite
+        df = query_patients(args.query, cfg, columns=training_columns(cfg))
         logger.info("Dataset loaded from db")
     elif args.csv:
         path_to_clean_data = Path(args.csv)
         try:
-            df = load_dataset(path_to_clean_data)
+            # only the feature and target columns are read from disk
+            with span("load") as step:
+                df = load_dataset(
+                    path_to_clean_data, cfg, columns=training_columns(cfg)
+                )
+                step.set_rows(len(df))
         except Exception as e:
             logger.error(f"Error: input path {args.csv} not valid ({e})")
             raise
-        logger.info("Dataset loaded from csv")
+        logger.info(f"Dataset loaded from {path_to_clean_data}")
+
+    # 2. train model (or the best candidate of a search), unless the artifact
+    # cache holds one fitted on the same data with the same settings
+    cache = None if args.incremental else get_artifact_cache(cfg)
+    key = cached = None
+    if cache is not None:
+        settings = config_values(cfg, TRAIN_CONFIG)
+        if args.tune:
+            settings["model_training.tuning"] = cfg["model_training"].get("tuning")
+            settings["search"] = args.search
+        key = cache.key("model", frame_digest(df), settings)
+        cached = model = cache.get(key)
 
-    # 2. train model
-    model = train_model(df, cfg)
-    logger.info("Model trained successfully")
+    if cached is not None:
+        logger.info("Model loaded from the artifact cache")
+    elif args.tune:
+        with span("tune", rows=len(df)):
+            model = tune_model(df, cfg, search=args.search, n_jobs=args.n_jobs)
+        logger.info("Hyperparameter search complete")
+    elif not args.incremental:
+        model = train_model(df, cfg)
+        logger.info("Model trained successfully")
+    if cache is not None and cached is None:
+        cache.put(key, model, "model")
+    if args.tune:
+        board_path = save_leaderboard(model["leaderboard"], cfg)
+        logger.info(f"Tuning leaderboard saved to '{board_path}'")
 
     # 3. evaluate model
     y_test = model["y_test"]
     y_pred = model["y_pred"]
 
-    evals_path = evaluate_model(y_test, y_pred)
+    cv_report = None
+    if args.cv:
+        # with --tune, cross-validate the best candidate's settings
+        with span("cross_validate", rows=len(df)):
+            cv_report = cross_validate_model(
+                df,
+                cfg,
+                n_splits=args.folds,
+                n_repeats=args.repeats,
+                n_jobs=args.n_jobs,
+                pipeline=model["pipeline"] if args.tune else None,
+            )
+    evals_path = evaluate_model(y_test, y_pred, cfg, cross_validation=cv_report)
     logger.info(f"Model evals calculated and saved to '{evals_path}'")
 
-    # 4. save model
-    path = save_model(model, args.output_path)
-    logger.info(f"Model saved to '{path}'")
+    # 4. save model (not rewritten if the file already holds this model)
+    if args.output_path:
+        path = Path(args.output_path)
+    else:
+        path = (
+            Path(cfg["model_training"]["path_to_model"]["directory"])
+            / cfg["model_training"]["path_to_model"]["file"]
+        )
+    if cache is not None and cache.outputs_current(key, [path]):
+        logger.info(f"Model at '{path}' is up to date")
+    else:
+        save_model(model, path, cfg)
+        logger.info(f"Model saved to '{path}'")
+        if cache is not None:
+            cache.record_outputs(key, [path])
+    profile_path = save_profile(cfg)
+    if profile_path is not None:
+        logger.info(f"Run profile saved to '{profile_path}'")
     logger.info("Pipeline completed successfully")
     return
 
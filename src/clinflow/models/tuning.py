@@ -0,0 +1,242 @@
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import (
+    GridSearchCV,
+    HalvingGridSearchCV,
+    RandomizedSearchCV,
+    StratifiedKFold,
+    train_test_split,
+)
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.ensemble import RandomForestClassifier
+from clinflow.config import get_config
+from clinflow.logging_utils import get_logger
+from clinflow.models.train import build_pipeline
+from pathlib import Path
+import tempfile
+import time
+import pandas as pd
+
+# estimator name in cfg["model_training"]["tuning"]["estimators"] -> class
+ESTIMATORS = {
+    "logistic_regression": LogisticRegression,
+    "sgd": SGDClassifier,
+    "random_forest": RandomForestClassifier,
+}
+
+SEARCHES = {
+    "grid": GridSearchCV,
+    "random": RandomizedSearchCV,
+    "halving": HalvingGridSearchCV,
+}
+
+# used when cfg["model_training"] has no "tuning" section
+DEFAULT_SETTINGS = {
+    "search": "grid",
+    "cv": 5,
+    "scoring": "accuracy",
+    "n_iter": 20,
+    "n_jobs": -1,
+    "cache_preprocessing": True,
+    "leaderboard_file": "leaderboard.csv",
+    "estimators": {"logistic_regression": {"C": [0.01, 0.1, 1.0, 10.0]}},
+}
+
+
+def _settings(cfg):
+    settings = dict(cfg["model_training"].get("tuning", {}))
+    return {**DEFAULT_SETTINGS, **settings}
+
+
+def param_grid(cfg):
+    """Search space from cfg["model_training"]["tuning"]["estimators"].
+
+    Each entry maps an estimator name (see ESTIMATORS) to lists of candidate
+    values for its parameters, and becomes one sub-grid with the estimator as
+    the pipeline's "classifier" step. The logistic regression starts from
+    cfg["model_training"]["model_params"], so settings that are not searched
+    (e.g. max_iter) keep their configured values.
+
+    Returns:
+        list[dict]: Parameter grid for the sklearn search classes, e.g.
+            [{"classifier": [LogisticRegression(max_iter=1000)],
+              "classifier__C": [0.01, 0.1, 1.0, 10.0]}].
+
+    Raises:
+        ValueError: For an unknown estimator name.
+    """
+    random_state = cfg["model_training"]["random_state"]
+    grid = []
+    for name, params in _settings(cfg)["estimators"].items():
+        if name not in ESTIMATORS:
+            raise ValueError(
+                f"Unknown estimator '{name}': choose from {', '.join(ESTIMATORS)}"
+            )
+        if name == "logistic_regression":
+            model_params = dict(cfg["model_training"]["model_params"])
+            estimator = LogisticRegression(**model_params)
+        elif name == "sgd":
+            # logistic loss keeps probabilities (and the NumPy API kernel) available
+            estimator = SGDClassifier(loss="log_loss", random_state=random_state)
+        else:
+            estimator = ESTIMATORS[name](random_state=random_state)
+        sub_grid = {"classifier": [estimator]}
+        sub_grid.update(
+            {f"classifier__{param}": list(values) for param, values in params.items()}
+        )
+        grid.append(sub_grid)
+    return grid
+
+
+def n_candidates(search):
+    """Distinct candidates a fitted search evaluated.
+
+    Successive halving scores a candidate once per round it survives, so its
+    ``cv_results_`` has more rows than candidates; its first round has them all.
+    """
+    if hasattr(search, "n_candidates_"):
+        return int(search.n_candidates_[0])
+    return len(search.cv_results_["params"])
+
+
+def leaderboard(search):
+    """One row per candidate from a fitted search, best first.
+
+    Returns:
+        pd.DataFrame: Columns "rank", "estimator", "params", "mean_score",
+            "std_score", "mean_fit_time" and "mean_score_time" (seconds per
+            fold), plus "iteration" and "n_resources" for successive halving.
+    """
+    results = pd.DataFrame(search.cv_results_)
+    board = pd.DataFrame(
+        {
+            "rank": results["rank_test_score"],
+            "estimator": [type(p["classifier"]).__name__ for p in results["params"]],
+            "params": [
+                {k.split("__", 1)[1]: v for k, v in p.items() if k != "classifier"}
+                for p in results["params"]
+            ],
+            "mean_score": results["mean_test_score"],
+            "std_score": results["std_test_score"],
+            "mean_fit_time": results["mean_fit_time"],
+            "mean_score_time": results["mean_score_time"],
+        }
+    )
+    for column in ("iter", "n_resources"):
+        if column in results:
+            board["iteration" if column == "iter" else column] = results[column]
+    if "iteration" not in board:
+        return board.sort_values("rank", kind="stable").reset_index(drop=True)
+
+    # successive halving: candidates that reached later rounds (scored on more
+    # rows) rank above those eliminated earlier, then by score within a round
+    board = board.sort_values(
+        ["iteration", "mean_score"], ascending=[False, False], kind="stable"
+    ).reset_index(drop=True)
+    board["rank"] = board.index + 1
+    return board
+
+
+def save_leaderboard(board, cfg=None):
+    """Write ``board`` as CSV next to the metrics file (results/leaderboard.csv).
+
+    Returns:
+        Path: The file written.
+    """
+    if cfg is None:
+        cfg = get_config()
+    directory = Path(cfg["model_training"]["path_to_results"]["directory"])
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / _settings(cfg)["leaderboard_file"]
+    board.to_csv(path, index=False)
+    return path
+
+
+def tune_model(df, cfg, search=None, n_jobs=None):
+    """Hyperparameter search over the training pipeline, in parallel.
+
+    Splits ``df`` like train_model(), searches param_grid(cfg) on the training
+    split with stratified k-fold cross-validation, refits the best candidate on
+    the whole training split and predicts the test split. Candidates and folds
+    run in parallel through joblib (``n_jobs``, -1 for all cores).
+
+    With cfg["model_training"]["tuning"]["cache_preprocessing"], the pipeline
+    gets a joblib ``memory`` cache, so the fitted ColumnTransformer is computed
+    once per fold and reused by every candidate that only changes the
+    classifier, instead of once per (candidate, fold). The cache lives in a
+    temporary folder removed afterwards, and the returned pipeline has no
+    memory attached.
+
+    Args:
+        df (pd.DataFrame): Dataset with features and target.
+        cfg (Mapping): Configuration; search settings come from
+            cfg["model_training"]["tuning"].
+        search (str, optional): "grid", "random" (``n_iter`` samples) or
+            "halving" (successive halving over training rows). If None, uses
+            the configured value.
+        n_jobs (int, optional): Parallel workers. If None, uses the configured
+            value.
+
+    Returns:
+        dict: {"pipeline", "y_test", "y_pred"} as train_model(), plus
+            "leaderboard" (see leaderboard()), "best_params" and
+            "n_candidates" (see n_candidates()).
+    """
+    logger = get_logger(__name__)
+    settings = _settings(cfg)
+    search = settings["search"] if search is None else search
+    n_jobs = settings["n_jobs"] if n_jobs is None else n_jobs
+    if search not in SEARCHES:
+        raise ValueError(
+            f"Unknown search '{search}': choose from {', '.join(SEARCHES)}"
+        )
+
+    target_column_name = cfg["model_training"]["target_column_name"]
+    random_state = cfg["model_training"]["random_state"]
+    y = df[target_column_name]
+    X = df.drop(list(cfg["model_training"]["exclude_columns"]), axis=1, errors="ignore")
+    X_train, X_test, y_train, y_test = train_test_split(
+        X,
+        y,
+        test_size=cfg["model_training"]["test_size"],
+        random_state=random_state,
+    )
+
+    cv = StratifiedKFold(settings["cv"], shuffle=True, random_state=random_state)
+    options = {"scoring": settings["scoring"], "cv": cv, "n_jobs": n_jobs}
+    if search == "random":
+        options.update(n_iter=settings["n_iter"], random_state=random_state)
+    elif search == "halving":
+        options.update(random_state=random_state)
+
+    with tempfile.TemporaryDirectory(prefix="clinflow-tuning-") as cache_dir:
+        memory = cache_dir if settings["cache_preprocessing"] else None
+        pipeline = build_pipeline(cfg, memory=memory)
+        # a rare category can be missing from a fold's training rows
+        pipeline.set_params(preprocessor__cat__scaler__handle_unknown="ignore")
+        searcher = SEARCHES[search](pipeline, param_grid(cfg), **options)
+
+        start = time.perf_counter()
+        searcher.fit(X_train, y_train)
+        elapsed = time.perf_counter() - start
+        best = searcher.best_estimator_
+        best.set_params(memory=None)
+
+    board = leaderboard(searcher)
+    logger.info(
+        "%s search: %d candidates in %.1f s; best %s %.4f with %s",
+        search,
+        n_candidates(searcher),
+        elapsed,
+        settings["scoring"],
+        searcher.best_score_,
+        board.loc[0, "params"],
+    )
+
+    return {
+        "pipeline": best,
+        "y_test": y_test,
+        "y_pred": best.predict(X_test),
+        "leaderboard": board,
+        "best_params": searcher.best_params_,
+        "n_candidates": n_candidates(searcher),
+    }
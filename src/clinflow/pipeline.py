@@ -1,23 +1,63 @@
 from clinflow.logging_utils import get_logger
+from clinflow.profiling import configure_profiling, profiled, save_profile, span
 from pathlib import Path
 
+# config keys that change each stage's result (also part of artifact keys)
+CLEAN_CONFIG = (
+    "missing_value_strategy",
+    "numerical_column_names",
+    "target_column_name",
+    "schema",
+)
+VALIDATE_CONFIG = (
+    "numerical_column_names",
+    "categorical_column_names",
+    "reasonable_ranges",
+    "minimum_rows",
+)
+# how the cleaned data is loaded into SQLite (mode, keys, indexes, pragmas)
+DATABASE_CONFIG = ("paths.database_path", "database")
+TRAIN_CONFIG = tuple(
+    f"model_training.{key}"
+    for key in (
+        "target_column_name",
+        "exclude_columns",
+        "numerical_features",
+        "categorical_features",
+        "test_size",
+        "random_state",
+        "model_params",
+    )
+)
+
 
-def run_data_pipeline():
+@profiled()
+def run_data_pipeline(cfg=None):
     """Execute the complete data processing pipeline from raw data to storage.
 
     This function orchestrates the entire data pipeline workflow, performing the
     following steps in sequence:
-    1. Load raw dataset from configured source
-    2. Load configuration settings
+    1. Load configuration settings (once; passed to every step)
+    2. Load raw dataset from configured source
     3. Clean and transform data according to config rules
     4. Validate cleaned data meets quality standards
-    5. Write processed data to CSV file
+    5. Write processed data to CSV file (plus any extra configured formats) and
+       its dtypes to a ".schema.json" sidecar
     6. Store processed data in SQLite database
 
+    With the artifact cache enabled (cfg["artifacts"], see
+    clinflow.artifacts.ArtifactCache), steps 2-4 are skipped when the raw file
+    and the cleaning/validation settings match a cached cleaned dataset, and
+    steps 5-6 are skipped for outputs that still hold that dataset.
+
     The pipeline uses configuration settings from the config file to determine
     data paths, cleaning rules, and validation criteria. All operations are
     logged for monitoring and debugging purposes.
 
+    Args:
+        cfg (Mapping, optional): Configuration to run with. If None, uses the
+            cached configuration from get_config(). Defaults to None.
+
     Raises:
         FileNotFoundError: If raw data file or config file cannot be found.
         ValueError: If data validation fails after cleaning.
@@ -34,43 +74,467 @@ def run_data_pipeline():
     """
     from clinflow.data.load import load_dataset
     from clinflow.data.clean import clean_data, validate_data
-    from clinflow.config import load_config
+    from clinflow.config import get_config
+    from clinflow.data.db import connect, database_path
     from clinflow.data.to_sqlite import write_to_SQL_db
+    from clinflow.data.storage import processed_data_paths, write_dataset
+    from clinflow.data.schema import frame_schema, save_schema, schema_path
+    from clinflow.artifacts import config_values, get_artifact_cache
+    from clinflow.dag import file_digest
 
     logger = get_logger(__name__)
 
-    # load raw data
-    raw = load_dataset()
-    logger.info("Raw data loaded successfully")
-
-    # load config file
-    cfg = load_config()
+    # load config file (parsed once, then threaded through every stage)
+    if cfg is None:
+        cfg = get_config()
     logger.info("Config file loaded successfully")
 
-    # clean data
-    clean = clean_data(raw, cfg)
-    logger.info("Data cleaned successfully")
+    # cleaned data from the artifact cache, keyed on the raw file's contents
+    cache = get_artifact_cache(cfg)
+    clean = key = None
+    if cache is not None:
+        raw_path = (
+            Path(cfg["paths"]["raw_data"]["folder"]) / cfg["paths"]["raw_data"]["file"]
+        )
+        key = cache.key(
+            "clean",
+            file_digest(raw_path),
+            config_values(cfg, CLEAN_CONFIG + VALIDATE_CONFIG),
+        )
+        clean = cache.get(key)
 
-    # validate data
-    validate_data(clean, cfg)
-    logger.info("Clean data validated")
+    if clean is None:
+        # load raw data
+        with span("load") as step:
+            raw = load_dataset(cfg=cfg)
+            step.set_rows(len(raw))
+        logger.info("Raw data loaded successfully")
+
+        # clean data
+        with span("clean", rows=len(raw)):
+            clean = clean_data(raw, cfg)
+        logger.info("Data cleaned successfully")
+
+        # validate data
+        with span("validate", rows=len(clean)):
+            validate_data(clean, cfg)
+        logger.info("Clean data validated")
+        if cache is not None:
+            cache.put(key, clean, "frame")
+    else:
+        logger.info("Clean data loaded from the artifact cache")
+
+    # write to csv (and any additional formats, e.g. parquet), unless the files
+    # already hold this artifact
+    processed_file_paths = processed_data_paths(cfg)
+    outputs = processed_file_paths + [schema_path(processed_file_paths[0])]
+    if cache is not None and cache.outputs_current(key, outputs):
+        logger.info("Processed files are up to date")
+    else:
+        with span("write_files", rows=len(clean)):
+            for processed_file_path in processed_file_paths:
+                write_dataset(clean, processed_file_path)
+                logger.info(f"File successfully written at {processed_file_path}")
+            save_schema(frame_schema(clean), processed_file_paths[0])
+        if cache is not None:
+            cache.record_outputs(key, outputs)
+
+    # store to SQL database; the load settings are not part of the artifact key,
+    # so the database is only current if it was written with the same ones
+    path_to_db = database_path(cfg)
+    db_config = config_values(cfg, DATABASE_CONFIG) if cache is not None else None
+    if cache is not None and cache.outputs_current(key, [path_to_db], db_config):
+        logger.info("SQLite database is up to date")
+    else:
+        write_to_SQL_db(clean, cfg)
+        logger.info("Clean data successfully written to sqlite db")
+        if cache is not None:
+            # move the load into the database file, so its digest is final
+            with connect(cfg, readonly=False) as con:
+                con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            cache.record_outputs(key, [path_to_db], db_config)
+
+
+def run_streaming_pipeline(cfg=None, chunksize=None):
+    """Run the data pipeline chunk-by-chunk with bounded memory.
+
+    Streaming counterpart of run_data_pipeline() for raw files too large to
+    load at once. Each chunk of the raw CSV is cleaned, its validation report
+    is merged into a running total (missing values, dtype problems, target and
+    range violations, row counts), and it is appended to the processed data
+    files and the SQLite database before the next chunk is read. Peak memory
+    therefore depends on the chunk size, not the input size.
+
+    Outputs are written to temporary ".partial" files and a staging table and
+    only replace the existing processed files and "patients" table once every
+    chunk has been processed and the merged report passes validation, so a failure
+    part-way through leaves the previous outputs intact.
+
+    Args:
+        cfg (Mapping, optional): Configuration to run with. If None, uses the
+            cached configuration from get_config(). Defaults to None.
+        chunksize (int, optional): Rows per chunk. If None, uses
+            cfg["streaming"]["chunksize"]. Defaults to None.
+
+    Returns:
+        dict: Merged validation report (see ValidationEngine), with the merged
+            cleaning report (see CleaningEngine) under "cleaning".
+
+    Raises:
+        FileNotFoundError: If the raw data file cannot be found.
+        ValueError: If the accumulated data fails validation.
+
+    Examples:
+        >>> report = run_streaming_pipeline(chunksize=50_000)
+        >>> report["rows"]
+        297
+    """
+    from clinflow.data.load import iter_dataset
+    from clinflow.data.clean import clean_data
+    from clinflow.data.cleaning import CleaningEngine
+    from clinflow.data.storage import ChunkWriter, processed_data_paths, detect_format
+    from clinflow.data.validation import ValidationEngine, raise_for_report
+    from clinflow.data.schema import decode_categories, frame_schema, save_schema
+    from clinflow.data.db import bulk_write, connect
+    from clinflow.data.db import database_path as get_database_path
+    from clinflow.data.indexing import build_indexes
+    from clinflow.data.to_sqlite import forget_record_keys
+    from clinflow.config import get_config
+
+    logger = get_logger(__name__)
+    if cfg is None:
+        cfg = get_config()
 
-    # write to csv
-    processed_file_path = (
-        Path(cfg["paths"]["processed_data"]["folder"])
-        / cfg["paths"]["processed_data"]["file"]
+    processed_file_paths = processed_data_paths(cfg)
+    database_path = get_database_path(cfg)
+    partial_paths = [
+        path.with_suffix(path.suffix + ".partial") for path in processed_file_paths
+    ]
+    staging_table = "patients_staging"
+
+    processed_file_paths[0].parent.mkdir(parents=True, exist_ok=True)
+    database_path.parent.mkdir(parents=True, exist_ok=True)
+
+    engine = ValidationEngine(cfg)
+    cleaning_engine = CleaningEngine(cfg)
+    report = None
+    cleaning = None
+    writers = [
+        ChunkWriter(partial, detect_format(path))
+        for path, partial in zip(processed_file_paths, partial_paths)
+    ]
+    with connect(cfg, readonly=False) as con:
+        try:
+            con.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            for i, chunk in enumerate(iter_dataset(chunksize=chunksize, cfg=cfg)):
+                # configured dtypes only, and no "category" columns: chunks must share
+                # one schema, and Arrow IPC files allow a single dictionary per field
+                clean, chunk_cleaning = clean_data(
+                    chunk, cfg, infer_dtypes=False, return_report=True
+                )
+                clean = decode_categories(clean)
+                cleaning = cleaning_engine.merge(cleaning, chunk_cleaning)
+                report = engine.merge(report, engine.scan(clean))
+
+                for writer in writers:
+                    writer.write(clean)
+                bulk_write(clean, staging_table, con, if_exists="append")
+                logger.info("Chunk %d processed (%d rows so far)", i, report["rows"])
+
+            if report is None:
+                raise ValueError("Raw dataset is empty")
+            report = engine.finalize(report)
+            report["cleaning"] = cleaning
+            raise_for_report(report)
+
+            # publish outputs only once the whole file has validated
+            for writer in writers:
+                writer.close()
+            with con:
+                con.execute("DROP TABLE IF EXISTS patients")
+                con.execute(f"ALTER TABLE {staging_table} RENAME TO patients")
+            forget_record_keys(con)
+            if cfg.get("database", {}).get("auto_index", False):
+                build_indexes(cfg, con)
+            for path, partial in zip(processed_file_paths, partial_paths):
+                partial.replace(path)
+            save_schema(frame_schema(clean), processed_file_paths[0])
+        except Exception:
+            for writer in writers:
+                writer.close()
+            con.execute(f"DROP TABLE IF EXISTS {staging_table}")
+            for partial in partial_paths:
+                partial.unlink(missing_ok=True)
+            raise
+
+    logger.info(
+        "Streaming pipeline wrote %d rows to %s and %s",
+        report["rows"],
+        ", ".join(str(path) for path in processed_file_paths),
+        database_path,
+    )
+    return report
+
+
+def pipeline_stages(cfg, train=False):
+    """Stages of the data pipeline (and optionally training) as a DAG.
+
+    download -> load -> clean -> validate, then the processed files
+    ("persist_csv") and the SQLite load ("persist_sqlite") side by side; with
+    ``train``, validate -> train, then "evaluate" (metrics file) and "save"
+    (model file) side by side. Each stage lists the files it reads and writes
+    and the config keys that change its result (see clinflow.dag.Stage).
+
+    Args:
+        cfg (Mapping): Configuration; file locations are resolved from it.
+        train (bool): Include the training stages. Defaults to False.
+
+    Returns:
+        list[clinflow.dag.Stage]: The stages, in dependency order.
+    """
+    from clinflow.dag import Stage
+    from clinflow.data.db import database_path
+    from clinflow.data.storage import processed_data_paths
+    from clinflow.data.schema import schema_path
+
+    raw_path = (
+        Path(cfg["paths"]["raw_data"]["folder"]) / cfg["paths"]["raw_data"]["file"]
     )
-    clean.to_csv(processed_file_path)
-    logger.info(f"File successfully written to csv at {processed_file_path}")
+    processed_paths = processed_data_paths(cfg)
+    training = cfg["model_training"]
+    results_path = Path(training["path_to_results"]["directory"]) / (
+        training["path_to_results"]["file"]
+    )
+    model_path = Path(training["path_to_model"]["directory"]) / (
+        training["path_to_model"]["file"]
+    )
+
+    stages = [
+        Stage(
+            "download",
+            _download_stage,
+            outputs=[raw_path],
+            config=["paths.raw_data"],
+        ),
+        Stage("load", _load_stage, deps=["download"], inputs=[raw_path]),
+        Stage(
+            "clean",
+            _clean_stage,
+            deps=["load"],
+            config=CLEAN_CONFIG,
+        ),
+        Stage(
+            "validate",
+            _validate_stage,
+            deps=["clean"],
+            config=VALIDATE_CONFIG,
+        ),
+        Stage(
+            "persist_csv",
+            _persist_csv_stage,
+            deps=["validate"],
+            outputs=processed_paths + [schema_path(processed_paths[0])],
+            config=["paths.processed_data"],
+        ),
+        Stage(
+            "persist_sqlite",
+            _persist_sqlite_stage,
+            deps=["validate"],
+            outputs=[database_path(cfg)],
+            config=DATABASE_CONFIG,
+        ),
+    ]
+    if train:
+        stages += [
+            Stage(
+                "train",
+                _train_stage,
+                deps=["validate"],
+                config=TRAIN_CONFIG,
+            ),
+            Stage(
+                "evaluate",
+                _evaluate_stage,
+                deps=["train"],
+                outputs=[results_path],
+                config=["model_training.path_to_results"],
+            ),
+            Stage(
+                "save",
+                _save_stage,
+                deps=["train"],
+                outputs=[model_path],
+                config=["model_training.path_to_model"],
+            ),
+        ]
+    return stages
 
-    # store to SQL database
-    write_to_SQL_db(clean)
-    logger.info("Clean data successfully written to sqlite db")
+
+def _download_stage(cfg):
+    from clinflow.data.download_data import download_dataset
+
+    # no-op when the raw file already exists
+    return download_dataset(cfg=cfg)
+
+
+def _load_stage(cfg, raw_path):
+    from clinflow.data.load import load_dataset
+
+    return load_dataset(raw_path, cfg)
+
+
+def _clean_stage(cfg, raw):
+    from clinflow.data.clean import clean_data
+
+    return clean_data(raw, cfg)
+
+
+def _validate_stage(cfg, clean):
+    from clinflow.data.clean import validate_data
+
+    validate_data(clean, cfg)
+    return clean
+
+
+def _persist_csv_stage(cfg, clean):
+    from clinflow.data.storage import processed_data_paths, write_dataset
+    from clinflow.data.schema import frame_schema, save_schema
+
+    processed_file_paths = processed_data_paths(cfg)
+    for processed_file_path in processed_file_paths:
+        write_dataset(clean, processed_file_path)
+    save_schema(frame_schema(clean), processed_file_paths[0])
+
+
+def _persist_sqlite_stage(cfg, clean):
+    from clinflow.data.to_sqlite import write_to_SQL_db
+    from clinflow.data.db import connect
+
+    write_to_SQL_db(clean, cfg)
+    # move the load into the database file, so the digest recorded for this
+    # output does not change when the WAL is checkpointed later
+    with connect(cfg, readonly=False) as con:
+        con.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def _train_stage(cfg, clean):
+    from clinflow.models.train import train_model
+    from clinflow.data.schema import decode_categories
+    from clinflow.data.storage import training_columns
+
+    # the columns and dtypes train_model_cli reads back from the processed file
+    return train_model(decode_categories(clean[training_columns(cfg)]), cfg)
+
+
+def _evaluate_stage(cfg, model):
+    from clinflow.models.train import evaluate_model
+
+    return evaluate_model(model["y_test"], model["y_pred"], cfg)
+
+
+def _save_stage(cfg, model):
+    from clinflow.models.io import save_model
+
+    return save_model(model, None, cfg)
+
+
+def run_dag_pipeline(cfg=None, train=False, force=False):
+    """Run the pipeline as a DAG, skipping stages whose inputs are unchanged.
+
+    Builds pipeline_stages() and runs them with clinflow.dag.DAGRunner: every
+    stage is fingerprinted by the contents of the files it reads, the config
+    keys it depends on and its upstream stages, and is skipped when the
+    fingerprint matches the last successful run (kept in the file at
+    cfg["paths"]["dag_state"]) and its output files exist. Independent stages
+    (the processed files and the SQLite load; evaluation and model save) run
+    concurrently, up to cfg["dag"]["max_workers"] at once.
+
+    Args:
+        cfg (Mapping, optional): Configuration to run with. If None, uses the
+            cached configuration from get_config(). Defaults to None.
+        train (bool): Also train, evaluate and save the model. Defaults to
+            False.
+        force (bool): Run every stage regardless of the stored fingerprints.
+            Defaults to False.
+
+    Returns:
+        dict: Run report with per-stage status ("ran"/"cached"), reason and
+            seconds, and totals (see DAGRunner.run()).
+
+    Examples:
+        >>> run_dag_pipeline(train=True)["cache_hits"]
+        0
+        >>> run_dag_pipeline(train=True)["cache_hits"]  # nothing changed
+        9
+    """
+    from clinflow.config import get_config
+    from clinflow.dag import DAGRunner
+
+    if cfg is None:
+        cfg = get_config()
+    state_file = (
+        Path(cfg["paths"]["dag_state"]["folder"]) / cfg["paths"]["dag_state"]["file"]
+    )
+    runner = DAGRunner(
+        pipeline_stages(cfg, train=train),
+        cfg,
+        state_file,
+        max_workers=cfg.get("dag", {}).get("max_workers", 4),
+    )
+    return runner.run(force=force)
 
 
 def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run the clinflow data pipeline")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Process the raw CSV in chunks with bounded memory",
+    )
+    parser.add_argument(
+        "--chunksize", type=int, default=None, help="Rows per chunk with --stream"
+    )
+    parser.add_argument(
+        "--dag",
+        action="store_true",
+        help="Run as a DAG, skipping stages whose inputs are unchanged",
+    )
+    parser.add_argument(
+        "--train", action="store_true", help="With --dag, also train the model"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="With --dag, run every stage"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record a run profile of each stage (profiling.file in results/)",
+    )
+    parser.add_argument(
+        "--profile-span",
+        action="append",
+        metavar="NAME",
+        help="Also run the named span under cProfile (implies --profile)",
+    )
+    args = parser.parse_args()
+    if args.stream and args.dag:
+        parser.error("--stream and --dag cannot be combined")
+
     logger = get_logger(__name__)
-    run_data_pipeline()
+    configure_profiling(enabled=args.profile, profile_spans=args.profile_span)
+    if args.stream:
+        run_streaming_pipeline(chunksize=args.chunksize)
+    elif args.dag:
+        report = run_dag_pipeline(train=args.train, force=args.force)
+        for name, stage in report["stages"].items():
+            print(f"{name:15} {stage['status']:8} {stage['seconds']:7.2f} s")
+    else:
+        run_data_pipeline()
+    profile_path = save_profile()
+    if profile_path is not None:
+        logger.info("Run profile saved to '%s'", profile_path)
     logger.info("Pipeline completed successfully")
 
 
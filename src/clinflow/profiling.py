@@ -0,0 +1,380 @@
+from clinflow.config import get_config
+from clinflow.logging_utils import get_logger
+from pathlib import Path
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+
+try:  # peak RSS; not available on Windows
+    import resource
+except ImportError:  # pragma: no cover
+    resource = None
+
+# used when the configuration has no "profiling" section
+DEFAULT_SETTINGS = {
+    "enabled": False,
+    "file": "profile.json",
+    "profile_spans": [],
+    "profiler": "cprofile",
+}
+
+# the active Profile, or None when profiling is off (the common case, checked
+# once per span so disabled instrumentation costs a global lookup)
+_PROFILE = None
+
+
+def _settings(cfg):
+    return {**DEFAULT_SETTINGS, **dict(cfg.get("profiling", {}))}
+
+
+def _peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+class Span:
+    """Measurements of one timed block; see span()."""
+
+    __slots__ = ("name", "path", "rows", "_start", "_cpu", "_rss", "_profiler")
+
+    def __init__(self, name, path, rows=None):
+        self.name = name
+        self.path = path
+        self.rows = rows
+
+    def set_rows(self, rows):
+        """Record how many rows the block processed."""
+        self.rows = int(rows)
+
+
+class _NullSpan:
+    # returned by span() when profiling is off
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set_rows(self, rows):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Profile:
+    """Collects spans for one run and aggregates them into a run profile.
+
+    Each span records wall time, process CPU time (all threads, so concurrent
+    spans overlap), the process's peak RSS when the span ended and how much
+    the span raised it, and optionally the rows it processed. Spans nest per
+    thread: a span opened inside another is recorded under the path
+    "outer/inner". Spans named in ``profile_spans`` also run under a
+    function-level profiler, whose report is written next to the run profile.
+
+    Args:
+        profile_spans (list[str]): Span names to run under the profiler.
+            Defaults to none.
+        profiler (str): "cprofile" (standard library) or "pyinstrument" (if
+            installed; falls back to cProfile otherwise).
+        output_dir (str or Path): Folder for profiler reports. Defaults to
+            "results/".
+    """
+
+    def __init__(self, profile_spans=(), profiler="cprofile", output_dir="results/"):
+        self.profile_spans = set(profile_spans)
+        self.profiler = profiler
+        self.output_dir = Path(output_dir)
+        self.started = time.time()
+        self._start = time.perf_counter()
+        self._records = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def enter(self, name, rows=None):
+        stack = self._stack()
+        path = f"{stack[-1].path}/{name}" if stack else name
+        span = Span(name, path, rows)
+        stack.append(span)
+        profiled = name in self.profile_spans
+        span._profiler = self._start_profiler() if profiled else None
+        span._rss = _peak_rss_mb()
+        span._cpu = time.process_time()
+        span._start = time.perf_counter()
+        return span
+
+    def exit(self, span):
+        wall = time.perf_counter() - span._start
+        cpu = time.process_time() - span._cpu
+        rss = _peak_rss_mb()
+        self._stack().pop()
+        if span._profiler is not None:
+            self._stop_profiler(span)
+        record = {
+            "name": span.name,
+            "path": span.path,
+            "thread": threading.current_thread().name,
+            "start": span._start - self._start,
+            "wall_seconds": wall,
+            "cpu_seconds": cpu,
+            "peak_rss_mb": rss,
+            "rss_growth_mb": rss - span._rss if rss is not None else None,
+            "rows": span.rows,
+            "rows_per_second": span.rows / wall if span.rows and wall else None,
+        }
+        with self._lock:
+            self._records.append(record)
+
+    def _start_profiler(self):
+        if self.profiler == "pyinstrument":
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                get_logger(__name__).warning(
+                    "pyinstrument is not installed; using cProfile"
+                )
+            else:
+                profiler = Profiler()
+                profiler.start()
+                return profiler
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _stop_profiler(self, span):
+        profiler = span._profiler
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stem = self.output_dir / f"profile_{span.path.replace('/', '.')}"
+        if isinstance(profiler, cProfile.Profile):
+            profiler.disable()
+            profiler.dump_stats(f"{stem}.prof")
+            text = io.StringIO()
+            stats = pstats.Stats(profiler, stream=text)
+            stats.sort_stats("cumulative").print_stats(30)
+            Path(f"{stem}.txt").write_text(text.getvalue())
+        else:
+            profiler.stop()
+            Path(f"{stem}.txt").write_text(profiler.output_text())
+            Path(f"{stem}.html").write_text(profiler.output_html())
+        get_logger(__name__).info("Profiler report for %s in %s.txt", span.path, stem)
+
+    def report(self):
+        """The run profile: every span, plus totals per span path.
+
+        Returns:
+            dict: {"started": Unix time, "wall_seconds": since the profile
+                started, "spans": [span records in completion order],
+                "stages": {path: {"calls", "wall_seconds", "cpu_seconds",
+                "rows", "rows_per_second", "peak_rss_mb"}}}.
+        """
+        with self._lock:
+            records = list(self._records)
+        stages = {}
+        for record in records:
+            stage = stages.setdefault(
+                record["path"],
+                {
+                    "calls": 0,
+                    "wall_seconds": 0.0,
+                    "cpu_seconds": 0.0,
+                    "rows": None,
+                    "peak_rss_mb": None,
+                },
+            )
+            stage["calls"] += 1
+            stage["wall_seconds"] += record["wall_seconds"]
+            stage["cpu_seconds"] += record["cpu_seconds"]
+            if record["rows"] is not None:
+                stage["rows"] = (stage["rows"] or 0) + record["rows"]
+            if record["peak_rss_mb"] is not None:
+                peak = max(stage["peak_rss_mb"] or 0, record["peak_rss_mb"])
+                stage["peak_rss_mb"] = peak
+        for stage in stages.values():
+            rows, wall = stage["rows"], stage["wall_seconds"]
+            stage["rows_per_second"] = rows / wall if rows and wall else None
+        return {
+            "started": self.started,
+            "wall_seconds": time.perf_counter() - self._start,
+            "spans": records,
+            "stages": stages,
+        }
+
+
+class _SpanContext:
+    __slots__ = ("profile", "name", "rows", "span")
+
+    def __init__(self, profile, name, rows):
+        self.profile = profile
+        self.name = name
+        self.rows = rows
+
+    def __enter__(self):
+        self.span = self.profile.enter(self.name, self.rows)
+        return self.span
+
+    def __exit__(self, *exc):
+        self.profile.exit(self.span)
+        return False
+
+
+def span(name, rows=None):
+    """Context manager timing a block as ``name`` while profiling is enabled.
+
+    Yields a Span; call ``set_rows(n)`` on it to record rows processed. When
+    profiling is off, returns a shared no-op context.
+
+    Examples:
+        >>> with span("clean") as s:
+        ...     clean = clean_data(raw, cfg)
+        ...     s.set_rows(len(raw))
+    """
+    profile = _PROFILE
+    if profile is None:
+        return _NULL_SPAN
+    return _SpanContext(profile, name, rows)
+
+
+def profiled(name=None, rows=None):
+    """Decorator recording each call of a function as a span.
+
+    Args:
+        name (str, optional): Span name. Defaults to the function's name.
+        rows (callable, optional): ``rows(result, *args, **kwargs)`` returning
+            the rows processed, e.g. ``lambda result, df, *a, **k: len(df)``.
+    """
+
+    def decorate(fn):
+        span_name = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            profile = _PROFILE
+            if profile is None:
+                return fn(*args, **kwargs)
+            current = profile.enter(span_name)
+            try:
+                result = fn(*args, **kwargs)
+                if rows is not None:
+                    current.set_rows(rows(result, *args, **kwargs))
+                return result
+            finally:
+                profile.exit(current)
+
+        return wrapper
+
+    return decorate
+
+
+def _results_dir(cfg):
+    return Path(cfg["model_training"]["path_to_results"]["directory"])
+
+
+def enable_profiling(cfg=None, profile_spans=None):
+    """Start collecting spans (replacing any profile in progress).
+
+    Settings come from cfg["profiling"]: "profile_spans" (span names to run
+    under a function-level profiler) and "profiler" ("cprofile" or
+    "pyinstrument"). Profiler reports go to the results directory.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        profile_spans (list[str], optional): Overrides the configured span
+            names, e.g. from a --profile-span command-line option.
+
+    Returns:
+        Profile: The new active profile.
+    """
+    global _PROFILE
+    if cfg is None:
+        cfg = get_config()
+    settings = _settings(cfg)
+    if profile_spans is None:
+        profile_spans = settings["profile_spans"]
+    _PROFILE = Profile(profile_spans, settings["profiler"], _results_dir(cfg))
+    return _PROFILE
+
+
+def disable_profiling():
+    """Stop collecting spans; returns the profile that was active (or None)."""
+    global _PROFILE
+    profile, _PROFILE = _PROFILE, None
+    return profile
+
+
+def profiling_enabled():
+    """True while spans are being collected."""
+    return _PROFILE is not None
+
+
+def configure_profiling(cfg=None, enabled=False, profile_spans=None):
+    """Enable profiling if requested on the command line or in the config.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        enabled (bool): A --profile option; cfg["profiling"]["enabled"] also
+            turns profiling on.
+        profile_spans (list[str], optional): --profile-span options; naming a
+            span implies profiling.
+
+    Returns:
+        Profile or None: The active profile, or None if profiling stays off.
+    """
+    if cfg is None:
+        cfg = get_config()
+    if not (enabled or profile_spans or _settings(cfg)["enabled"]):
+        return None
+    return enable_profiling(cfg, profile_spans or None)
+
+
+def save_profile(cfg=None, filepath=None):
+    """Write the active profile as JSON next to the metrics file.
+
+    Args:
+        cfg (Mapping, optional): Configuration. If None, uses get_config().
+        filepath (str or Path, optional): Output file. If None, uses
+            cfg["profiling"]["file"] in cfg["model_training"]["path_to_results"]
+            ["directory"] (results/profile.json).
+
+    Returns:
+        Path or None: The file written, or None if profiling is off.
+    """
+    if _PROFILE is None:
+        return None
+    if cfg is None:
+        cfg = get_config()
+    if filepath is None:
+        filepath = _results_dir(cfg) / _settings(cfg)["file"]
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    report = _PROFILE.report()
+    tmp = filepath.with_suffix(filepath.suffix + f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(report, indent=2))
+    os.replace(tmp, filepath)
+
+    logger = get_logger(__name__)
+    for path, stage in report["stages"].items():
+        logger.info(
+            "Profile %s: %.3f s wall, %.3f s CPU, %s rows, peak RSS %s MiB",
+            path,
+            stage["wall_seconds"],
+            stage["cpu_seconds"],
+            stage["rows"],
+            None if stage["peak_rss_mb"] is None else round(stage["peak_rss_mb"]),
+        )
+    return filepath
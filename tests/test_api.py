@@ -0,0 +1,79 @@
+from clinflow.api import create_app, patient_model
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.models.io import save_model
+from clinflow.models.train import train_model
+from fastapi.testclient import TestClient
+from pathlib import Path
+import pytest
+
+cfg = get_config()
+
+PATIENT = {
+    "age": 63,
+    "sex": 1,
+    "cp": 1,
+    "trestbps": 145,
+    "chol": 233,
+    "fbs": 1,
+    "restecg": 2,
+    "thalach": 150,
+    "ca": 0,
+    "thal": 6,
+}
+
+
+def clean_data_path():
+    return (
+        Path(cfg["paths"]["processed_data"]["folder"])
+        / cfg["paths"]["processed_data"]["file"]
+    )
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    # train a fresh model so the service doesn't depend on the committed artifact
+    model = train_model(load_dataset(clean_data_path()), cfg)
+    path = save_model(model, tmp_path_factory.mktemp("models") / "model.joblib")
+
+    with TestClient(create_app(path)) as client:
+        yield client
+
+
+def test_health(client):
+    response = client.get("/health")
+    assert response.json() == {"status": "ok", "model_loaded": True}
+
+
+def test_predict_single(client):
+    response = client.post("/predict", json=PATIENT)
+    assert response.status_code == 200
+    body = response.json()
+    assert 0.0 <= body["probability"] <= 1.0
+    assert body["prediction"] in (0, 1)
+
+
+def test_predict_batch_matches_single(client):
+    single = client.post("/predict", json=PATIENT).json()
+    batch = client.post("/predict/batch", json={"patients": [PATIENT] * 3}).json()
+    assert len(batch["predictions"]) == 3
+    assert batch["predictions"][0] == pytest.approx(single)
+
+
+def test_missing_feature_rejected(client):
+    patient = {k: v for k, v in PATIENT.items() if k != "age"}
+    assert client.post("/predict", json=patient).status_code == 422
+
+
+def test_request_model_follows_config(tmp_path):
+    custom = cfg.to_dict()
+    custom["model_training"]["numerical_features"] = ["age", "chol"]
+    custom["model_training"]["categorical_features"] = ["cp"]
+    assert list(patient_model(custom).model_fields) == ["age", "chol", "cp"]
+
+    # a model trained on other features is refused at startup
+    model = train_model(load_dataset(clean_data_path()), cfg)
+    path = save_model(model, tmp_path / "model.joblib")
+    with pytest.raises(ValueError, match="configured features"):
+        with TestClient(create_app(path, custom)):
+            pass
@@ -0,0 +1,104 @@
+from clinflow.artifacts import ArtifactCache, frame_digest, get_artifact_cache
+from clinflow.cli import main
+from clinflow.config import get_config
+from sklearn.linear_model import LogisticRegression
+import os
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def frame():
+    df = pd.DataFrame(
+        {
+            "age": np.array([63, 41, 57], dtype="int16"),
+            "cp": pd.Series([1, 4, 2], dtype="int8").astype("category"),
+            "chol": [233.0, 204.0, np.nan],
+        }
+    )
+    return df.set_axis([0, 2, 5])  # cleaned frames keep their row labels
+
+
+def test_frame_round_trip_keeps_dtypes_and_index(tmp_path, frame):
+    cache = ArtifactCache(tmp_path)
+    key = cache.key("clean", "raw-digest", {"schema": {"downcast": True}})
+
+    assert cache.get(key) is None
+    cache.put(key, frame, "frame")
+
+    pd.testing.assert_frame_equal(cache.get(key), frame)
+
+
+def test_model_round_trip(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    model = {"pipeline": LogisticRegression().fit([[0], [1]], [0, 1]), "y_pred": [1]}
+    key = cache.key("model", "data")
+    cache.put(key, model, "model")
+
+    loaded = cache.get(key)
+    assert loaded["y_pred"] == [1]
+    assert loaded["pipeline"].predict([[1]]).tolist() == [1]
+
+
+def test_key_depends_on_data_and_config(frame):
+    def key(df, minimum_rows=50):
+        config = {"minimum_rows": minimum_rows}
+        return ArtifactCache.key("clean", frame_digest(df), config)
+
+    assert key(frame) == key(frame.copy())
+    assert key(frame) != key(frame, minimum_rows=60)
+    assert key(frame) != key(frame.assign(age=frame["age"] + 1))
+
+
+def test_prune_evicts_least_recently_used(tmp_path, frame):
+    cache = ArtifactCache(tmp_path)
+    keys = [cache.key("clean", str(i)) for i in range(3)]
+    for i, key in enumerate(keys):
+        cache.put(key, frame, "frame")
+        os.utime(tmp_path / f"{key}.parquet", (1000 + i, 1000 + i))
+    cache.get(keys[0])  # now the most recently used
+
+    one_entry = cache.entries()[0]["bytes"] / 2**20
+    removed = cache.prune(max_mb=one_entry * 2.5)
+
+    assert removed == [keys[1]]
+    assert [entry["key"] for entry in cache.entries()] == [keys[0], keys[2]]
+    assert cache.clear() == 2
+    assert cache.entries() == []
+
+
+def test_outputs_current_tracks_file_contents(tmp_path, frame):
+    cache = ArtifactCache(tmp_path / "cache")
+    key = cache.key("clean", "raw")
+    cache.put(key, frame, "frame")
+    output = tmp_path / "clean.csv"
+    frame.to_csv(output)
+
+    assert not cache.outputs_current(key, [output])
+    cache.record_outputs(key, [output])
+    assert cache.outputs_current(key, [output])
+
+    # files written under other settings are not current
+    assert not cache.outputs_current(key, [output], {"load_mode": "upsert"})
+    cache.record_outputs(key, [output], {"load_mode": "upsert"})
+    assert cache.outputs_current(key, [output], {"load_mode": "upsert"})
+    assert not cache.outputs_current(key, [output])
+
+    output.write_text("edited")
+    assert not cache.outputs_current(key, [output], {"load_mode": "upsert"})
+
+
+def test_cache_cli(tmp_path, frame, capsys):
+    cfg = get_config().to_dict()
+    cfg["artifacts"]["folder"] = f"{tmp_path}/"
+    get_artifact_cache(cfg).put(ArtifactCache.key("clean", "raw"), frame, "frame")
+
+    assert main(["cache", "list"], cfg) == 0
+    assert "1 artifacts" in capsys.readouterr().out
+    assert main(["cache", "prune", "--max-mb", "0"], cfg) == 0
+    assert "Evicted 1 artifacts" in capsys.readouterr().out
+    assert main(["cache", "clear"], cfg) == 0
+
+    cfg["artifacts"]["enabled"] = False
+    assert main(["cache", "list"], cfg) == 1
@@ -0,0 +1,75 @@
+from clinflow.batching import MicroBatcher
+import asyncio
+import threading
+import pytest
+
+
+def run_concurrently(batcher, items):
+    async def main():
+        await batcher.start()
+        try:
+            return await asyncio.gather(*(batcher.submit(i) for i in items))
+        finally:
+            await batcher.stop()
+
+    return asyncio.run(main())
+
+
+def test_results_fan_out_in_order():
+    batch_sizes = []
+
+    def double(items):
+        batch_sizes.append(len(items))
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher(double, max_batch_size=64, max_wait_ms=50)
+    assert run_concurrently(batcher, range(10)) == [i * 2 for i in range(10)]
+    # concurrent submissions are coalesced into a single call
+    assert batch_sizes == [10]
+
+
+def test_max_batch_size_respected():
+    batch_sizes = []
+
+    def identity(items):
+        batch_sizes.append(len(items))
+        return items
+
+    batcher = MicroBatcher(identity, max_batch_size=4, max_wait_ms=50)
+    run_concurrently(batcher, range(10))
+    assert max(batch_sizes) <= 4
+    assert sum(batch_sizes) == 10
+
+
+def test_errors_propagate_to_callers():
+    def fail(items):
+        raise ValueError("bad batch")
+
+    batcher = MicroBatcher(fail, max_wait_ms=1)
+    with pytest.raises(ValueError, match="bad batch"):
+        run_concurrently(batcher, [1, 2])
+
+
+def test_stop_mid_batch_fails_waiting_callers():
+    started, release = threading.Event(), threading.Event()
+
+    def slow(items):
+        started.set()
+        release.wait(5)
+        return items
+
+    async def main():
+        batcher = MicroBatcher(slow, max_wait_ms=1)
+        await batcher.start()
+        calls = [asyncio.create_task(batcher.submit(i)) for i in range(2)]
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        await batcher.stop()
+        results = await asyncio.wait_for(
+            asyncio.gather(*calls, return_exceptions=True), 1
+        )
+        release.set()
+        return results
+
+    results = asyncio.run(main())
+    assert [str(r) for r in results] == ["MicroBatcher stopped"] * 2
+    assert all(isinstance(r, RuntimeError) for r in results)
@@ -0,0 +1,88 @@
+from clinflow.config import get_config
+from clinflow.data.clean import clean_data
+from clinflow.data.cleaning import CleaningEngine
+import numpy as np
+import pandas as pd
+import pytest
+
+cfg = get_config().to_dict()
+cfg["schema"]["downcast"] = False
+
+
+def raw_frame(n=200, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(29, 78, n),
+            "trestbps": rng.integers(94, 200, n),
+            "chol": rng.integers(126, 565, n).astype(float),
+            "fbs": rng.integers(0, 2, n),
+            "thalach": rng.integers(71, 203, n),
+            "ca": rng.integers(0, 4, n).astype(str).astype(object),
+            "thal": rng.choice([3.0, 6.0, 7.0], n),
+            "num": rng.integers(0, 5, n),
+        }
+    )
+    df.loc[[3, 50], "chol"] = np.nan
+    df.loc[[7], "thal"] = np.nan
+    df.loc[[10, 11, 12], "ca"] = "?"  # coerced to NaN
+    df.loc[[20], "ca"] = None
+    return df
+
+
+def legacy_clean(df, cfg):
+    # clean_data before the fused engine, for comparison
+    if cfg["missing_value_strategy"] == "drop":
+        df = df.dropna().copy()
+    for name in cfg["numerical_column_names"]:
+        df[name] = pd.to_numeric(df[name], errors="coerce")
+    df["target"] = (df[cfg["target_column_name"]] > 0).astype(int)
+    return df
+
+
+@pytest.mark.parametrize("strategy", ["drop", "keep"])
+def test_matches_legacy_cleaning(strategy):
+    test_cfg = {**cfg, "missing_value_strategy": strategy}
+    raw = raw_frame()
+    clean = clean_data(raw, test_cfg)
+    pd.testing.assert_frame_equal(clean, legacy_clean(raw, test_cfg))
+
+
+def test_report_counts():
+    raw = raw_frame()
+    clean, report = CleaningEngine(cfg).run(raw)
+
+    assert report["nulls"]["chol"] == 2
+    assert report["nulls"]["ca"] == 1  # "?" is only missing once converted
+    assert report["rows_dropped"] == 4
+    assert report["rows_in"] - report["rows_out"] == report["rows_dropped"]
+    assert report["coerced"] == {"ca": 3}
+    assert report["missing_before"] == int(raw.isnull().sum().sum())
+    assert report["missing_after"] == int(clean.isnull().sum().sum()) == 3
+
+
+def test_input_frame_not_modified():
+    raw = raw_frame()
+    snapshot = raw.copy()
+    clean_data(raw, {**cfg, "missing_value_strategy": "keep"})
+    clean_data(raw.dropna(), cfg)  # nothing dropped: no copy is taken
+    pd.testing.assert_frame_equal(raw, snapshot)
+
+
+def test_return_report_and_downcast():
+    test_cfg = get_config().to_dict()
+    clean, report = clean_data(raw_frame(), test_cfg, return_report=True)
+    assert report["bytes_after"] < report["bytes_before"]
+    assert str(clean["age"].dtype) == "int16"
+
+
+def test_merge_chunk_reports():
+    engine = CleaningEngine(cfg)
+    raw = raw_frame()
+    total = None
+    for start in range(0, len(raw), 64):
+        _, report = engine.run(raw.iloc[start : start + 64])
+        total = engine.merge(total, report)
+    _, whole = engine.run(raw)
+
+    assert total == whole
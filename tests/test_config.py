@@ -1,5 +1,9 @@
-from clinflow.config import load_config
+from clinflow.config import load_config, get_config, reload_config
 from pathlib import Path
+import copy
+import os
+import pytest
+import time
 
 def test_returns_dictionary():
     assert isinstance(load_config(), dict)
@@ -18,3 +22,39 @@ def test_custom_path():
     assert isinstance(load_config("config/config.yml"), dict)
 
 
+
+
+def test_get_config_is_cached():
+    assert get_config() is get_config()
+
+
+def test_get_config_is_read_only():
+    cfg = get_config()
+    with pytest.raises(TypeError):
+        cfg["minimum_rows"] = 0
+    with pytest.raises(AttributeError):
+        cfg["model_training"]["numerical_features"].append("foo")
+
+
+def test_load_config_returns_independent_copy():
+    cfg = load_config()
+    cfg["model_training"]["numerical_features"].pop()
+    assert load_config() != cfg
+    assert isinstance(copy.deepcopy(get_config()), dict)
+
+
+def test_reload_on_mtime_change(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("minimum_rows: 50\n")
+    assert get_config(path)["minimum_rows"] == 50
+
+    path.write_text("minimum_rows: 10\n")
+    os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    assert get_config(path)["minimum_rows"] == 10
+
+
+def test_explicit_reload(tmp_path):
+    path = tmp_path / "config.yml"
+    path.write_text("minimum_rows: 50\n")
+    first = get_config(path)
+    assert reload_config(path) is not first
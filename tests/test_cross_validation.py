@@ -0,0 +1,79 @@
+from clinflow.config import get_config
+from clinflow.models.cross_validation import cross_validate_model, summarize
+from clinflow.models.train import build_pipeline, evaluate_model
+from sklearn.linear_model import LogisticRegression
+import json
+import numpy as np
+import pandas as pd
+import pytest
+
+cfg = get_config()
+
+rng = np.random.default_rng(0)
+n = 400
+df = pd.DataFrame(
+    {
+        "age": rng.integers(29, 78, n),
+        "sex": rng.integers(0, 2, n),
+        "cp": rng.integers(1, 5, n),
+        "trestbps": rng.integers(94, 200, n),
+        "chol": rng.integers(126, 565, n),
+        "fbs": rng.integers(0, 2, n),
+        "restecg": rng.choice([0, 1, 2], n, p=[0.49, 0.02, 0.49]),
+        "thalach": rng.integers(71, 202, n),
+        "ca": rng.integers(0, 4, n),
+        "thal": rng.choice([3, 6, 7], n),
+    }
+)
+df["target"] = (
+    rng.random(n) < 1 / (1 + np.exp(-(0.08 * (df["age"] - 54) + 0.7 * df["ca"] - 1)))
+).astype(int)
+
+
+def test_summarize():
+    summary = summarize([0.8, 0.9, 0.7, 0.8], confidence=0.95)
+    assert summary["mean"] == pytest.approx(0.8)
+    assert summary["std"] == pytest.approx(np.std([0.8, 0.9, 0.7, 0.8], ddof=1))
+    assert summary["ci_low"] < 0.8 < summary["ci_high"]
+    assert summarize([0.8])["ci_low"] == summarize([0.8])["ci_high"] == 0.8
+
+
+def test_repeated_folds_cover_every_row():
+    report = cross_validate_model(df, cfg, n_splits=4, n_repeats=2, n_jobs=1)
+
+    assert len(report["folds"]) == 8
+    assert sum(fold["n_test"] for fold in report["folds"]) == 2 * len(df)
+    accuracy = report["metrics"]["accuracy"]
+    folds = [fold["accuracy"] for fold in report["folds"]]
+    assert accuracy["mean"] == pytest.approx(np.mean(folds))
+    expected = {"accuracy", "precision", "recall", "f1", "roc_auc"}
+    assert set(report["metrics"]) == expected
+
+
+def test_parallel_matches_serial():
+    serial = cross_validate_model(df, cfg, n_splits=3, n_jobs=1)
+    parallel = cross_validate_model(df, cfg, n_splits=3, n_jobs=2)
+
+    for name, summary in serial["metrics"].items():
+        assert parallel["metrics"][name]["mean"] == pytest.approx(summary["mean"])
+    assert parallel["estimated_speedup"] > 0
+
+
+def test_custom_pipeline_is_cloned():
+    pipeline = build_pipeline(cfg, LogisticRegression(C=0.01, max_iter=1000))
+    report = cross_validate_model(df, cfg, n_splits=3, n_jobs=1, pipeline=pipeline)
+    assert "classifier" in pipeline.named_steps
+    assert not hasattr(pipeline.named_steps["classifier"], "coef_")
+    assert report["metrics"]["accuracy"]["mean"] > 0
+
+
+def test_metrics_file_includes_cross_validation(tmp_path):
+    test_cfg = cfg.to_dict()
+    test_cfg["model_training"]["path_to_results"]["directory"] = f"{tmp_path}/"
+    report = cross_validate_model(df, test_cfg, n_splits=3, n_jobs=1)
+    path = evaluate_model([0, 1, 1], [0, 1, 0], test_cfg, cross_validation=report)
+
+    with open(path) as f:
+        metrics = json.load(f)
+    assert metrics["cross_validation"]["n_splits"] == 3
+    assert "accuracy" in metrics  # the single-split report is kept
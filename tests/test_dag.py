@@ -0,0 +1,165 @@
+from clinflow.dag import DAGRunner, Stage, file_digest
+import json
+import threading
+import pytest
+
+
+def counting_stages(tmp_path, calls):
+    # source file -> "read" -> two independent writers
+    source = tmp_path / "source.txt"
+    left, right = tmp_path / "left.txt", tmp_path / "right.txt"
+
+    def read(cfg):
+        calls.append("read")
+        return source.read_text()
+
+    def write_left(cfg, text):
+        calls.append("left")
+        left.write_text(text.upper())
+
+    def write_right(cfg, text):
+        calls.append("right")
+        right.write_text(text * cfg["repeat"])
+
+    return [
+        Stage("read", read, inputs=[source]),
+        Stage("left", write_left, deps=["read"], outputs=[left]),
+        Stage("right", write_right, deps=["read"], outputs=[right], config=["repeat"]),
+    ]
+
+
+def test_unchanged_stages_are_cached(tmp_path):
+    (tmp_path / "source.txt").write_text("abc")
+    calls = []
+    runner = DAGRunner(
+        counting_stages(tmp_path, calls), {"repeat": 2}, tmp_path / "state.json"
+    )
+
+    first = runner.run()
+    second = runner.run()
+
+    assert sorted(calls) == ["left", "read", "right"]
+    assert first["ran"] == 3 and first["cache_hits"] == 0
+    assert second["ran"] == 0 and second["cache_hits"] == 3
+    assert json.loads((tmp_path / "state.json").read_text())["last_run"] == second
+
+
+def test_changed_input_reruns_downstream(tmp_path):
+    source = tmp_path / "source.txt"
+    source.write_text("abc")
+    calls = []
+    stages = counting_stages(tmp_path, calls)
+    DAGRunner(stages, {"repeat": 2}, tmp_path / "state.json").run()
+
+    source.write_text("xyz")
+    calls.clear()
+    report = DAGRunner(stages, {"repeat": 2}, tmp_path / "state.json").run()
+
+    assert sorted(calls) == ["left", "read", "right"]
+    assert report["stages"]["left"]["reason"] == "changed"
+    assert (tmp_path / "left.txt").read_text() == "XYZ"
+
+
+def test_changed_config_reruns_only_its_stage(tmp_path):
+    (tmp_path / "source.txt").write_text("abc")
+    calls = []
+    stages = counting_stages(tmp_path, calls)
+    DAGRunner(stages, {"repeat": 2}, tmp_path / "state.json").run()
+
+    calls.clear()
+    report = DAGRunner(stages, {"repeat": 3}, tmp_path / "state.json").run()
+
+    # "read" is cached but its value is needed, so it runs on demand
+    assert sorted(calls) == ["read", "right"]
+    assert report["stages"]["read"]["reason"] == "needed by right"
+    assert report["stages"]["left"]["status"] == "cached"
+    assert (tmp_path / "right.txt").read_text() == "abc" * 3
+
+
+def test_missing_output_and_force_rerun(tmp_path):
+    (tmp_path / "source.txt").write_text("abc")
+    calls = []
+    stages = counting_stages(tmp_path, calls)
+    runner = DAGRunner(stages, {"repeat": 2}, tmp_path / "state.json")
+    runner.run()
+
+    (tmp_path / "left.txt").unlink()
+    calls.clear()
+    report = runner.run()
+    assert sorted(calls) == ["left", "read"]
+    assert report["stages"]["left"]["reason"] == "outputs missing"
+
+    calls.clear()
+    assert runner.run(force=True)["ran"] == 3
+
+
+def test_output_overwritten_outside_dag_reruns(tmp_path):
+    (tmp_path / "source.txt").write_text("abc")
+    calls = []
+    runner = DAGRunner(
+        counting_stages(tmp_path, calls), {"repeat": 2}, tmp_path / "state.json"
+    )
+    runner.run()
+
+    (tmp_path / "right.txt").write_text("stale")
+    calls.clear()
+    report = runner.run()
+    assert sorted(calls) == ["read", "right"]
+    assert report["stages"]["right"]["reason"] == "outputs changed"
+    assert (tmp_path / "right.txt").read_text() == "abcabc"
+
+    calls.clear()
+    assert runner.run()["ran"] == 0
+
+
+def test_independent_stages_run_concurrently():
+    # each branch waits for the other; run one at a time this would time out
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [
+        Stage("a", lambda cfg: barrier.wait()),
+        Stage("b", lambda cfg: barrier.wait()),
+    ]
+
+    assert DAGRunner(stages, {}, max_workers=2).run()["ran"] == 2
+
+
+def test_failed_stage_is_not_cached(tmp_path):
+    attempts = []
+
+    def flaky(cfg, value):
+        attempts.append(value)
+        if len(attempts) == 1:
+            raise RuntimeError("boom")
+
+    stages = [Stage("first", lambda cfg: 1), Stage("second", flaky, deps=["first"])]
+    runner = DAGRunner(stages, {}, tmp_path / "state.json")
+
+    with pytest.raises(RuntimeError, match="boom"):
+        runner.run()
+    state = json.loads((tmp_path / "state.json").read_text())
+    assert list(state["fingerprints"]) == ["first"]
+    assert state["last_run"]["stages"]["second"]["status"] == "failed"
+
+    report = runner.run()
+    assert report["stages"]["second"]["status"] == "ran"
+    assert attempts == [1, 1]
+
+
+def test_invalid_graphs_raise():
+    with pytest.raises(ValueError, match="unknown"):
+        DAGRunner([Stage("a", None, deps=["missing"])], {})
+    with pytest.raises(ValueError, match="cycle"):
+        DAGRunner([Stage("a", None, deps=["b"]), Stage("b", None, deps=["a"])], {})
+    with pytest.raises(ValueError, match="Duplicate"):
+        DAGRunner([Stage("a", None), Stage("a", None)], {})
+
+
+def test_file_digest(tmp_path):
+    path = tmp_path / "data.bin"
+    path.write_bytes(b"x" * 10)
+
+    before = file_digest(path)
+    assert before == file_digest(path)
+    assert file_digest(tmp_path / "absent") is None
+    path.write_bytes(b"y" * 11)
+    assert file_digest(path) != before
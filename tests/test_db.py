@@ -0,0 +1,147 @@
+from clinflow.config import get_config
+from clinflow.data.db import (
+    ConnectionPool,
+    bulk_write,
+    close_pools,
+    connect,
+    get_pool,
+)
+from clinflow.data.query import query_patients
+from clinflow.data.to_sqlite import write_to_SQL_db
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+import pytest
+import sqlite3
+
+df = pd.DataFrame(
+    {
+        "age": [45, 65, 70],
+        "chol": [180, 250, 300],
+        "exang": [0, 1, 1],
+        "target": [0, 1, 0],
+    }
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    write_to_SQL_db(df, cfg)
+    yield cfg
+    close_pools()
+
+
+def test_pool_reuses_connections(cfg):
+    pool = get_pool(cfg)
+    assert get_pool(cfg) is pool
+
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        assert second is first
+
+
+def test_pool_is_bounded(tmp_path):
+    pool = ConnectionPool(tmp_path / "test.db", size=2)
+
+    def borrow(_):
+        with pool.connection() as con:
+            return id(con)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        ids = set(executor.map(borrow, range(100)))
+    assert len(ids) <= 2
+    pool.close()
+
+
+def test_waiting_caller_fails_when_pool_closes(tmp_path):
+    pool = ConnectionPool(tmp_path / "test.db", size=1)
+
+    def borrow():
+        with pool.connection():
+            pass
+
+    with pool.connection(), ThreadPoolExecutor(max_workers=1) as executor:
+        waiting = executor.submit(borrow)  # blocks: the only connection is taken
+        pool.close()
+        with pytest.raises(RuntimeError, match="closed"):
+            waiting.result(timeout=5)
+
+
+def test_connections_are_tuned(cfg):
+    with connect(cfg, readonly=False) as con:
+        assert con.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert con.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+
+    with connect(cfg) as con:
+        assert con.execute("PRAGMA query_only").fetchone()[0] == 1
+        with pytest.raises(sqlite3.OperationalError):
+            con.execute("DELETE FROM patients")
+
+
+def test_query_patients_concurrent_readers(cfg):
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(
+            executor.map(lambda _: query_patients("high_risk_seniors", cfg), range(20))
+        )
+    assert all(r["age"].tolist() == [65] for r in results)
+
+
+def test_readers_see_rewritten_database(cfg, tmp_path):
+    assert len(query_patients("all", cfg)) == 3
+
+    # rewriting the table in place and replacing the file are both picked up
+    write_to_SQL_db(df.head(2), cfg)
+    assert len(query_patients("all", cfg)) == 2
+
+    (tmp_path / "test.db").unlink()
+    write_to_SQL_db(df.head(1), cfg)
+    assert len(query_patients("all", cfg)) == 1
+
+
+def test_bulk_write_explicit_types_and_values(tmp_path):
+    frame = pd.DataFrame(
+        {
+            "age": pd.Series([50, 60, 70], dtype="int16"),
+            "oldpeak": [1.5, 0.0, 2.3],
+            "thal": pd.Series([3, 6, 7], dtype="int8").astype("category"),
+            "note": ["a", "b", None],
+        }
+    )
+    with sqlite3.connect(tmp_path / "test.db") as con:
+        assert bulk_write(frame, "patients", con, batch_size=2) == 3
+        types = {r[1]: r[2] for r in con.execute("PRAGMA table_info(patients)")}
+        rows = con.execute("SELECT * FROM patients").fetchall()
+
+    assert types == {
+        "age": "INTEGER",
+        "oldpeak": "REAL",
+        "thal": "INTEGER",
+        "note": "TEXT",
+    }
+    assert rows == [(50, 1.5, 3, "a"), (60, 0.0, 6, "b"), (70, 2.3, 7, None)]
+
+
+def test_bulk_write_if_exists(tmp_path):
+    frame = pd.DataFrame({"age": [50, 60]})
+    with sqlite3.connect(tmp_path / "test.db") as con:
+        bulk_write(frame, "patients", con)
+        bulk_write(frame, "patients", con, if_exists="append")
+        assert con.execute("SELECT COUNT(*) FROM patients").fetchone()[0] == 4
+        bulk_write(frame, "patients", con)
+        assert con.execute("SELECT COUNT(*) FROM patients").fetchone()[0] == 2
+        with pytest.raises(ValueError, match="already exists"):
+            bulk_write(frame, "patients", con, if_exists="fail")
+
+
+def test_bulk_write_replace_is_atomic(tmp_path):
+    with sqlite3.connect(tmp_path / "test.db") as con:
+        bulk_write(pd.DataFrame({"age": [50, 60]}), "patients", con)
+        # objects sqlite3 cannot bind fail the load part-way through
+        bad = pd.DataFrame({"age": [1, 2, 3, object()]})
+        with pytest.raises(sqlite3.ProgrammingError):
+            bulk_write(bad, "patients", con, batch_size=2, synchronous="off")
+
+        assert con.execute("SELECT age FROM patients").fetchall() == [(50,), (60,)]
+        assert con.execute("PRAGMA synchronous").fetchone()[0] == 2  # FULL
@@ -0,0 +1,122 @@
+from clinflow.config import get_config
+from clinflow.data.db import close_pools
+from clinflow.data.query_cache import clear_query_caches
+from clinflow.data.storage import write_dataset
+from clinflow.data.to_sqlite import write_to_SQL_db
+from clinflow.models.incremental import chunk_source, train_model_incremental
+from clinflow.models.io import load_model, save_model
+from clinflow.models.kernel import KernelScorer
+from clinflow.models.train import train_model
+from sklearn.metrics import accuracy_score
+import numpy as np
+import pandas as pd
+import pytest
+
+cfg = get_config().to_dict()
+
+
+def make_patients(n, seed=0):
+    # features with a known logistic relationship to the target
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(29, 78, n),
+            "sex": rng.integers(0, 2, n),
+            "cp": rng.integers(1, 5, n),
+            "trestbps": rng.integers(94, 200, n),
+            "chol": rng.integers(126, 565, n),
+            "fbs": rng.integers(0, 2, n),
+            "restecg": rng.integers(0, 3, n),
+            "thalach": rng.integers(71, 202, n),
+            "ca": rng.integers(0, 4, n),
+            "thal": rng.choice([3, 6, 7], n),
+        }
+    )
+    logit = (
+        0.08 * (df["age"] - 54)
+        - 0.04 * (df["thalach"] - 150)
+        + 0.9 * (df["cp"] == 4)
+        + 0.7 * df["ca"]
+        - 1.2
+    )
+    df["target"] = (rng.random(n) < 1 / (1 + np.exp(-logit))).astype(int)
+    return df
+
+
+df = make_patients(20_000)
+
+
+def frame_source(frame, chunksize):
+    return lambda: (
+        frame.iloc[i : i + chunksize] for i in range(0, len(frame), chunksize)
+    )
+
+
+def test_accuracy_parity_with_in_memory_model():
+    model = train_model_incremental(frame_source(df, 2_000), cfg)
+    baseline = train_model(df, cfg)
+    baseline_accuracy = accuracy_score(baseline["y_test"], baseline["y_pred"])
+
+    assert model["accuracy"] == pytest.approx(baseline_accuracy, abs=0.02)
+    assert accuracy_score(model["y_test"], model["y_pred"]) == model["accuracy"]
+    assert len(model["y_test"]) == pytest.approx(0.2 * len(df), rel=0.05)
+
+
+def test_scaler_statistics_cover_all_training_rows():
+    model = train_model_incremental(frame_source(df, 3_000), cfg, epochs=1)
+    preprocessor = model["pipeline"].named_steps["preprocessor"]
+    scaler = preprocessor.named_transformers_["num"].named_steps["scaler"]
+    numerical = cfg["model_training"]["numerical_features"]
+
+    assert scaler.n_samples_seen_ == len(df) - len(model["y_test"])
+    # within a few percent of the full-data mean (the held-out rows differ)
+    np.testing.assert_allclose(scaler.mean_, df[numerical].mean(), rtol=0.02)
+
+
+def test_unseen_categories_are_ignored():
+    model = train_model_incremental(frame_source(df, 5_000), cfg, epochs=1)
+    unseen = df.head(5).assign(thal=99)
+    assert len(model["pipeline"].predict(unseen)) == 5
+
+
+def test_pipeline_compatible_with_io_and_kernel(tmp_path):
+    model = train_model_incremental(frame_source(df, 5_000), cfg, epochs=2)
+    path = save_model(model, tmp_path / "model.joblib", cfg)
+    pipeline = load_model(path)
+
+    sample = df.head(100)
+    np.testing.assert_allclose(
+        KernelScorer.from_pipeline(pipeline).predict_proba(sample)[:, 1],
+        pipeline.predict_proba(sample)[:, 1],
+        rtol=1e-9,
+    )
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet", ".arrow"])
+def test_chunk_source_files(tmp_path, suffix):
+    path = write_dataset(df.head(1_000), tmp_path / f"clean{suffix}")
+    source = chunk_source(cfg, filepath=path, chunksize=300)
+    chunks = list(source())
+
+    assert [len(c) for c in chunks] == [300, 300, 300, 100]
+    assert set(chunks[0].columns) <= set(df.columns)
+    assert len(list(source())) == 4  # every call starts a new pass
+
+
+def test_chunk_source_database(tmp_path):
+    db_cfg = get_config().to_dict()
+    db_cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    write_to_SQL_db(df.head(1_000), db_cfg)
+    try:
+        model = train_model_incremental(
+            chunk_source(db_cfg, preset="all", chunksize=250), db_cfg, epochs=1
+        )
+    finally:
+        close_pools()
+        clear_query_caches()
+    assert len(model["y_test"]) > 0
+
+
+def test_empty_source_rejected():
+    with pytest.raises(ValueError, match="No training rows"):
+        train_model_incremental(lambda: iter([]), cfg)
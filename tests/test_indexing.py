@@ -0,0 +1,103 @@
+from clinflow.config import get_config
+from clinflow.data.db import close_pools, connect
+from clinflow.data.indexing import (
+    advise_indexes,
+    build_indexes,
+    create_indexes,
+    estimate_selectivity,
+    index_coverage,
+)
+from clinflow.data.query import QUERY_SPECS, query_patients
+from clinflow.data.to_sqlite import write_to_SQL_db
+import numpy as np
+import pandas as pd
+import pytest
+
+rng = np.random.default_rng(0)
+df = pd.DataFrame(
+    {
+        "age": rng.integers(29, 78, 1000),
+        "chol": rng.integers(126, 565, 1000),
+        "exang": rng.integers(0, 2, 1000),
+        "target": rng.integers(0, 2, 1000),
+    }
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    # the presets match 20-50% of these rows; index them regardless
+    cfg["database"]["index_max_selectivity"] = 1.0
+    yield cfg
+    close_pools()
+
+
+def test_advise_indexes_orders_equality_before_range():
+    specs = {
+        "a": {"age": {"min": 60}, "target": {"equals": 1}},
+        "b": {"target": {"equals": 1}},
+        "c": {"chol": {"max": 200}},
+    }
+    indexes = advise_indexes(specs)
+
+    assert [ix["columns"] for ix in indexes] == [["target", "age"], ["chol"]]
+    # "b" reuses the (target, age) index through its prefix
+    assert indexes[0]["presets"] == ["a", "b"]
+    assert indexes[0]["name"] == "idx_patients_target_age"
+
+
+def test_every_preset_index_covered(cfg):
+    cfg["database"]["auto_index"] = False
+    write_to_SQL_db(df, cfg)
+    with connect(cfg) as con:
+        assert all(r["index"] is None for r in index_coverage(con).values())
+
+    coverage = build_indexes(cfg)
+
+    assert set(coverage) == set(QUERY_SPECS)
+    advised = {ix["name"] for ix in advise_indexes()}
+    assert all(r["index"] in advised for r in coverage.values())
+
+
+def test_write_to_sql_db_rebuilds_indexes(cfg):
+    cfg["database"]["auto_index"] = True
+    for _ in range(2):  # replacing the table drops its indexes
+        write_to_SQL_db(df, cfg)
+        with connect(cfg) as con:
+            assert all(r["index"] for r in index_coverage(con).values())
+
+    # results are unchanged by the indexes
+    expected = df[(df["age"] >= 60) & (df["target"] == 1)]
+    assert len(query_patients("high_risk_seniors", cfg)) == len(expected)
+
+
+def test_create_indexes_skips_missing_columns(cfg):
+    write_to_SQL_db(df.drop(columns="exang"), cfg)
+    with connect(cfg, readonly=False) as con:
+        created = create_indexes(con, advise_indexes())
+    assert "idx_patients_exang" not in created
+    assert "idx_patients_target_age" in created
+
+
+def test_unselective_presets_left_to_full_scans(cfg):
+    cfg["database"]["index_max_selectivity"] = 0.1
+    specs = {
+        "rare": {"target": {"equals": 1}, "age": {"min": 77}},
+        "common": {"exang": {"equals": 1}},
+    }
+    write_to_SQL_db(df, cfg)
+    coverage = build_indexes(cfg, specs=specs)
+
+    assert coverage["rare"]["selectivity"] < 0.1
+    assert coverage["rare"]["index"] == "idx_patients_target_age"
+    assert coverage["common"]["selectivity"] > 0.1
+    assert coverage["common"]["index"] is None
+
+
+def test_estimate_selectivity(cfg):
+    write_to_SQL_db(df, cfg)
+    with connect(cfg) as con:
+        fraction = estimate_selectivity(con, {"exang": {"equals": 1}})
+    assert fraction == pytest.approx(df["exang"].mean())
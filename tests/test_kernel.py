@@ -0,0 +1,59 @@
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.models.kernel import KernelScorer, export_kernel, save_kernel, load_kernel
+from clinflow.models.train import train_model
+from pathlib import Path
+from sklearn.base import clone
+from sklearn.linear_model import SGDClassifier
+import numpy as np
+import pytest
+
+cfg = get_config()
+
+clean_data_path = (
+    Path(cfg["paths"]["processed_data"]["folder"])
+    / cfg["paths"]["processed_data"]["file"]
+)
+df = load_dataset(clean_data_path)
+pipeline = train_model(df, cfg)["pipeline"]
+scorer = KernelScorer.from_pipeline(pipeline)
+
+
+def test_matches_pipeline_on_dataframe():
+    expected = pipeline.predict_proba(df)
+    np.testing.assert_allclose(
+        scorer.predict_proba(df), expected, rtol=1e-10, atol=1e-12
+    )
+    assert np.array_equal(scorer.predict(df), pipeline.predict(df))
+
+
+def test_accepts_float_and_structured_arrays():
+    expected = pipeline.predict_proba(df)
+
+    X = df[scorer.features].to_numpy(dtype=float)
+    np.testing.assert_allclose(scorer.predict_proba(X), expected, rtol=1e-10)
+
+    records = df[scorer.features].to_records(index=False)
+    np.testing.assert_allclose(scorer.predict_proba(records), expected, rtol=1e-10)
+
+
+def test_unknown_category_raises():
+    X = df[scorer.features].to_numpy(dtype=float)[:1].copy()
+    X[0, -1] = 99.0  # last column is a categorical feature
+    with pytest.raises(ValueError, match="unknown categories"):
+        scorer.predict_proba(X)
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    path = save_kernel(export_kernel(pipeline), tmp_path / "kernel.npz")
+    reloaded = KernelScorer(load_kernel(path))
+    np.testing.assert_array_equal(reloaded.predict_proba(df), scorer.predict_proba(df))
+
+
+def test_rejects_non_logistic_classifier():
+    training = cfg["model_training"]
+    features = [*training["numerical_features"], *training["categorical_features"]]
+    hinge = clone(pipeline).set_params(classifier=SGDClassifier(loss="hinge"))
+    hinge.fit(df[features], df[training["target_column_name"]])
+    with pytest.raises(ValueError, match="LogisticRegression or SGDClassifier"):
+        export_kernel(hinge)
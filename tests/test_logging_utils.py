@@ -0,0 +1,83 @@
+from clinflow.config import get_config
+from clinflow import logging_utils
+from clinflow.logging_utils import get_logger, stop_logging, BatchedFileHandler
+import logging
+import time
+
+
+def write_config(tmp_path, mode, levels="{}"):
+    path = tmp_path / "config.yml"
+    path.write_text(
+        "paths:\n"
+        "  logging:\n"
+        f"    folder: '{tmp_path}/'\n"
+        "    file: 'test.log'\n"
+        "logging:\n"
+        f"  mode: '{mode}'\n"
+        "  level: 'DEBUG'\n"
+        f"  levels: {levels}\n"
+    )
+    return get_config(path)
+
+
+def test_queue_mode_writes_log_file(tmp_path):
+    cfg = write_config(tmp_path, "queue")
+    logger = get_logger("test_logging.queue", cfg)
+    logger.info("queued %s", "message")
+
+    # stopping the listener drains the queue and flushes the batch
+    stop_logging()
+    assert "queued message" in (tmp_path / "test.log").read_text()
+
+
+def test_per_module_levels(tmp_path):
+    cfg = write_config(tmp_path, "sync", levels="{'test_logging.quiet': 'WARNING'}")
+    assert get_logger("test_logging.quiet.child", cfg).level == logging.WARNING
+    assert get_logger("test_logging.loud", cfg).level == logging.DEBUG
+
+
+def test_batched_file_handler_buffers(tmp_path):
+    path = tmp_path / "batched.log"
+    handler = BatchedFileHandler(path, batch_size=3, flush_interval=60, delay=True)
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "line", None, None)
+
+    handler.handle(record)
+    handler.handle(record)
+    assert not path.exists()
+
+    handler.handle(record)
+    assert path.read_text().count("line") == 3
+    handler.close()
+
+
+def test_batched_file_handler_flushes_when_quiet(tmp_path):
+    path = tmp_path / "batched.log"
+    handler = BatchedFileHandler(path, batch_size=100, flush_interval=0.05, delay=True)
+    record = logging.LogRecord("x", logging.INFO, __file__, 1, "line", None, None)
+
+    handler.handle(record)
+    assert not path.exists()
+    for _ in range(100):  # no further records: the timer flushes the buffer
+        if path.exists():
+            break
+        time.sleep(0.02)
+    assert path.read_text().count("line") == 1
+    handler.close()
+
+
+def test_stop_logging_detaches_queue_handlers(tmp_path, monkeypatch):
+    registered = []
+    monkeypatch.setattr(logging_utils, "_ATEXIT_REGISTERED", False)
+    monkeypatch.setattr(logging_utils.atexit, "register", registered.append)
+    cfg = write_config(tmp_path, "queue")
+
+    logger = get_logger("test_logging.detach", cfg)
+    stop_logging()
+    assert logger.handlers == []  # nothing left to fill an undrained queue
+
+    # the next get_logger() restarts the listener; atexit is hooked only once
+    logger = get_logger("test_logging.detach", cfg)
+    logger.info("after restart")
+    stop_logging()
+    assert "after restart" in (tmp_path / "test.log").read_text()
+    assert registered == [stop_logging]
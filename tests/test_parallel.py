@@ -0,0 +1,130 @@
+from clinflow.config import get_config
+from clinflow.data.clean import clean_data, validate_data
+from clinflow.data.cleaning import CleaningEngine
+from clinflow.data.parallel import (
+    clean_partitioned,
+    partition_rows,
+    plan_partitions,
+    validate_partitioned,
+)
+from clinflow.data.validation import ValidationEngine
+import numpy as np
+import pandas as pd
+import pytest
+
+cfg = get_config().to_dict()
+
+
+def raw_frame(n=1000, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        {
+            "age": rng.integers(29, 78, n),
+            "sex": rng.integers(0, 2, n),
+            "cp": rng.integers(1, 5, n),
+            "trestbps": rng.integers(94, 200, n),
+            "chol": rng.integers(126, 565, n).astype(float),
+            "fbs": rng.integers(0, 2, n),
+            "restecg": rng.integers(0, 3, n),
+            "thalach": rng.integers(71, 203, n),
+            "exang": rng.integers(0, 2, n),
+            "oldpeak": rng.uniform(0, 6.2, n).round(1),
+            "slope": rng.integers(1, 4, n),
+            "ca": rng.integers(0, 4, n).astype(str).astype(object),
+            "thal": rng.choice([3.0, 6.0, 7.0], n),
+            "num": rng.integers(0, 5, n),
+        }
+    )
+    df.loc[[3, n // 2, n - 2], "chol"] = np.nan
+    df.loc[[10, 11, n * 2 // 3], "ca"] = "?"  # coerced to NaN
+    return df
+
+
+def with_parallel(n_jobs, backend="thread", min_rows=100, strategy="drop"):
+    parallel_cfg = get_config().to_dict()
+    parallel_cfg["missing_value_strategy"] = strategy
+    parallel_cfg["parallel"] = {
+        "n_jobs": n_jobs,
+        "backend": backend,
+        "min_rows_per_partition": min_rows,
+    }
+    return parallel_cfg
+
+
+def test_partition_rows_covers_every_row_in_order():
+    df = raw_frame(103)
+    parts = partition_rows(df, 4)
+
+    assert len(parts) == 4
+    assert pd.concat(parts).index.equals(df.index)
+    assert max(len(p) for p in parts) - min(len(p) for p in parts) <= 1
+    assert len(partition_rows(df.head(2), 8)) == 2
+
+
+def test_plan_partitions_respects_workers_and_block_size():
+    df = raw_frame(1000)
+
+    assert plan_partitions(df, cfg) == 1  # default config is serial
+    assert plan_partitions(df, with_parallel(4, min_rows=100)) == 4
+    assert plan_partitions(df, with_parallel(16, min_rows=300)) == 3
+    assert plan_partitions(df, with_parallel(4, min_rows=5000)) == 1
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+@pytest.mark.parametrize("strategy", ["drop", "keep"])
+def test_clean_partitioned_matches_serial(backend, strategy):
+    df = raw_frame()
+    parallel_cfg = with_parallel(4, backend, strategy=strategy)
+
+    expected, expected_report = CleaningEngine(parallel_cfg).run(df)
+    clean, report = clean_partitioned(df, parallel_cfg)
+
+    pd.testing.assert_frame_equal(clean, expected)
+    assert report == expected_report
+    assert list(report["coerced"]) == list(expected_report["coerced"])
+
+
+def test_clean_partitioned_is_deterministic():
+    df = raw_frame()
+    parallel_cfg = with_parallel(8)
+
+    first = clean_partitioned(df, parallel_cfg)
+    second = clean_partitioned(df, parallel_cfg)
+
+    pd.testing.assert_frame_equal(first[0], second[0])
+    assert first[1] == second[1]
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_validate_partitioned_matches_serial(backend):
+    df = clean_data(raw_frame(), cfg)
+    df.loc[df.index[[5, 700]], "age"] = 200
+    df.loc[df.index[[900]], "chol"] = np.nan
+    df.loc[df.index[[50, 850]], "target"] = 2
+    parallel_cfg = with_parallel(4, backend)
+
+    expected = ValidationEngine(parallel_cfg).run(df)
+    report = validate_partitioned(df, parallel_cfg)
+
+    assert report == expected
+    assert [(v["column"], v["rule"]) for v in report["violations"]] == [
+        ("chol", "missing"),
+        ("ca", "missing"),
+        ("target", "target_binary"),
+        ("age", "range"),
+    ]
+
+
+def test_clean_and_validate_data_use_parallel_config():
+    parallel_cfg = with_parallel(4)
+    raw = raw_frame()
+    raw["ca"] = raw["ca"].replace("?", "0")
+    clean, report = clean_data(raw, parallel_cfg, return_report=True)
+
+    assert report["rows_dropped"] == 3
+    assert validate_data(clean, parallel_cfg)["violations"] == []
+
+
+def test_unknown_backend_raises():
+    with pytest.raises(ValueError, match="Unknown backend"):
+        clean_partitioned(raw_frame(), with_parallel(2, backend="gpu"))
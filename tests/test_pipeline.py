@@ -1,6 +1,12 @@
 import pandas as pd
+import pytest
+import sqlite3
 from pathlib import Path
-from clinflow.pipeline import run_data_pipeline
+from clinflow.pipeline import (
+    run_dag_pipeline,
+    run_data_pipeline,
+    run_streaming_pipeline,
+)
 from clinflow.config import load_config
 
 def test_csv_exists():
@@ -29,4 +35,119 @@ def test_db_exists():
     # check if clinflow db exists after running the pipeline
     database_path = Path("data/clinflow.db")
     if database_path.exists() == False:
-        raise FileNotFoundError(f"File: {database_path} could not be opened or does not exist")
\ No newline at end of file
+        raise FileNotFoundError(f"File: {database_path} could not be opened or does not exist")
+
+def streaming_config(tmp_path):
+    # copy of the config with outputs redirected to tmp_path
+    cfg = load_config()
+    cfg["paths"]["processed_data"] = {
+        "folder": f"{tmp_path}/",
+        "file": "clean.csv",
+        "formats": ["parquet"],
+    }
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "clinflow.db"}
+    cfg["artifacts"]["folder"] = f"{tmp_path}/artifacts/"
+    return cfg
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    cfg = streaming_config(tmp_path)
+    run_data_pipeline(cfg)
+    expected = pd.read_csv(tmp_path / "clean.csv")
+
+    report = run_streaming_pipeline(cfg, chunksize=40)
+    streamed = pd.read_csv(tmp_path / "clean.csv")
+
+    assert report["rows"] == len(expected)
+    assert report["cleaning"]["rows_out"] == len(expected)
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(
+        pd.read_parquet(tmp_path / "clean.parquet"),
+        expected.drop(columns="Unnamed: 0"),
+        check_dtype=False,
+    )
+    with sqlite3.connect(tmp_path / "clinflow.db") as con:
+        assert con.execute("SELECT COUNT(*) FROM patients").fetchone()[0] == len(expected)
+
+
+def test_streaming_failure_keeps_previous_outputs(tmp_path):
+    cfg = streaming_config(tmp_path)
+    run_streaming_pipeline(cfg, chunksize=40)
+    before = (tmp_path / "clean.csv").read_text()
+
+    # the merged row count is checked after the last chunk
+    cfg["minimum_rows"] = 10**6
+    with pytest.raises(ValueError, match="Less than"):
+        run_streaming_pipeline(cfg, chunksize=40)
+
+    assert (tmp_path / "clean.csv").read_text() == before
+    assert not (tmp_path / "clean.csv.partial").exists()
+    with sqlite3.connect(tmp_path / "clinflow.db") as con:
+        tables = {
+            r[0]
+            for r in con.execute(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%'"
+            )
+        }
+    assert tables == {"patients"}
+
+
+def test_dag_pipeline_skips_unchanged_stages(tmp_path):
+    cfg = streaming_config(tmp_path)
+    cfg["paths"]["dag_state"] = {"folder": f"{tmp_path}/", "file": "dag_state.json"}
+    cfg["model_training"]["path_to_results"] = {
+        "directory": f"{tmp_path}/results/",
+        "file": "metrics.json",
+    }
+    cfg["model_training"]["path_to_model"] = {
+        "directory": f"{tmp_path}/models/",
+        "file": "model.joblib",
+    }
+
+    first = run_dag_pipeline(cfg, train=True)
+    assert first["ran"] == 9
+    assert (tmp_path / "clean.parquet").exists()
+    assert (tmp_path / "models" / "model.joblib").exists()
+
+    second = run_dag_pipeline(cfg, train=True)
+    assert second["ran"] == 0 and second["cache_hits"] == 9
+
+    # only the SQLite load depends on the database settings
+    cfg["database"]["bulk_load"]["batch_size"] = 50
+    third = run_dag_pipeline(cfg, train=True)
+    statuses = {name: stage["status"] for name, stage in third["stages"].items()}
+    assert statuses["persist_sqlite"] == "ran"
+    assert statuses["persist_csv"] == statuses["train"] == "cached"
+    with sqlite3.connect(tmp_path / "clinflow.db") as con:
+        count = con.execute("SELECT COUNT(*) FROM patients").fetchone()[0]
+    assert count == len(pd.read_csv(tmp_path / "clean.csv"))
+
+
+def test_data_pipeline_reuses_cached_artifact(tmp_path):
+    cfg = streaming_config(tmp_path)
+    run_data_pipeline(cfg)
+    outputs = [tmp_path / name for name in ("clean.csv", "clean.parquet", "clinflow.db")]
+    stamps = [path.stat().st_mtime_ns for path in outputs]
+
+    # same raw file and settings: nothing is recomputed or rewritten
+    run_data_pipeline(cfg)
+    assert [path.stat().st_mtime_ns for path in outputs] == stamps
+
+    # a deleted output is rewritten from the cached frame
+    (tmp_path / "clean.parquet").unlink()
+    run_data_pipeline(cfg)
+    assert (tmp_path / "clean.parquet").exists()
+    assert (tmp_path / "clean.csv").stat().st_mtime_ns != stamps[0]
+    assert len(list((tmp_path / "artifacts").glob("*.parquet"))) == 1
+
+    # new database settings are applied even though the cleaned data is cached
+    stamp = (tmp_path / "clinflow.db").stat().st_mtime_ns
+    cfg["database"]["auto_index"] = False
+    run_data_pipeline(cfg)
+    assert (tmp_path / "clinflow.db").stat().st_mtime_ns != stamp
+    with sqlite3.connect(tmp_path / "clinflow.db") as con:
+        indexes = con.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index'"
+        ).fetchall()
+    assert indexes == []
@@ -0,0 +1,96 @@
+from clinflow.config import get_config
+from clinflow.profiling import (
+    configure_profiling,
+    disable_profiling,
+    enable_profiling,
+    profiled,
+    profiling_enabled,
+    save_profile,
+    span,
+)
+import json
+import pytest
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["model_training"]["path_to_results"]["directory"] = f"{tmp_path}/"
+    yield cfg
+    disable_profiling()
+
+
+def busy(n=20000):
+    return sum(i * i for i in range(n))
+
+
+def test_disabled_spans_are_no_ops():
+    assert not profiling_enabled()
+    with span("clean", rows=10) as step:
+        step.set_rows(20)
+    assert save_profile() is None
+
+
+def test_spans_nest_and_record_rows(cfg):
+    profile = enable_profiling(cfg)
+    with span("pipeline"):
+        with span("clean", rows=100):
+            busy()
+        with span("validate") as step:
+            step.set_rows(50)
+
+    report = profile.report()
+    assert [s["path"] for s in report["spans"]] == [
+        "pipeline/clean",
+        "pipeline/validate",
+        "pipeline",
+    ]
+    clean = report["stages"]["pipeline/clean"]
+    assert clean["calls"] == 1
+    assert clean["rows"] == 100
+    assert clean["wall_seconds"] > 0
+    assert clean["cpu_seconds"] >= 0
+    assert clean["rows_per_second"] == pytest.approx(100 / clean["wall_seconds"])
+    assert report["stages"]["pipeline/validate"]["rows"] == 50
+    assert report["stages"]["pipeline"]["rows"] is None
+
+
+def test_decorator_records_each_call(cfg):
+    @profiled(rows=lambda result, items: len(items))
+    def double(items):
+        return [2 * x for x in items]
+
+    profile = enable_profiling(cfg)
+    assert double([1, 2, 3]) == [2, 4, 6]
+    double([4])
+
+    stage = profile.report()["stages"]["double"]
+    assert stage["calls"] == 2
+    assert stage["rows"] == 4
+
+
+def test_save_profile_writes_json_next_to_metrics(cfg, tmp_path):
+    assert configure_profiling(cfg) is None  # profiling.enabled is false
+    configure_profiling(cfg, enabled=True)
+    with span("train", rows=7):
+        busy()
+
+    path = save_profile(cfg)
+
+    assert path == tmp_path / "profile.json"
+    stage = json.loads(path.read_text())["stages"]["train"]
+    assert stage["rows"] == 7
+    assert stage["peak_rss_mb"] > 0
+
+
+def test_chosen_span_is_profiled(cfg, tmp_path):
+    configure_profiling(cfg, profile_spans=["fit"])
+    with span("train"):
+        with span("fit"):
+            busy()
+        with span("evaluate"):
+            busy()
+
+    assert (tmp_path / "profile_train.fit.prof").exists()
+    assert "busy" in (tmp_path / "profile_train.fit.txt").read_text()
+    assert not list(tmp_path.glob("profile_train.evaluate.*"))
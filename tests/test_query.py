@@ -0,0 +1,194 @@
+from clinflow.config import get_config
+from clinflow.data.db import close_pools
+from clinflow.data.query import (
+    QUERY_SPECS,
+    build_where_clause,
+    compile_query,
+    filter_columns,
+    iter_patients,
+    query_patients,
+)
+from clinflow.data.to_sqlite import write_to_SQL_db
+import numpy as np
+import pandas as pd
+import pytest
+import tracemalloc
+
+rng = np.random.default_rng(0)
+df = pd.DataFrame(
+    {
+        "age": rng.integers(29, 78, 500),
+        "chol": rng.integers(126, 565, 500),
+        "cp": rng.integers(1, 5, 500),
+        "exang": rng.integers(0, 2, 500),
+        "target": rng.integers(0, 2, 500),
+    }
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    cfg["database"]["auto_index"] = False
+    write_to_SQL_db(df, cfg)
+    yield cfg
+    close_pools()
+
+
+def test_simple_specs_unchanged():
+    spec = {"age": {"min": 60}, "chol": {"max": 200}}
+    where_clause, params = build_where_clause(spec)
+    assert where_clause == "age >= ? AND chol <= ?"
+    assert params == [60, 200]
+    assert build_where_clause({}) == ("", [])
+
+
+@pytest.mark.parametrize(
+    "spec, expected",
+    [
+        (QUERY_SPECS["high_risk_seniors"], (df["age"] >= 60) & (df["target"] == 1)),
+        ({"cp": {"in": [1, 4]}}, df["cp"].isin([1, 4])),
+        ({"cp": {"not_in": [1, 4]}}, ~df["cp"].isin([1, 4])),
+        ({"cp": {"in": []}}, df["cp"] != df["cp"]),
+        ({"age": {"between": [40, 50]}}, df["age"].between(40, 50)),
+        ({"exang": {"not_equals": 1}}, df["exang"] != 1),
+        (
+            {
+                "or": [
+                    {"age": {"max": 35}},
+                    {"chol": {"min": 400}, "target": {"equals": 1}},
+                ]
+            },
+            (df["age"] <= 35) | ((df["chol"] >= 400) & (df["target"] == 1)),
+        ),
+        (
+            {"not": {"or": [{"cp": {"equals": 4}}, {"exang": {"equals": 1}}]}},
+            ~((df["cp"] == 4) | (df["exang"] == 1)),
+        ),
+        (
+            {
+                "and": [{"age": {"min": 50}}, {"or": [{"cp": {"in": [2, 3]}}]}],
+                "target": {"equals": 0},
+            },
+            (df["age"] >= 50) & df["cp"].isin([2, 3]) & (df["target"] == 0),
+        ),
+    ],
+)
+def test_query_matches_pandas_filter(cfg, spec, expected):
+    result = query_patients(spec, cfg)
+    pd.testing.assert_frame_equal(
+        result, df[expected].reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_projection_order_and_paging(cfg):
+    result = query_patients(
+        {"target": {"equals": 1}},
+        cfg,
+        columns=["age", "chol"],
+        order_by=["-age", "chol"],
+        limit=10,
+        offset=5,
+    )
+    expected = (
+        df[df["target"] == 1][["age", "chol"]]
+        .sort_values(["age", "chol"], ascending=[False, True], kind="stable")
+        .iloc[5:15]
+        .reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_compile_query():
+    query, params = compile_query(
+        {"age": {"min": 60}}, columns=["age", "target"], order_by=["-age"], limit=10
+    )
+    assert query == (
+        "SELECT age, target FROM patients WHERE age >= ? ORDER BY age DESC LIMIT ?"
+    )
+    assert params == [60, 10]
+    assert compile_query({}, offset=3) == (
+        "SELECT * FROM patients LIMIT ? OFFSET ?",
+        [-1, 3],
+    )
+
+
+@pytest.mark.parametrize(
+    "spec",
+    [
+        {"age; DROP TABLE patients": {"min": 1}},
+        {"age": {"like": "4%"}},
+    ],
+)
+def test_invalid_specs_rejected(spec):
+    with pytest.raises(ValueError):
+        build_where_clause(spec)
+
+
+def test_invalid_projection_rejected():
+    with pytest.raises(ValueError):
+        compile_query({}, columns=["age, (SELECT 1)"])
+
+
+def test_filter_columns():
+    spec = {
+        "age": {"between": [40, 60]},
+        "cp": {"in": [1, 2]},
+        "and": [{"target": {"equals": 1}}],
+        "or": [{"chol": {"min": 300}}],
+    }
+    assert filter_columns(spec) == (["cp", "target"], ["age"])
+
+
+def test_iter_patients_matches_query(cfg):
+    spec = {"age": {"min": 50}}
+    chunks = list(iter_patients(spec, cfg, chunksize=64))
+
+    assert all(len(chunk) == 64 for chunk in chunks[:-1])
+    assert 0 < len(chunks[-1]) <= 64
+    # indices continue across chunks, like load.iter_dataset()
+    pd.testing.assert_frame_equal(
+        pd.concat(chunks), query_patients(spec, cfg, use_cache=False)
+    )
+
+
+def test_iter_patients_numpy(cfg):
+    columns = ["age", "target"]
+    chunks = list(
+        iter_patients("all", cfg, chunksize=200, columns=columns, as_numpy=True)
+    )
+
+    assert [chunk.shape for chunk in chunks] == [(200, 2), (200, 2), (100, 2)]
+    np.testing.assert_array_equal(np.vstack(chunks), df[columns].to_numpy())
+
+
+def test_iter_patients_releases_connection_when_closed(cfg):
+    cfg["database"]["pool_size"] = 1
+    stream = iter_patients("all", cfg, chunksize=10)
+    next(stream)
+    stream.close()
+    # the single pooled connection is free again
+    assert len(query_patients("all", cfg, use_cache=False)) == len(df)
+
+
+def test_iter_patients_memory_is_flat(tmp_path):
+    def peak(rows):
+        cfg = get_config().to_dict()
+        cfg["paths"]["database_path"] = {
+            "folder": f"{tmp_path}/{rows}/",
+            "file": "test.db",
+        }
+        big = pd.DataFrame({"age": np.arange(rows), "target": np.arange(rows) % 2})
+        write_to_SQL_db(big, cfg)
+        tracemalloc.start()
+        for _ in iter_patients("all", cfg, chunksize=1000):
+            pass
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        return peak
+
+    try:
+        assert peak(50_000) < 2 * peak(5_000)
+    finally:
+        close_pools()
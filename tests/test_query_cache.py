@@ -0,0 +1,119 @@
+from clinflow.config import get_config
+from clinflow.data.db import close_pools, connect
+from clinflow.data.query import query_patients
+from clinflow.data.query_cache import (
+    QueryCache,
+    clear_query_caches,
+    database_version,
+    get_query_cache,
+)
+from clinflow.data.to_sqlite import write_to_SQL_db
+import pandas as pd
+import pytest
+
+df = pd.DataFrame(
+    {
+        "age": [45, 65, 70],
+        "chol": [180, 250, 300],
+        "target": [0, 1, 0],
+    }
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    write_to_SQL_db(df, cfg)
+    yield cfg
+    close_pools()
+    clear_query_caches()
+
+
+def test_repeated_query_served_from_memory(cfg):
+    first = query_patients("all", cfg)
+    first.loc[0, "age"] = -1  # callers get copies
+    second = query_patients("all", cfg)
+
+    pd.testing.assert_frame_equal(second, df, check_dtype=False)
+    stats = get_query_cache(cfg).stats
+    assert stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+
+def test_disk_tier_survives_process(cfg, tmp_path):
+    query_patients("high_risk_seniors", cfg)
+    assert list((tmp_path / "query_cache").glob("*.parquet"))
+
+    clear_query_caches()  # as in a new process
+    result = query_patients("high_risk_seniors", cfg)
+    assert result["age"].tolist() == [65]
+    assert get_query_cache(cfg).stats["disk_hits"] == 1
+
+
+def test_writes_invalidate_cached_results(cfg):
+    assert len(query_patients("all", cfg)) == 3
+    write_to_SQL_db(df.head(2), cfg)
+    assert len(query_patients("all", cfg)) == 2
+
+    # a single small commit also changes the version stamp
+    with connect(cfg, readonly=False) as con, con:
+        con.execute("DELETE FROM patients WHERE age = 45")
+    assert len(query_patients("all", cfg)) == 1
+    assert get_query_cache(cfg).stats["misses"] == 3
+
+
+def test_database_version_tracks_commits(cfg, tmp_path):
+    path = tmp_path / "test.db"
+    before = database_version(path)
+    assert database_version(path) == before
+    with connect(cfg, readonly=False) as con, con:
+        con.execute("UPDATE patients SET chol = chol + 1")
+    assert database_version(path) != before
+    assert database_version(tmp_path / "missing.db") is None
+
+
+def test_disabled_cache(cfg):
+    cfg["database"]["query_cache"]["enabled"] = False
+    assert get_query_cache(cfg) is None
+    assert len(query_patients("all", cfg)) == 3
+
+
+def test_memory_tier_evicts_least_recently_used(tmp_path):
+    cache = QueryCache(max_entries=2)
+    db = tmp_path / "test.db"
+    calls = []
+
+    def run(n):
+        return lambda: calls.append(n) or pd.DataFrame({"n": [n]})
+
+    for n in (1, 2, 1, 3, 1, 2):
+        cache.get_or_run(db, f"SELECT {n}", [], run(n))
+    # 2 was evicted when 3 arrived, since 1 had been used more recently
+    assert calls == [1, 2, 3, 2]
+
+
+def test_disk_tier_pruned_to_budget(tmp_path):
+    cache = QueryCache(tmp_path / "cache", max_entries=0, max_disk_mb=0.01)
+    frame = pd.DataFrame({"x": range(1000)})
+    for n in range(5):
+        cache.get_or_run(tmp_path / "test.db", f"SELECT {n}", [], lambda: frame)
+
+    files = list((tmp_path / "cache").glob("*.parquet"))
+    assert 0 < len(files) < 5
+    assert sum(f.stat().st_size for f in files) <= 0.01 * 2**20
+
+
+def test_commits_after_checkpoint_invalidate_cached_results(cfg):
+    # grow the WAL, then checkpoint without truncating it: later commits
+    # overwrite its frames in place, so the -wal size and header stay the same
+    # and the database file is not touched
+    with connect(cfg, readonly=False) as con:
+        for _ in range(20):
+            with con:
+                con.execute("UPDATE patients SET chol = chol + 1")
+        con.execute("PRAGMA wal_checkpoint(FULL)")
+    for chol in range(5):
+        with connect(cfg, readonly=False) as con, con:
+            con.execute("UPDATE patients SET chol = ? WHERE age = 45", (chol,))
+        result = query_patients("all", cfg)
+        assert result.loc[result["age"] == 45, "chol"].tolist() == [chol]
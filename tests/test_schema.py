@@ -0,0 +1,121 @@
+from clinflow.config import get_config
+from clinflow.data.clean import clean_data, validate_data
+from clinflow.data.load import load_dataset
+from clinflow.data.schema import (
+    apply_schema,
+    decode_categories,
+    downcast,
+    frame_schema,
+    infer_schema,
+    load_schema,
+    minimal_int_dtype,
+    save_schema,
+)
+from clinflow.data.storage import write_dataset
+import numpy as np
+import pandas as pd
+import pytest
+import sqlite3
+
+cfg = get_config()
+
+
+def raw_frame(n=60):
+    i = np.arange(n)
+    return pd.DataFrame(
+        {
+            "age": i % 50 + 30,
+            "sex": i % 2,
+            "cp": i % 4 + 1,
+            "trestbps": i + 100,
+            "chol": i + 200,
+            "fbs": i % 2,
+            "restecg": i % 3,
+            "thalach": i + 120,
+            "exang": i % 2,
+            "oldpeak": np.linspace(0, 6.2, n),
+            "slope": i % 3 + 1,
+            "ca": (i % 4).astype(float),
+            "thal": [3.0, 6.0, 7.0] * (n // 3),
+            "num": i % 5,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ([0, 1, 127], "int8"),
+        ([-1, 300], "int16"),
+        ([3.0, 6.0, 7.0], "int8"),
+        ([0.5, 1.0], None),
+        ([1.0, np.nan], None),
+    ],
+)
+def test_minimal_int_dtype(values, expected):
+    assert minimal_int_dtype(values) == expected
+
+
+def test_clean_data_downcasts():
+    df = clean_data(raw_frame(), cfg)
+
+    assert df["age"].dtype == "int16"
+    assert df["target"].dtype == "int8"
+    assert df["oldpeak"].dtype == "float64"
+    assert isinstance(df["thal"].dtype, pd.CategoricalDtype)
+    assert df["thal"].cat.categories.tolist() == [3, 6, 7]
+    assert df["thal"].cat.categories.dtype == "int8"
+
+    # compact dtypes still pass validation
+    validate_data(df, cfg)
+
+
+def test_downcast_reports_memory_and_keeps_values():
+    df = raw_frame()
+    original = df.copy()
+    compact, report = downcast(df.copy(), cfg)
+
+    assert report["bytes_after"] < report["bytes_before"]
+    assert report["schema"]["sex"] == "category"
+    pd.testing.assert_frame_equal(
+        decode_categories(compact).astype("float64"), original.astype("float64")
+    )
+
+
+def test_infer_schema_only_configured_columns():
+    schema = infer_schema(raw_frame(), cfg, infer=False)
+    assert "oldpeak" not in schema
+    assert schema["age"] == "int16"
+    assert schema["sex"] == "category"
+
+
+def test_apply_schema_skips_values_that_do_not_fit():
+    df = pd.DataFrame({"age": [30.0, np.nan], "chol": [200, 40000]})
+    apply_schema(df, {"age": "int16", "chol": "int8"})
+    assert df["age"].dtype == "float64"
+    assert df["chol"].dtype == "int64"
+
+
+@pytest.mark.parametrize("name", ["clean.csv", "clean.parquet", "clean.arrow"])
+def test_schema_sidecar_roundtrip(tmp_path, name):
+    df = clean_data(raw_frame(), cfg)
+    path = write_dataset(df, tmp_path / name)
+    save_schema(frame_schema(df), path)
+
+    assert load_schema(path) == frame_schema(df)
+    loaded = load_dataset(path, cfg, columns=["age", "thal"])
+    assert loaded["age"].dtype == "int16"
+    assert isinstance(loaded["thal"].dtype, pd.CategoricalDtype)
+    assert loaded["thal"].tolist() == df["thal"].tolist()
+
+
+def test_categories_stored_as_integers_in_sqlite(tmp_path):
+    df = clean_data(raw_frame(), cfg)
+    with sqlite3.connect(tmp_path / "test.db") as con:
+        decode_categories(df).to_sql("patients", con, index=False)
+        (column_type,) = con.execute(
+            "SELECT type FROM pragma_table_info('patients') WHERE name = 'thal'"
+        ).fetchone()
+        (total,) = con.execute("SELECT SUM(thal) FROM patients").fetchone()
+    assert column_type == "INTEGER"
+    assert total == df["thal"].astype(int).sum()
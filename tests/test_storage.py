@@ -0,0 +1,84 @@
+from clinflow.config import get_config
+from clinflow.data.load import load_dataset
+from clinflow.data.storage import (
+    ChunkWriter,
+    detect_format,
+    processed_data_paths,
+    training_columns,
+    write_dataset,
+)
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+import tracemalloc
+
+cfg = get_config()
+
+df = pd.DataFrame(
+    {
+        "age": [50, 60, 70],
+        "chol": [200.0, 250.0, 300.0],
+        "target": [0, 1, 1],
+    }
+)
+
+
+def test_detect_format(tmp_path):
+    assert detect_format("clean.csv") == "csv"
+    assert detect_format("clean.parquet") == "parquet"
+    assert detect_format("clean.arrow") == "arrow"
+
+    # no extension: sniff the parquet magic bytes
+    path = tmp_path / "clean"
+    df.to_parquet(path)
+    assert detect_format(path) == "parquet"
+
+
+@pytest.mark.parametrize("name", ["clean.csv", "clean.parquet", "clean.arrow"])
+def test_load_dataset_roundtrip_with_projection(tmp_path, name):
+    path = write_dataset(df, tmp_path / name)
+    loaded = load_dataset(path, columns=["age", "target"])
+    assert list(loaded.columns) == ["age", "target"]
+    assert loaded["age"].tolist() == [50, 60, 70]
+
+
+def test_processed_data_paths():
+    paths = processed_data_paths(cfg)
+    assert paths[0].name == cfg["paths"]["processed_data"]["file"]
+    assert {p.suffix for p in paths} == {".csv", ".parquet", ".arrow"}
+
+
+def test_training_columns_loadable():
+    path = [p for p in processed_data_paths(cfg) if p.suffix == ".parquet"][0]
+    loaded = load_dataset(path, columns=training_columns(cfg))
+    assert list(loaded.columns) == training_columns(cfg)
+
+
+def test_chunk_writer_parquet_casts_to_first_schema(tmp_path):
+    path = tmp_path / "chunks.parquet"
+    with ChunkWriter(path) as writer:
+        writer.write(df)
+        # same columns, int-valued floats: cast to the first chunk's int64
+        writer.write(df.astype({"age": "float64"}))
+    loaded = pd.read_parquet(path)
+    assert len(loaded) == 6
+    assert loaded["age"].dtype == "int64"
+
+
+def test_arrow_load_is_memory_mapped(tmp_path):
+    n = 1_000_000
+    big = pd.DataFrame({"age": np.arange(n) % 90, "chol": np.random.rand(n)})
+    path = write_dataset(big, tmp_path / "big.arrow")
+
+    pool_before = pa.total_allocated_bytes()
+    tracemalloc.start()
+    loaded = load_dataset(path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # no copy of the column data is made, in NumPy or in Arrow's allocator
+    assert peak < big.memory_usage().sum() * 0.05
+    assert pa.total_allocated_bytes() == pool_before
+    assert not loaded["chol"].to_numpy().flags.owndata
+    pd.testing.assert_frame_equal(loaded, big)
@@ -0,0 +1,125 @@
+from clinflow.config import get_config
+from clinflow.data.db import close_pools, connect
+from clinflow.data.to_sqlite import record_keys, upsert_patients, write_to_SQL_db
+import numpy as np
+import pandas as pd
+import pytest
+
+df = pd.DataFrame(
+    {
+        "patient_id": [1, 2, 3, 4],
+        "age": [45, 65, 70, 52],
+        "chol": [180.0, 250.0, 300.0, 210.0],
+        "target": [0, 1, 0, 1],
+    }
+)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["paths"]["database_path"] = {"folder": f"{tmp_path}/", "file": "test.db"}
+    cfg["database"]["key_columns"] = ["patient_id"]
+    yield cfg
+    close_pools()
+
+
+def read_patients(cfg):
+    with connect(cfg) as con:
+        return pd.read_sql_query("SELECT * FROM patients ORDER BY patient_id", con)
+
+
+def test_record_keys_stable_across_dtypes():
+    keys = record_keys(df, ["patient_id", "age"])
+    downcast = df.astype({"patient_id": "int8", "age": "float64"})
+    assert np.array_equal(record_keys(downcast, ["patient_id", "age"]), keys)
+    assert len(set(keys)) == len(df)
+
+
+def test_upsert_inserts_updates_and_skips_unchanged(cfg):
+    stats = write_to_SQL_db(df, cfg, mode="upsert")
+    assert stats["rebuilt"] and stats["inserted"] == 4
+
+    delta = pd.DataFrame(
+        {
+            "patient_id": [2, 3, 5],
+            "age": [65, 71, 38],  # patient 3 changed
+            "chol": [250.0, 300.0, 190.0],
+            "target": [1, 0, 0],
+        }
+    )
+    stats = write_to_SQL_db(delta, cfg, mode="upsert")
+
+    assert stats == {
+        "inserted": 1,
+        "updated": 1,
+        "unchanged": 1,
+        "duplicates": 0,
+        "rebuilt": False,
+    }
+    patients = read_patients(cfg)
+    assert patients["patient_id"].tolist() == [1, 2, 3, 4, 5]
+    assert patients["age"].tolist() == [45, 65, 71, 52, 38]
+
+
+def test_upsert_after_replace_keeps_existing_rows(cfg):
+    write_to_SQL_db(df, cfg, mode="replace")
+    delta = df.head(2).assign(age=[46, 65])  # patient 1 changed
+    stats = write_to_SQL_db(delta, cfg, mode="upsert")
+
+    # the replace load's rows are re-keyed, then the delta is merged into them
+    assert stats["rebuilt"]
+    assert (stats["inserted"], stats["updated"], stats["unchanged"]) == (0, 1, 1)
+    patients = read_patients(cfg)
+    assert patients["patient_id"].tolist() == [1, 2, 3, 4]
+    assert patients["age"].tolist() == [46, 65, 70, 52]
+
+    cfg["database"]["key_columns"] = ["patient_id", "age"]
+    stats = write_to_SQL_db(df.tail(1), cfg, mode="upsert")
+    assert stats["rebuilt"] and stats["unchanged"] == 1
+    assert len(read_patients(cfg)) == 4
+
+
+def test_upsert_requires_key_columns(cfg):
+    cfg["database"]["key_columns"] = None
+    with pytest.raises(ValueError, match="key columns"):
+        write_to_SQL_db(df, cfg, mode="upsert")
+
+
+def test_upsert_rejects_different_columns(cfg):
+    write_to_SQL_db(df, cfg, mode="upsert")
+    with pytest.raises(ValueError, match="mode='replace'"):
+        write_to_SQL_db(df.drop(columns="chol"), cfg, mode="upsert")
+    assert len(read_patients(cfg)) == 4
+
+
+def test_upsert_duplicate_keys_keep_last(cfg):
+    feed = pd.concat([df, df.tail(1).assign(age=99)], ignore_index=True)
+    stats = write_to_SQL_db(feed, cfg, mode="upsert")
+    assert stats["duplicates"] == 1
+    assert read_patients(cfg)["age"].tolist() == [45, 65, 70, 99]
+
+
+def test_upsert_rolls_back_on_failure(cfg):
+    write_to_SQL_db(df, cfg, mode="upsert")
+    with connect(cfg, readonly=False) as con:
+        # fail after the update, inside the transaction
+        con.execute(
+            "CREATE TRIGGER fail BEFORE INSERT ON patients "
+            "BEGIN SELECT RAISE(ABORT, 'boom'); END"
+        )
+        changed = df.assign(age=df["age"] + 1)
+        new = pd.DataFrame(
+            {"patient_id": [9], "age": [30], "chol": [150.0], "target": [0]}
+        )
+        with pytest.raises(Exception, match="boom"):
+            upsert_patients(pd.concat([changed, new]), con, ["patient_id"])
+        tables = {r[0] for r in con.execute("SELECT name FROM sqlite_master")}
+
+    assert read_patients(cfg)["age"].tolist() == df["age"].tolist()
+    assert "patients_delta" not in tables
+
+
+def test_unknown_load_mode(cfg):
+    with pytest.raises(ValueError, match="Unknown load mode"):
+        write_to_SQL_db(df, cfg, mode="append")
@@ -0,0 +1,124 @@
+from clinflow.config import get_config
+from clinflow.models.io import load_model, save_model
+from clinflow.models.kernel import KernelScorer
+from clinflow.models.tuning import (
+    leaderboard,
+    param_grid,
+    save_leaderboard,
+    tune_model,
+)
+from sklearn.linear_model import LogisticRegression
+import numpy as np
+import pandas as pd
+import pytest
+
+rng = np.random.default_rng(0)
+n = 600
+df = pd.DataFrame(
+    {
+        "age": rng.integers(29, 78, n),
+        "sex": rng.integers(0, 2, n),
+        "cp": rng.integers(1, 5, n),
+        "trestbps": rng.integers(94, 200, n),
+        "chol": rng.integers(126, 565, n),
+        "fbs": rng.integers(0, 2, n),
+        # a rare category, absent from some folds' training rows
+        "restecg": rng.choice([0, 1, 2], n, p=[0.49, 0.02, 0.49]),
+        "thalach": rng.integers(71, 202, n),
+        "ca": rng.integers(0, 4, n),
+        "thal": rng.choice([3, 6, 7], n),
+    }
+)
+df["target"] = (
+    rng.random(n) < 1 / (1 + np.exp(-(0.08 * (df["age"] - 54) + 0.7 * df["ca"] - 1)))
+).astype(int)
+
+
+@pytest.fixture
+def cfg(tmp_path):
+    cfg = get_config().to_dict()
+    cfg["model_training"]["path_to_results"]["directory"] = f"{tmp_path}/"
+    cfg["model_training"]["tuning"].update(
+        cv=3,
+        n_jobs=2,
+        estimators={
+            "logistic_regression": {"C": [0.01, 1.0], "solver": ["lbfgs", "liblinear"]},
+            "sgd": {"alpha": [0.0001, 0.01]},
+        },
+    )
+    return cfg
+
+
+def test_param_grid_keeps_configured_params(cfg):
+    grid = param_grid(cfg)
+    logistic = grid[0]["classifier"][0]
+    assert isinstance(logistic, LogisticRegression)
+    assert logistic.max_iter == cfg["model_training"]["model_params"]["max_iter"]
+    assert grid[0]["classifier__C"] == [0.01, 1.0]
+    assert grid[1]["classifier"][0].loss == "log_loss"
+
+    cfg["model_training"]["tuning"]["estimators"] = {"xgboost": {}}
+    with pytest.raises(ValueError, match="Unknown estimator"):
+        param_grid(cfg)
+
+
+@pytest.mark.parametrize("search", ["grid", "random", "halving"])
+def test_tune_model(cfg, search):
+    cfg["model_training"]["tuning"]["n_iter"] = 3
+    model = tune_model(df, cfg, search=search)
+    board = model["leaderboard"]
+
+    # halving scores survivors again in later rounds: more rows than candidates
+    assert model["n_candidates"] == (3 if search == "random" else 6)
+    expected = {"grid": 6, "random": 3}.get(search)
+    if expected:
+        assert len(board) == expected
+        assert board["rank"].is_monotonic_increasing
+    assert board.loc[0, "rank"] == 1
+    assert (board["mean_fit_time"] > 0).all()
+    assert model["pipeline"].get_params()["memory"] is None
+    assert len(model["y_pred"]) == len(model["y_test"])
+
+
+def test_preprocessing_cached_per_fold(cfg, monkeypatch):
+    from sklearn.compose import ColumnTransformer
+
+    fits = []
+    original = ColumnTransformer.fit_transform
+
+    def counting(self, *args, **kwargs):
+        fits.append(1)
+        return original(self, *args, **kwargs)
+
+    monkeypatch.setattr(ColumnTransformer, "fit_transform", counting)
+    cfg["model_training"]["tuning"]["n_jobs"] = 1
+    tune_model(df, cfg)
+    cached = len(fits)
+
+    fits.clear()
+    cfg["model_training"]["tuning"]["cache_preprocessing"] = False
+    tune_model(df, cfg)
+    # 3 folds + the final refit, vs once per (candidate, fold) + refit
+    assert cached == 3 + 1
+    assert len(fits) == 6 * 3 + 1
+
+
+def test_leaderboard_saved_next_to_metrics(cfg, tmp_path):
+    model = tune_model(df, cfg)
+    path = save_leaderboard(model["leaderboard"], cfg)
+
+    assert path == tmp_path / "leaderboard.csv"
+    saved = pd.read_csv(path)
+    assert list(saved.columns[:4]) == ["rank", "estimator", "params", "mean_score"]
+    assert set(saved["estimator"]) == {"LogisticRegression", "SGDClassifier"}
+
+
+def test_tuned_pipeline_saves_and_compiles(cfg, tmp_path):
+    model = tune_model(df, cfg)
+    pipeline = load_model(save_model(model, tmp_path / "model.joblib", cfg))
+    sample = df.head(20)
+    np.testing.assert_allclose(
+        KernelScorer.from_pipeline(pipeline).predict_proba(sample)[:, 1],
+        pipeline.predict_proba(sample)[:, 1],
+        rtol=1e-9,
+    )
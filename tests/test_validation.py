@@ -0,0 +1,78 @@
+from clinflow.data.validation import ValidationEngine, raise_for_report
+import numpy as np
+import pandas as pd
+import pytest
+import yaml
+
+# load cfg
+with open("config/config.yml", "r") as f:
+    cfg = yaml.safe_load(f)
+
+engine = ValidationEngine(cfg)
+
+
+def valid_frame(n=60):
+    return pd.DataFrame(
+        {
+            "age": np.arange(n) % 50 + 30,
+            "chol": [200.0] * n,
+            "sex": [0, 1] * (n // 2),
+            "target": [0, 1] * (n // 2),
+        }
+    )
+
+
+def test_valid_frame_has_no_violations():
+    report = engine.run(valid_frame())
+    assert report == {"rows": 60, "violations": []}
+    raise_for_report(report)
+
+
+def test_reports_every_violation():
+    df = valid_frame()
+    df.loc[[3, 7], "age"] = 130  # out of range
+    df.loc[5, "chol"] = np.nan  # missing
+    df.loc[[1, 2, 9], "target"] = 2  # not binary
+
+    report = engine.run(df)
+    found = {(v["column"], v["rule"]): v for v in report["violations"]}
+
+    assert found[("age", "range")]["count"] == 2
+    assert found[("age", "range")]["examples"] == [3, 7]
+    assert found[("chol", "missing")]["examples"] == [5]
+    assert found[("target", "target_binary")]["count"] == 3
+
+    # all three are raised together
+    with pytest.raises(ValueError) as excinfo:
+        raise_for_report(report)
+    for text in ("outside reasonable range", "missing values", "not binary"):
+        assert text in str(excinfo.value)
+
+
+def test_merge_chunks_matches_whole_frame():
+    df = valid_frame(100)
+    df.loc[[10, 80], "age"] = -1
+
+    merged = None
+    for start in range(0, 100, 30):
+        merged = engine.merge(merged, engine.scan(df.iloc[start : start + 30]))
+
+    assert engine.finalize(merged) == engine.run(df)
+
+
+def test_numeric_categorical_dtype_passes():
+    df = valid_frame()
+    df["sex"] = df["sex"].astype("category")
+    assert engine.run(df)["violations"] == []
+
+
+def test_wrong_dtype_without_bad_entries_names_the_dtype():
+    df = valid_frame()
+    df["chol"] = df["chol"].astype(str)  # every entry still parses as a number
+
+    report = engine.run(df)
+    (violation,) = report["violations"]
+    assert (violation["rule"], violation["count"]) == ("numerical_dtype", 0)
+
+    with pytest.raises(ValueError, match="chol has dtype object"):
+        raise_for_report(report)